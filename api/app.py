@@ -1,21 +1,46 @@
-from flask import Flask, request, jsonify, send_file, send_from_directory
+from flask import Flask, Blueprint, Response, current_app, g, request, jsonify, send_file, send_from_directory, stream_with_context
 from flask_cors import CORS
 import os
 import csv
+import hmac
+import math
+import threading
+import time
 from collections import defaultdict
 from pathlib import Path
 from validators import validate_generic, get_validation_url, validate_url_exists
-from file_lock import CSVManager
+from file_lock import CSVManager, InterProcessLock
+from index_snapshot import IndexSnapshot, GenerationCounter, file_state
+from metrics import MetricsRegistry
+from profiling import ProfileStore, SORT_KEYS
+from conversion_graph import ConversionGraph, NUMBER_COLUMNS, check_final_hop
+from response_cache import LRUCache
+from json_provider import get_provider_class
+from compression import ResponseCompressor
+from jobs import JobManager
+from portfolio_index import collect_candidates, read_index, split_values
 
 # Configure Flask to serve frontend
 base_dir = os.path.dirname(os.path.dirname(__file__))
 frontend_dist = os.path.join(base_dir, 'frontend', 'dist')
 
-app = Flask(__name__, static_folder=frontend_dist, static_url_path='')
-CORS(app)
+# Alle Routen hängen am Blueprint, die Flask-App entsteht erst in create_app()
+api_bp = Blueprint('api', __name__)
 
 # Data storage
 data = defaultdict(dict)
+
+# Graph Nummer <-> Syskomp-Zeile für Konvertierungen zwischen beliebigen Spalten (wird mit dem Index gebaut)
+conversion_graph = ConversionGraph()
+
+# Index wird nicht beim Import geladen, sondern beim Start (Thread) oder ersten Request
+index_ready = threading.Event()
+index_load_lock = threading.Lock()
+
+# Stand des Index in diesem Prozess (für Invalidierung über mehrere Worker)
+index_state = {'generation': 0, 'token': '', 'checked_at': 0.0, 'rows': 0, 'version': 0}
+GENERATION_CHECK_INTERVAL = 1.0  # Sekunden zwischen zwei Prüfungen des Generationszählers
+
 COLUMN_NAMES = {
     'A': 'Syskomp neu',
     'B': 'Syskomp alt',
@@ -27,56 +52,233 @@ COLUMN_NAMES = {
     'H': 'ASK'
 }
 
-# CSV-Manager initialisieren
-csv_path = os.path.join(base_dir, 'Portfolio_Syskomp_pA.csv')
+# CSV-Manager initialisieren (Pfad per PORTFOLIO_CSV überschreibbar, z.B. für Benchmarks)
+csv_path = os.environ.get('PORTFOLIO_CSV') or os.path.join(base_dir, 'Portfolio_Syskomp_pA.csv')
 csv_manager = CSVManager(csv_path)
 
+# Binärer Snapshot des Index (cache/ neben der CSV)
+index_snapshot = IndexSnapshot(csv_path)
+
+# Generationszähler: wird nach jeder Änderung erhöht, andere Worker laden dann neu
+index_generation = GenerationCounter(csv_path)
+
+# Metriken (Abruf über /api/metrics im Prometheus-Textformat). Im Produktionsbetrieb
+# fasst wsgi.py die Werte aller Worker über Dateien in metrics_dir zusammen
+metrics = MetricsRegistry()
+metrics_dir = os.environ.get('METRICS_DIR') or os.path.join(os.path.dirname(os.path.abspath(csv_path)), 'cache', 'metrics')
+request_count = metrics.counter('api_requests_total', 'Anzahl Requests', ['endpoint', 'method', 'status'])
+request_latency = metrics.histogram('api_request_duration_seconds', 'Antwortzeit der Requests', ['endpoint'])
+index_load_seconds = metrics.gauge('index_load_seconds', 'Dauer des letzten Index-Ladevorgangs', ['source'])
+index_loads = metrics.counter('index_loads_total', 'Anzahl Index-Ladevorgänge', ['source'])
+
+# Antwort-Cache für /api/search und /api/convert (Schlüssel enthält die Index-Version)
+response_cache = LRUCache(maxsize=int(os.environ.get('RESPONSE_CACHE_SIZE', 4096)))
+
+# Komprimierung der Antworten nach Accept-Encoding (API_COMPRESSION=0 schaltet ab)
+response_compressor = ResponseCompressor(
+    min_size=int(os.environ.get('COMPRESS_MIN_SIZE', 1024)),
+    gzip_level=int(os.environ.get('COMPRESS_LEVEL', 6)),
+    brotli_level=int(os.environ.get('COMPRESS_BROTLI_LEVEL', 4)),
+    enabled=os.environ.get('API_COMPRESSION', '1') != '0'
+)
+
+# Profiling (opt-in je Request mit Admin-Token oder als Stichprobe)
+ADMIN_TOKEN = os.environ.get('API_ADMIN_TOKEN', '')
+profile_store = ProfileStore(
+    keep=int(os.environ.get('PROFILE_KEEP', 20)),
+    sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', 0.0))
+)
+
+# Hintergrund-Jobs (Status und Ergebnisse unter cache/jobs neben der CSV)
+job_manager = JobManager(
+    store_dir=os.path.join(os.path.dirname(os.path.abspath(csv_path)), 'cache', 'jobs'),
+    workers=int(os.environ.get('JOB_WORKERS', 2)),
+    ttl=float(os.environ.get('JOB_TTL_SECONDS', 24 * 3600))
+)
+
+@metrics.register_collector
+def collect_index_metrics():
+    """Index size, CSV lock, backup and snapshot statistics (computed on scrape)"""
+    yield ('index_rows', 'gauge', 'Zeilen im geladenen Portfolio', [({}, index_state['rows'])])
+    yield ('index_entries', 'gauge', 'Index-Einträge pro Spalte',
+           [({'column': col}, len(values)) for col, values in sorted(data.items())])
+    yield ('index_generation', 'gauge', 'Generationszähler des Index in diesem Prozess',
+           [({}, index_state['generation'])])
+
+    lock_stats = csv_manager.lock.get_stats()
+    yield ('csv_lock_acquired_total', 'counter', 'Erworbene CSV-Sperren',
+           [({'mode': mode}, stats['acquired']) for mode, stats in lock_stats.items()])
+    yield ('csv_lock_timeouts_total', 'counter', 'Zeitüberschreitungen beim Warten auf die CSV-Sperre',
+           [({'mode': mode}, stats['timeouts']) for mode, stats in lock_stats.items()])
+    yield ('csv_lock_wait_seconds_total', 'counter', 'Summe der Wartezeit auf die CSV-Sperre',
+           [({'mode': mode}, stats['wait_total']) for mode, stats in lock_stats.items()])
+    yield ('csv_lock_wait_seconds_max', 'gauge', 'Längste Wartezeit auf die CSV-Sperre',
+           [({'mode': mode}, stats['wait_max']) for mode, stats in lock_stats.items()])
+    yield ('csv_lock_hold_seconds_total', 'counter', 'Summe der Haltezeit der CSV-Sperre',
+           [({'mode': mode}, stats['hold_total']) for mode, stats in lock_stats.items()])
+    yield ('csv_lock_hold_seconds_max', 'gauge', 'Längste Haltezeit der CSV-Sperre',
+           [({'mode': mode}, stats['hold_max']) for mode, stats in lock_stats.items()])
+
+    backup_stats = csv_manager.backup_manager.stats
+    yield ('backup_total', 'counter', 'Erstellte Backups', [({}, backup_stats['count'])])
+    yield ('backup_seconds_total', 'counter', 'Summe der Backup-Dauer', [({}, backup_stats['seconds_total'])])
+    yield ('backup_seconds_max', 'gauge', 'Längste Backup-Dauer', [({}, backup_stats['seconds_max'])])
+
+    cache_stats = response_cache.stats()
+    yield ('cache_requests_total', 'counter', 'Cache-Zugriffe (hit/miss)',
+           [({'cache': 'index_snapshot', 'result': 'hit'}, index_snapshot.stats['hits']),
+            ({'cache': 'index_snapshot', 'result': 'miss'}, index_snapshot.stats['misses']),
+            ({'cache': 'response', 'result': 'hit'}, cache_stats['hits']),
+            ({'cache': 'response', 'result': 'miss'}, cache_stats['misses'])])
+    yield ('response_cache_entries', 'gauge', 'Einträge im Antwort-Cache', [({}, cache_stats['size'])])
+    yield ('response_cache_hit_ratio', 'gauge', 'Trefferquote des Antwort-Caches', [({}, cache_stats['hit_ratio'])])
+
+def build_index(filepath):
+    """Parse the portfolio CSV and build the column index (shared loader, see portfolio_index)"""
+    return read_index(filepath)
+
+def activate_index(index, row_count, source, start):
+    """Make a freshly loaded index the current one and build the conversion graph from it"""
+    global conversion_graph
+
+    data.clear()
+    data.update(index)
+    conversion_graph = ConversionGraph.from_index(data)
+    index_state['rows'] = row_count
+
+    # Neue Index-Version: gecachte Antworten gehören zum alten Stand
+    index_state['version'] += 1
+    response_cache.clear()
+    index_load_seconds.set(source, value=time.perf_counter() - start)
+    index_loads.inc(source)
+
 def load_data():
-    """Load Portfolio_Syskomp_pA.csv data"""
-    filepath = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Portfolio_Syskomp_pA.csv')
+    """Load Portfolio_Syskomp_pA.csv data (from the binary snapshot if it is up to date)"""
+    filepath = csv_path
 
     if not os.path.exists(filepath):
         print(f"ERROR: File not found: {filepath}")
         return
 
     try:
-        with open(filepath, 'r', encoding='utf-8-sig', newline='') as f:
-            reader = csv.reader(f, delimiter=';')
-            data.clear()
-
-            # Skip header
-            next(reader, None)
-
-            row_count = 0
-            for row in reader:
-                if len(row) < 8:
-                    # Pad row with empty strings if necessary
-                    row.extend([''] * (8 - len(row)))
-
-                row_dict = {}
-                for col_idx, col_letter in enumerate(['A','B','C','D','E','F','G','H']):
-                    value = row[col_idx].strip() if col_idx < len(row) else ""
-                    row_dict[col_letter] = value if value and value != 'None' else ""
-
-                # Index all searchable columns (all except C which is description)
-                # Store as list to support multiple rows with same value
-                # Support pipe-separated values (e.g., "370010|370011" for multiple article numbers)
-                for col_letter in ['A','B','D','E','F','G','H']:
-                    value = row_dict.get(col_letter, "")
-                    if value:
-                        # Split by pipe to support multiple values per cell
-                        values = [v.strip() for v in value.split('|') if v.strip()]
-                        for single_value in values:
-                            if single_value not in data[col_letter]:
-                                data[col_letter][single_value] = []
-                            data[col_letter][single_value].append(row_dict)
-
-                row_count += 1
+        start = time.perf_counter()
+        snapshot = index_snapshot.load()
+        if snapshot is not None:
+            activate_index(snapshot['index'], snapshot['row_count'], 'snapshot', start)
+            print(f"Data loaded from snapshot: {snapshot['row_count']} rows, {sum(len(v) for v in data.values())} indexed entries")
+            return
+
+        # Lesesperre: andere Prozesse dürfen die CSV nicht während des Parsens schreiben
+        if not csv_manager.lock.acquire(timeout=30, shared=True):
+            print(f"ERROR loading data: {csv_manager._locked_message()}")
+            return
 
+        try:
+            # Stand der CSV vor dem Parsen festhalten - der Snapshot gehört genau zu diesem Stand
+            state = file_state(filepath)
+            index, row_count = build_index(filepath)
+        finally:
+            csv_manager.lock.release()
+
+        activate_index(index, row_count, 'csv', start)
         print(f"Data loaded from CSV: {row_count} rows, {sum(len(v) for v in data.values())} indexed entries")
+
+        index_snapshot.save(index, row_count, state)
     except Exception as e:
         print(f"ERROR loading data: {e}")
 
+def ensure_data_loaded():
+    """Load the index once; concurrent callers wait for the running load"""
+    if index_ready.is_set():
+        return
+
+    with index_load_lock:
+        if not index_ready.is_set():
+            # Zähler vor dem Laden lesen, damit spätere Änderungen nicht verloren gehen
+            index_state['generation'], index_state['token'] = index_generation.read()
+            index_state['checked_at'] = time.monotonic()
+            load_data()
+            index_ready.set()
+
+def check_generation():
+    """Reload the index if another process changed the portfolio (checked at most once per interval)"""
+    now = time.monotonic()
+    if now - index_state['checked_at'] < GENERATION_CHECK_INTERVAL:
+        return
+
+    with index_load_lock:
+        index_state['checked_at'] = now
+        generation, token = index_generation.read()
+        if token != index_state['token']:
+            index_state['generation'], index_state['token'] = generation, token
+            load_data()
+
+def reload_after_write():
+    """Reload the index after this process changed the CSV and notify the other workers"""
+    with index_load_lock:
+        # Erst die neue Generation veröffentlichen, dann laden: jede Änderung, deren
+        # Generation danach geschrieben wird, trägt ein anderes Token und löst erneut
+        # ein Neuladen aus (kein Lock nötig, auch bei gleichzeitigen Schreibern)
+        index_state['generation'], index_state['token'] = index_generation.bump()
+        index_state['checked_at'] = time.monotonic()
+        load_data()
+
+def start_background_load():
+    """Build/load the index in a daemon thread so the server accepts requests immediately"""
+    thread = threading.Thread(target=ensure_data_loaded, name='index-loader', daemon=True)
+    thread.start()
+    return thread
+
+@api_bp.before_request
+def require_index():
+    """Block requests until the index is available (health check answers immediately)"""
+    if request.endpoint != 'api.health':
+        ensure_data_loaded()
+        check_generation()
+
+def is_admin_request():
+    """True if the request carries the admin token (disabled when API_ADMIN_TOKEN is not set)"""
+    token = request.headers.get('X-Admin-Token', '')
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+@api_bp.before_app_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+    # Profiling: explizit angefordert (nur Admin) oder Stichprobe
+    requested = request.headers.get('X-Profile') == '1' or request.args.get('profile') == '1'
+    if (requested and is_admin_request()) or profile_store.should_sample():
+        g.profiler = profile_store.start()
+
+@api_bp.after_app_request
+def record_request_metrics(response):
+    """Count the request and record its latency per endpoint"""
+    start = g.pop('request_start', None)
+    if start is not None:
+        endpoint = request.endpoint or 'unmatched'
+        duration = time.perf_counter() - start
+        request_latency.observe(endpoint, value=duration)
+        request_count.inc(endpoint, request.method, str(response.status_code))
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profile_id = profile_store.finish(profiler, duration, {
+                'endpoint': endpoint,
+                'method': request.method,
+                'path': request.full_path.rstrip('?'),
+                'status': response.status_code
+            })
+            if profile_id is not None:
+                response.headers['X-Profile-Id'] = str(profile_id)
+    return response
+
+@api_bp.teardown_app_request
+def stop_profiler(exc):
+    """Disable a profiler the after-request hook did not finish (exception re-raised in debug/testing)"""
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profile_store.discard(profiler)
+
 def validate_conversion(from_col, to_col, mode):
     """Validate conversion rules based on mode"""
     # Rule: A or B must be involved
@@ -93,6 +295,22 @@ def validate_conversion(from_col, to_col, mode):
 
     return True, ""
 
+DEFAULT_MAX_CANDIDATES = 20
+MAX_CANDIDATES_LIMIT = 200
+
+def get_max_candidates(req_data):
+    """Read max_candidates from the request, clamped to 1..MAX_CANDIDATES_LIMIT"""
+    try:
+        value = int(req_data.get('max_candidates', DEFAULT_MAX_CANDIDATES))
+    except (TypeError, ValueError):
+        value = DEFAULT_MAX_CANDIDATES
+    return max(1, min(value, MAX_CANDIDATES_LIMIT))
+
+def cache_response(cache_key, result):
+    """Store a response dict in the response cache and return it as JSON"""
+    response_cache.put(cache_key, result)
+    return jsonify(result)
+
 def find_image(artnr, source_type):
     """Find image file for given article number and type"""
     base_dir = os.path.dirname(os.path.dirname(__file__))
@@ -128,7 +346,7 @@ def find_image(artnr, source_type):
 
     return None
 
-@app.route('/api/search', methods=['POST'])
+@api_bp.route('/api/search', methods=['POST'])
 def search_all():
     """Search in all columns and return all matches"""
     try:
@@ -138,6 +356,11 @@ def search_all():
         if not search_value:
             return jsonify({'error': 'Keine Nummer angegeben'}), 400
 
+        cache_key = ('search', search_value, index_state['version'])
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return jsonify(cached)
+
         # Search in all columns
         matches = []
         seen_rows = set()  # Track unique rows to avoid duplicates
@@ -224,12 +447,12 @@ def search_all():
                     })
 
         if not matches:
-            return jsonify({
+            return cache_response(cache_key, {
                 'found': False,
                 'search_term': search_value
             })
 
-        return jsonify({
+        return cache_response(cache_key, {
             'found': True,
             'search_term': search_value,
             'count': len(matches),
@@ -239,7 +462,7 @@ def search_all():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/convert', methods=['POST'])
+@api_bp.route('/api/convert', methods=['POST'])
 def convert_single():
     """Single number conversion"""
     try:
@@ -248,6 +471,7 @@ def convert_single():
         to_col = req_data.get('to_col', '').upper()
         search_value = req_data.get('number', '').strip()
         mode = req_data.get('mode', 'intern')
+        all_candidates = bool(req_data.get('all_candidates', False))
 
         if not search_value:
             return jsonify({'error': 'Keine Nummer angegeben'}), 400
@@ -257,11 +481,17 @@ def convert_single():
         if not valid:
             return jsonify({'error': error}), 400
 
+        max_candidates = get_max_candidates(req_data) if all_candidates else 0
+        cache_key = ('convert', search_value, from_col, to_col, mode, max_candidates, index_state['version'])
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return jsonify(cached)
+
         # Search for number (now returns list)
         row_list = data.get(from_col, {}).get(search_value, [])
 
         if not row_list:
-            return jsonify({
+            return cache_response(cache_key, {
                 'found': False,
                 'search_term': search_value,
                 'from_col': from_col,
@@ -303,7 +533,7 @@ def convert_single():
                     'crop_top_70': False
                 }
 
-        return jsonify({
+        result = {
             'found': True,
             'from_col': from_col,
             'from_col_name': COLUMN_NAMES.get(from_col, from_col),
@@ -316,93 +546,219 @@ def convert_single():
             'image': image_info,
             'multiple_matches': len(row_list) > 1,
             'match_count': len(row_list)
-        })
+        }
+
+        # Optional: alle Zielwerte aller Treffer (erspart den zusätzlichen /api/search)
+        if all_candidates:
+            candidates, truncated = collect_candidates(row_list, to_col, max_candidates)
+            result['candidates'] = candidates
+            result['candidates_truncated'] = truncated
+
+        return cache_response(cache_key, result)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/batch-convert', methods=['POST'])
-def batch_convert():
-    """Batch conversion"""
-    try:
-        req_data = request.json
-        numbers = req_data.get('numbers', [])
-        target_col = req_data.get('target_col', 'A').upper()
-        mode = req_data.get('mode', 'extern')
+def run_batch_convert(req_data, job=None):
+    """
+    Batch-Konvertierung (Endpunkt und Job-Queue)
 
-        if target_col not in ['A', 'B']:
-            return jsonify({'error': 'Batch-Konvertierung nur nach A oder B erlaubt'}), 400
+    Returns:
+        Tuple[Dict, int]: (Antwort, HTTP-Status)
+    """
+    numbers = req_data.get('numbers', [])
+    target_col = req_data.get('target_col', 'A').upper()
+    mode = req_data.get('mode', 'extern')
+    all_candidates = bool(req_data.get('all_candidates', False))
+    max_candidates = get_max_candidates(req_data)
 
-        results = []
+    if target_col not in ['A', 'B']:
+        return {'error': 'Batch-Konvertierung nur nach A oder B erlaubt'}, 400
 
-        for idx, search_value in enumerate(numbers):
-            search_value = str(search_value).strip()
+    results = []
 
-            if not search_value:
-                results.append({
-                    'index': idx,
-                    'input': search_value,
-                    'output': None,
-                    'status': 'empty'
-                })
-                continue
+    for idx, search_value in enumerate(numbers):
+        if job is not None:
+            job.update(idx, len(numbers), results)
+        search_value = str(search_value).strip()
 
-            # Search in all columns (now returns list)
-            row_list = []
-            found_in_col = None
+        if not search_value:
+            results.append({
+                'index': idx,
+                'input': search_value,
+                'output': None,
+                'status': 'empty'
+            })
+            continue
 
-            for col in ['A','B','D','E','F','G','H']:
-                if search_value in data.get(col, {}):
-                    row_list = data[col][search_value]
-                    found_in_col = col
-                    break
+        # Search in all columns (now returns list)
+        row_list = []
+        found_in_col = None
 
-            if row_list:
-                # Use first match for batch conversion
-                row_data = row_list[0]
-
-                # Validate conversion
-                valid, error = validate_conversion(found_in_col, target_col, mode)
-
-                if valid:
-                    result_value = row_data.get(target_col, None)
-                    results.append({
-                        'index': idx,
-                        'input': search_value,
-                        'output': result_value if result_value else None,
-                        'status': 'success' if result_value else 'not_found',
-                        'from_col': found_in_col,
-                        'multiple_matches': len(row_list) > 1
-                    })
-                else:
-                    results.append({
-                        'index': idx,
-                        'input': search_value,
-                        'output': None,
-                        'status': 'invalid_conversion',
-                        'message': error
-                    })
+        for col in ['A','B','D','E','F','G','H']:
+            if search_value in data.get(col, {}):
+                row_list = data[col][search_value]
+                found_in_col = col
+                break
+
+        if row_list:
+            # Use first match for batch conversion
+            row_data = row_list[0]
+
+            # Validate conversion
+            valid, error = validate_conversion(found_in_col, target_col, mode)
+
+            if valid:
+                result_value = row_data.get(target_col, None)
+                result = {
+                    'index': idx,
+                    'input': search_value,
+                    'output': result_value if result_value else None,
+                    'status': 'success' if result_value else 'not_found',
+                    'from_col': found_in_col,
+                    'multiple_matches': len(row_list) > 1
+                }
+                if all_candidates:
+                    candidates, truncated = collect_candidates(row_list, target_col, max_candidates)
+                    result['candidates'] = candidates
+                    result['candidates_truncated'] = truncated
+                results.append(result)
             else:
                 results.append({
                     'index': idx,
                     'input': search_value,
                     'output': None,
-                    'status': 'not_found'
+                    'status': 'invalid_conversion',
+                    'message': error
                 })
+        else:
+            results.append({
+                'index': idx,
+                'input': search_value,
+                'output': None,
+                'status': 'not_found'
+            })
+
+    success_count = sum(1 for r in results if r['status'] == 'success')
+
+    return {
+        'total': len(numbers),
+        'success': success_count,
+        'failed': len(numbers) - success_count,
+        'results': results
+    }, 200
+
+@api_bp.route('/api/batch-convert', methods=['POST'])
+def batch_convert():
+    """Batch conversion"""
+    try:
+        result, status = run_batch_convert(request.json)
+        return jsonify(result), status
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/api/convert-path', methods=['POST'])
+def convert_path():
+    """Konvertierung zwischen beliebigen Spalten über die Syskomp-Zeile (mit Pfad)"""
+    try:
+        req_data = request.json
+        search_value = str(req_data.get('number', '')).strip()
+        from_col = (req_data.get('from_col') or '').upper() or None
+        to_col = req_data.get('to_col', '').upper()
+        mode = req_data.get('mode', 'intern')
+
+        if not search_value:
+            return jsonify({'error': 'Keine Nummer angegeben'}), 400
 
-        success_count = sum(1 for r in results if r['status'] == 'success')
+        if from_col is not None and from_col not in NUMBER_COLUMNS:
+            return jsonify({'error': f'Ungültige Quellspalte: {from_col}'}), 400
+
+        # Modus-Regel gilt für den letzten Sprung (Syskomp -> Ziel)
+        valid, error = check_final_hop(to_col, mode)
+        if not valid:
+            return jsonify({'error': error}), 400
+
+        results, truncated = conversion_graph.convert(search_value, to_col, from_col, get_max_candidates(req_data))
 
         return jsonify({
-            'total': len(numbers),
-            'success': success_count,
-            'failed': len(numbers) - success_count,
-            'results': results
+            'found': bool(results),
+            'search_value': search_value,
+            'from_col': from_col,
+            'to_col': to_col,
+            'to_col_name': COLUMN_NAMES.get(to_col, to_col),
+            'results': results,
+            'truncated': truncated
         })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/image/<image_type>/<artnr>', methods=['GET'])
+def run_batch_convert_path(req_data, job=None):
+    """
+    Batch-Konvertierung in mehrere Zielspalten (Endpunkt und Job-Queue)
+
+    Returns:
+        Tuple[Dict, int]: (Antwort, HTTP-Status)
+    """
+    numbers = req_data.get('numbers', [])
+    from_col = (req_data.get('from_col') or '').upper() or None
+    target_cols = req_data.get('target_cols', 'all')
+    mode = req_data.get('mode', 'extern')
+
+    if from_col is not None and from_col not in NUMBER_COLUMNS:
+        return {'error': f'Ungültige Quellspalte: {from_col}'}, 400
+
+    if target_cols == 'all':
+        target_cols = [col for col in NUMBER_COLUMNS if check_final_hop(col, mode)[0]]
+    else:
+        target_cols = [str(col).upper() for col in target_cols]
+        for col in target_cols:
+            valid, error = check_final_hop(col, mode)
+            if not valid:
+                return {'error': error}, 400
+
+    results = []
+    for idx, search_value in enumerate(numbers):
+        if job is not None:
+            job.update(idx, len(numbers), results)
+        search_value = str(search_value).strip()
+
+        if not search_value:
+            results.append({'index': idx, 'input': search_value, 'status': 'empty', 'targets': {}})
+            continue
+
+        conversion = conversion_graph.convert_all(search_value, target_cols, from_col)
+        results.append({
+            'index': idx,
+            'input': search_value,
+            'status': 'success' if conversion['found_in'] else 'not_found',
+            'found_in': conversion['found_in'],
+            'syskomp_neu': conversion['syskomp_neu'],
+            'targets': conversion['targets']
+        })
+
+    success_count = sum(1 for r in results if r['status'] == 'success')
+
+    return {
+        'total': len(numbers),
+        'success': success_count,
+        'failed': len(numbers) - success_count,
+        'target_cols': target_cols,
+        'results': results
+    }, 200
+
+@api_bp.route('/api/batch-convert-path', methods=['POST'])
+def batch_convert_path():
+    """Batch-Konvertierung in mehrere (oder alle) Zielspalten mit einem Lookup pro Nummer"""
+    try:
+        result, status = run_batch_convert_path(request.json)
+        return jsonify(result), status
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@api_bp.route('/api/image/<image_type>/<artnr>', methods=['GET'])
 def get_image(image_type, artnr):
     """Get image file"""
     try:
@@ -416,16 +772,101 @@ def get_image(image_type, artnr):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/health', methods=['GET'])
+@api_bp.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     return jsonify({
-        'status': 'ok',
-        'rows_loaded': sum(len(v) for v in data.values()),
+        'status': 'ok' if index_ready.is_set() else 'loading',
+        'index_ready': index_ready.is_set(),
+        'generation': index_state['generation'],
+        'pid': os.getpid(),
+        'csv_lock': csv_manager.lock.get_stats(),
+        'response_cache': response_cache.stats(),
+        'json_provider': current_app.json.name,
+        'compression': response_compressor.stats(),
+        'jobs': job_manager.stats(),
+        'rows_loaded': index_state['rows'],
+        'indexed_entries': sum(len(v) for v in data.values()),
         'columns': list(COLUMN_NAMES.keys())
     })
 
-@app.route('/api/stats', methods=['GET'])
+@api_bp.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Metriken im Prometheus-Textformat (Counter über alle Worker summiert, Gauges je Worker)"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@api_bp.route('/api/profiles', methods=['GET'])
+def list_profiles():
+    """Liste der langsamsten profilierten Requests (nur Admin)"""
+    if not is_admin_request():
+        return jsonify({'error': 'Admin-Token erforderlich'}), 403
+
+    return jsonify({
+        'sample_rate': profile_store.sample_rate,
+        'keep': profile_store.keep,
+        'profiles': profile_store.list()
+    })
+
+@api_bp.route('/api/profiles/<int:profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """Profil als pstats-Text (?sort=tottime, ?limit=80) oder .prof-Datei (?format=prof)"""
+    if not is_admin_request():
+        return jsonify({'error': 'Admin-Token erforderlich'}), 403
+
+    entry = profile_store.get(profile_id)
+    if entry is None:
+        return jsonify({'error': 'Profil nicht gefunden'}), 404
+
+    if request.args.get('format') == 'prof':
+        return Response(ProfileStore.dump_stats(entry), mimetype='application/octet-stream',
+                        headers={'Content-Disposition': f'attachment; filename=profile_{profile_id}.prof'})
+
+    sort_by = request.args.get('sort', 'cumulative')
+    if sort_by not in SORT_KEYS:
+        return jsonify({'error': f"Ungültige Sortierung: {sort_by} (erlaubt: {', '.join(SORT_KEYS)})"}), 400
+    try:
+        limit = int(request.args.get('limit', 40))
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return jsonify({'error': 'limit muss eine positive ganze Zahl sein'}), 400
+
+    text = ProfileStore.format_stats(entry, sort_by, limit)
+    return Response(text, mimetype='text/plain; charset=utf-8')
+
+@api_bp.route('/api/profiles/config', methods=['POST'])
+def configure_profiles():
+    """Stichprobenrate und Anzahl gespeicherter Profile zur Laufzeit ändern (nur Admin)"""
+    if not is_admin_request():
+        return jsonify({'error': 'Admin-Token erforderlich'}), 403
+
+    req_data = request.get_json(silent=True) if request.data else {}
+    if not isinstance(req_data, dict):
+        return jsonify({'error': 'JSON-Objekt erwartet'}), 400
+
+    # Erst alles prüfen, dann übernehmen (keine halb angewendete Konfiguration)
+    try:
+        sample_rate = float(req_data['sample_rate']) if 'sample_rate' in req_data else None
+        keep = int(req_data['keep']) if 'keep' in req_data else None
+    except (TypeError, ValueError, OverflowError):
+        return jsonify({'error': 'sample_rate muss eine Zahl, keep eine ganze Zahl sein'}), 400
+    if sample_rate is not None and not math.isfinite(sample_rate):
+        return jsonify({'error': 'sample_rate muss zwischen 0 und 1 liegen'}), 400
+
+    if sample_rate is not None:
+        profile_store.sample_rate = min(1.0, max(0.0, sample_rate))
+    if keep is not None:
+        profile_store.keep = max(1, keep)
+    if req_data.get('clear'):
+        profile_store.clear()
+
+    return jsonify({
+        'success': True,
+        'sample_rate': profile_store.sample_rate,
+        'keep': profile_store.keep
+    })
+
+@api_bp.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get statistics about the data"""
     return jsonify({
@@ -436,7 +877,7 @@ def get_stats():
         'ask': len(data.get('H', {}))
     })
 
-@app.route('/api/validate-number', methods=['POST'])
+@api_bp.route('/api/validate-number', methods=['POST'])
 def validate_number():
     """Validiert eine Artikelnummer"""
     try:
@@ -479,7 +920,7 @@ def validate_number():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/update-entry', methods=['POST'])
+@api_bp.route('/api/update-entry', methods=['POST'])
 def update_entry():
     """Aktualisiert oder löscht eine Zelle in der CSV"""
     try:
@@ -513,7 +954,7 @@ def update_entry():
                 current_value = row_list[0].get(col, '')
                 if current_value and current_value != '-':
                     # Check if value already exists in pipe-separated list
-                    existing_values = [v.strip() for v in current_value.split('|')]
+                    existing_values = split_values(current_value)
                     if value not in existing_values:
                         final_value = f"{current_value}|{value}"
                     else:
@@ -525,8 +966,8 @@ def update_entry():
         if not success:
             return jsonify({'error': result_message}), 500
 
-        # Daten neu laden
-        load_data()
+        # Daten neu laden (und andere Worker benachrichtigen)
+        reload_after_write()
 
         return jsonify({
             'success': True,
@@ -539,7 +980,7 @@ def update_entry():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/delete-row', methods=['POST'])
+@api_bp.route('/api/delete-row', methods=['POST'])
 def delete_row():
     """Löscht eine komplette Zeile aus der CSV"""
     try:
@@ -555,8 +996,8 @@ def delete_row():
         if not success:
             return jsonify({'error': result_message}), 500
 
-        # Daten neu laden
-        load_data()
+        # Daten neu laden (und andere Worker benachrichtigen)
+        reload_after_write()
 
         return jsonify({
             'success': True,
@@ -567,7 +1008,7 @@ def delete_row():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/undo', methods=['POST'])
+@api_bp.route('/api/undo', methods=['POST'])
 def undo_last():
     """Macht die letzte Änderung rückgängig (max 3 Min alt)"""
     try:
@@ -576,8 +1017,8 @@ def undo_last():
         if not success:
             return jsonify({'error': message}), 400
 
-        # Daten neu laden
-        load_data()
+        # Daten neu laden (und andere Worker benachrichtigen)
+        reload_after_write()
 
         return jsonify({
             'success': True,
@@ -587,7 +1028,7 @@ def undo_last():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/create-entry', methods=['POST'])
+@api_bp.route('/api/create-entry', methods=['POST'])
 def create_entry():
     """Erstellt einen neuen Eintrag in der Portfolio CSV (Neuaufnahme)"""
     try:
@@ -645,8 +1086,8 @@ def create_entry():
         if not success:
             return jsonify({'error': message}), 500
 
-        # Daten neu laden
-        load_data()
+        # Daten neu laden (und andere Worker benachrichtigen)
+        reload_after_write()
 
         return jsonify({
             'success': True,
@@ -658,7 +1099,7 @@ def create_entry():
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/upload-image', methods=['POST'])
+@api_bp.route('/api/upload-image', methods=['POST'])
 def upload_image():
     """Lädt ein Produktbild hoch und speichert es mit der Syskomp-Nummer als Name"""
     try:
@@ -699,6 +1140,9 @@ def upload_image():
             # If PIL not available, just save as-is
             image_file.save(image_path)
 
+        # Suchergebnisse enthalten die Bild-Info - neu berechnen
+        response_cache.clear()
+
         return jsonify({
             'success': True,
             'message': 'Bild erfolgreich hochgeladen',
@@ -709,7 +1153,7 @@ def upload_image():
         return jsonify({'error': str(e)}), 500
 
 
-@app.route('/api/update-catalog-artikelnr', methods=['POST'])
+@api_bp.route('/api/update-catalog-artikelnr', methods=['POST'])
 def update_catalog_artikelnr():
     """Aktualisiert oder löscht eine Artikelnummer in einer Katalog-CSV-Datei"""
     try:
@@ -744,26 +1188,34 @@ def update_catalog_artikelnr():
         # Verwende die erste gefundene CSV
         catalog_file = os.path.join(catalog_dir, csv_files[0])
 
-        # CSV lesen und Artikelnummer aktualisieren
-        updated = False
-        rows = []
+        # Katalog-CSV prozessübergreifend sperren (Mapper/andere Worker schreiben evtl. gleichzeitig)
+        catalog_lock = InterProcessLock(catalog_file + '.lock')
+        if not catalog_lock.acquire(timeout=5):
+            return jsonify({'error': 'Katalog-Datei momentan gesperrt. Bitte erneut versuchen.'}), 409
 
-        with open(catalog_file, 'r', encoding='utf-8-sig', newline='') as f:
-            reader = csv.reader(f, delimiter=';')
-            for row in reader:
-                if len(row) > 0 and row[0] == old_artikelnr:
-                    # Artikelnummer in der ersten Spalte aktualisieren
-                    row[0] = new_artikelnr
-                    updated = True
-                rows.append(row)
-
-        if not updated:
-            return jsonify({'error': f'Artikelnummer {old_artikelnr} nicht gefunden'}), 404
-
-        # CSV zurückschreiben
-        with open(catalog_file, 'w', encoding='utf-8-sig', newline='') as f:
-            writer = csv.writer(f, delimiter=';', quoting=csv.QUOTE_MINIMAL)
-            writer.writerows(rows)
+        try:
+            # CSV lesen und Artikelnummer aktualisieren
+            updated = False
+            rows = []
+
+            with open(catalog_file, 'r', encoding='utf-8-sig', newline='') as f:
+                reader = csv.reader(f, delimiter=';')
+                for row in reader:
+                    if len(row) > 0 and row[0] == old_artikelnr:
+                        # Artikelnummer in der ersten Spalte aktualisieren
+                        row[0] = new_artikelnr
+                        updated = True
+                    rows.append(row)
+
+            if not updated:
+                return jsonify({'error': f'Artikelnummer {old_artikelnr} nicht gefunden'}), 404
+
+            # CSV zurückschreiben
+            with open(catalog_file, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f, delimiter=';', quoting=csv.QUOTE_MINIMAL)
+                writer.writerows(rows)
+        finally:
+            catalog_lock.release()
 
         message = 'Artikelnummer erfolgreich gelöscht' if not new_artikelnr else 'Artikelnummer erfolgreich aktualisiert'
 
@@ -778,7 +1230,7 @@ def update_catalog_artikelnr():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/scan-catalogs', methods=['GET'])
+@api_bp.route('/api/scan-catalogs', methods=['GET'])
 def scan_catalogs():
     """Scannt nach Katalog-CSV-Dateien in verschiedenen Verzeichnissen"""
     try:
@@ -813,215 +1265,463 @@ def scan_catalogs():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/load-catalog', methods=['POST'])
+def run_load_catalog(req_data, job=None):
+    """
+    Katalog laden und mit dem Portfolio abgleichen (Endpunkt und Job-Queue)
+
+    Returns:
+        Tuple[Dict, int]: (Antwort, HTTP-Status)
+    """
+    catalog_path = req_data.get('catalog_path', '')
+
+    if not catalog_path or not os.path.exists(catalog_path):
+        return {'error': 'Katalog-Datei nicht gefunden'}, 400
+
+    products = []
+    with open(catalog_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            products.append(row)
+
+    # Determine image directory
+    catalog_name = os.path.splitext(os.path.basename(catalog_path))[0]
+    parent_dir = os.path.dirname(catalog_path)
+    image_dir = os.path.join(parent_dir, f"{catalog_name}-images")
+
+    # Determine catalog type and check appropriate columns
+    is_alvaris = 'ALVARIS' in parent_dir.upper() or 'alvaris' in catalog_name.lower()
+
+    # Check which article numbers already exist in Portfolio CSV and store their Syskomp numbers
+    # Now supports multiple Syskomp numbers per article (list instead of single dict)
+    existing_numbers = {}  # {artikelnummer: [{'syskomp_neu': ..., 'syskomp_alt': ..., 'other_catalog_nrs': {...}}, ...]}
+    portfolio_path = csv_path
+    if os.path.exists(portfolio_path):
+        with open(portfolio_path, 'r', encoding='utf-8') as pf:
+            portfolio_reader = csv.reader(pf, delimiter=';')
+            next(portfolio_reader, None)  # Skip header
+            for row in portfolio_reader:
+                syskomp_neu = row[0].strip() if len(row) > 0 else ''
+                syskomp_alt = row[1].strip() if len(row) > 1 else ''
+                item_nr = row[3].strip() if len(row) > 3 else ''
+                bosch_nr = row[4].strip() if len(row) > 4 else ''
+                alvaris_artnr = row[5].strip() if len(row) > 5 else ''
+                alvaris_matnr = row[6].strip() if len(row) > 6 else ''
+                ask_nr = row[7].strip() if len(row) > 7 else ''
+
+                # Build other catalog numbers dict
+                other_catalog_nrs = {
+                    'item': item_nr,
+                    'bosch': bosch_nr,
+                    'alvaris_artnr': alvaris_artnr,
+                    'alvaris_matnr': alvaris_matnr,
+                    'ask': ask_nr
+                }
+
+                mapping_info = {
+                    'syskomp_neu': syskomp_neu,
+                    'syskomp_alt': syskomp_alt,
+                    'other_catalog_nrs': other_catalog_nrs
+                }
+
+                # Helper to add mapping for an article number (handles pipe-separated values)
+                def add_mapping(artnr_field):
+                    if not artnr_field:
+                        return
+                    # Handle pipe-separated values
+                    for artnr in split_values(artnr_field):
+                        if artnr not in existing_numbers:
+                            existing_numbers[artnr] = []
+                        # Avoid duplicates
+                        if not any(m['syskomp_neu'] == syskomp_neu for m in existing_numbers[artnr]):
+                            existing_numbers[artnr].append(mapping_info.copy())
+
+                if is_alvaris:
+                    # Alvaris: Check column F (AlvarisArtnr) and G (AlvarisMatnr)
+                    add_mapping(alvaris_artnr)
+                    add_mapping(alvaris_matnr)
+                else:
+                    # ASK: Check column H
+                    add_mapping(ask_nr)
+
+    # Mark products that already exist and add Syskomp numbers (now as list)
+    for idx, product in enumerate(products):
+        if job is not None:
+            job.update(idx, len(products), products)
+        art_nr = product.get('Artikelnummer', '').strip()
+        if art_nr in existing_numbers:
+            product['already_mapped'] = True
+            product['existing_mappings'] = existing_numbers[art_nr]  # List of all mappings
+            # For backwards compatibility, also set single values from first mapping
+            product['mapped_syskomp_neu'] = existing_numbers[art_nr][0]['syskomp_neu']
+            product['mapped_syskomp_alt'] = existing_numbers[art_nr][0]['syskomp_alt']
+        else:
+            product['already_mapped'] = False
+            product['existing_mappings'] = []
+
+    return {
+        'success': True,
+        'products': products,
+        'catalog_name': catalog_name,
+        'image_dir': image_dir,
+        'total': len(products)
+    }, 200
+
+@api_bp.route('/api/load-catalog', methods=['POST'])
 def load_catalog():
     """Lädt einen Katalog (ASK/ALVARIS) und gibt Produkte zurück"""
     try:
-        req_data = request.json
-        catalog_path = req_data.get('catalog_path', '')
-
-        if not catalog_path or not os.path.exists(catalog_path):
-            return jsonify({'error': 'Katalog-Datei nicht gefunden'}), 400
-
-        products = []
-        with open(catalog_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                products.append(row)
-
-        # Determine image directory
-        catalog_name = os.path.splitext(os.path.basename(catalog_path))[0]
-        parent_dir = os.path.dirname(catalog_path)
-        image_dir = os.path.join(parent_dir, f"{catalog_name}-images")
-
-        # Determine catalog type and check appropriate columns
-        is_alvaris = 'ALVARIS' in parent_dir.upper() or 'alvaris' in catalog_name.lower()
-
-        # Check which article numbers already exist in Portfolio CSV and store their Syskomp numbers
-        # Now supports multiple Syskomp numbers per article (list instead of single dict)
-        existing_numbers = {}  # {artikelnummer: [{'syskomp_neu': ..., 'syskomp_alt': ..., 'other_catalog_nrs': {...}}, ...]}
-        portfolio_path = os.path.join(os.path.dirname(__file__), '..', 'Portfolio_Syskomp_pA.csv')
-        if os.path.exists(portfolio_path):
-            with open(portfolio_path, 'r', encoding='utf-8') as pf:
-                portfolio_reader = csv.reader(pf, delimiter=';')
-                next(portfolio_reader, None)  # Skip header
-                for row in portfolio_reader:
-                    syskomp_neu = row[0].strip() if len(row) > 0 else ''
-                    syskomp_alt = row[1].strip() if len(row) > 1 else ''
-                    item_nr = row[3].strip() if len(row) > 3 else ''
-                    bosch_nr = row[4].strip() if len(row) > 4 else ''
-                    alvaris_artnr = row[5].strip() if len(row) > 5 else ''
-                    alvaris_matnr = row[6].strip() if len(row) > 6 else ''
-                    ask_nr = row[7].strip() if len(row) > 7 else ''
-
-                    # Build other catalog numbers dict
-                    other_catalog_nrs = {
-                        'item': item_nr,
-                        'bosch': bosch_nr,
-                        'alvaris_artnr': alvaris_artnr,
-                        'alvaris_matnr': alvaris_matnr,
-                        'ask': ask_nr
-                    }
-
-                    mapping_info = {
-                        'syskomp_neu': syskomp_neu,
-                        'syskomp_alt': syskomp_alt,
-                        'other_catalog_nrs': other_catalog_nrs
-                    }
-
-                    # Helper to add mapping for an article number (handles pipe-separated values)
-                    def add_mapping(artnr_field):
-                        if not artnr_field:
-                            return
-                        # Handle pipe-separated values
-                        for artnr in artnr_field.split('|'):
-                            artnr = artnr.strip()
-                            if artnr:
-                                if artnr not in existing_numbers:
-                                    existing_numbers[artnr] = []
-                                # Avoid duplicates
-                                if not any(m['syskomp_neu'] == syskomp_neu for m in existing_numbers[artnr]):
-                                    existing_numbers[artnr].append(mapping_info.copy())
-
-                    if is_alvaris:
-                        # Alvaris: Check column F (AlvarisArtnr) and G (AlvarisMatnr)
-                        add_mapping(alvaris_artnr)
-                        add_mapping(alvaris_matnr)
-                    else:
-                        # ASK: Check column H
-                        add_mapping(ask_nr)
-
-        # Mark products that already exist and add Syskomp numbers (now as list)
-        for product in products:
-            art_nr = product.get('Artikelnummer', '').strip()
-            if art_nr in existing_numbers:
-                product['already_mapped'] = True
-                product['existing_mappings'] = existing_numbers[art_nr]  # List of all mappings
-                # For backwards compatibility, also set single values from first mapping
-                product['mapped_syskomp_neu'] = existing_numbers[art_nr][0]['syskomp_neu']
-                product['mapped_syskomp_alt'] = existing_numbers[art_nr][0]['syskomp_alt']
-            else:
-                product['already_mapped'] = False
-                product['existing_mappings'] = []
-
-        return jsonify({
-            'success': True,
-            'products': products,
-            'catalog_name': catalog_name,
-            'image_dir': image_dir,
-            'total': len(products)
-        })
+        result, status = run_load_catalog(request.json)
+        return jsonify(result), status
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/api/find-similar', methods=['POST'])
+def run_find_similar(req_data, job=None):
+    """
+    Ähnlichkeitssuche über die Beschreibungen (Endpunkt und Job-Queue)
+
+    Returns:
+        Tuple[Dict, int]: (Antwort, HTTP-Status)
+    """
+    from difflib import SequenceMatcher
+    import re
+
+    search_description = req_data.get('description', '').strip().lower()
+    min_similarity = req_data.get('min_similarity', 0.0)
+    filter_type = req_data.get('filter_type', 'all')  # 'all', 'item', 'bosch'
+
+    if not search_description:
+        return {'error': 'Beschreibung erforderlich'}, 400
+
+    matches = []
+
+    # Durchsuche alle Zeilen im Portfolio CSV (now lists)
+    for col_letter in ['A']:  # Nur Syskomp neu
+        entries = data.get(col_letter, {})
+        for idx, (syskomp_neu, row_list) in enumerate(entries.items()):
+            if job is not None:
+                job.update(idx, len(entries))
+            for row_data in row_list:
+                description = row_data.get('C', '').lower()
+
+                if not description:
+                    continue
+
+                # Filter nach Typ (Item/Bosch)
+                item_nr = row_data.get('D', '')
+                bosch_nr = row_data.get('E', '')
+
+                if filter_type == 'item' and not item_nr:
+                    continue
+                if filter_type == 'bosch' and not bosch_nr:
+                    continue
+
+                # Berechne Ähnlichkeit
+                similarity = SequenceMatcher(None, search_description, description).ratio()
+
+                # Bonus für "Profil X" <-> "Nut X" Matching
+                profil_match = re.search(r'profil\s*(\d+)', search_description)
+                nut_match = re.search(r'nut\s*(\d+)', description)
+
+                if profil_match and nut_match:
+                    if profil_match.group(1) == nut_match.group(1):
+                        similarity = min(1.0, similarity + 0.3)
+
+                # Reverse check
+                nut_match1 = re.search(r'nut\s*(\d+)', search_description)
+                profil_match2 = re.search(r'profil\s*(\d+)', description)
+
+                if nut_match1 and profil_match2:
+                    if nut_match1.group(1) == profil_match2.group(1):
+                        similarity = min(1.0, similarity + 0.3)
+
+                if similarity >= min_similarity:
+                    matches.append({
+                        'syskomp_neu': row_data.get('A', ''),
+                        'syskomp_alt': row_data.get('B', ''),
+                        'description': row_data.get('C', ''),
+                        'item': row_data.get('D', ''),
+                        'bosch': row_data.get('E', ''),
+                        'alvaris_artnr': row_data.get('F', ''),
+                        'alvaris_matnr': row_data.get('G', ''),
+                        'ask': row_data.get('H', ''),
+                        'similarity': similarity
+                    })
+
+    # Sortiere nach Ähnlichkeit (höchste zuerst)
+    matches.sort(key=lambda x: x['similarity'], reverse=True)
+
+    return {
+        'success': True,
+        'matches': matches[:20],  # Top 20
+        'total_found': len(matches)
+    }, 200
+
+@api_bp.route('/api/find-similar', methods=['POST'])
 def find_similar():
     """Findet ähnliche Produkte aus Portfolio CSV basierend auf Beschreibung"""
     try:
-        from difflib import SequenceMatcher
-        import re
+        result, status = run_find_similar(request.json)
+        return jsonify(result), status
 
-        req_data = request.json
-        search_description = req_data.get('description', '').strip().lower()
-        min_similarity = req_data.get('min_similarity', 0.0)
-        filter_type = req_data.get('filter_type', 'all')  # 'all', 'item', 'bosch'
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-        if not search_description:
-            return jsonify({'error': 'Beschreibung erforderlich'}), 400
+def run_bulk_validation(req_data, job=None):
+    """
+    Online-Prüfung der Nummern in D/F/G gegen item24 und Alvaris (nur als Job)
+
+    Returns:
+        Tuple[Dict, int]: (Antwort, HTTP-Status)
+    """
+    # Erst bei Bedarf importieren (aiohttp verlängert sonst den API-Start)
+    from bulk_validation import BulkValidator, ONLINE_COLUMNS, collect_numbers, default_paths, write_report
+
+    cols = [str(col).upper() for col in req_data.get('cols') or ONLINE_COLUMNS]
+    for col in cols:
+        if col not in ONLINE_COLUMNS:
+            return {'error': f'Spalte {col} kann nicht online geprüft werden (nur D, F, G)'}, 400
+
+    rows_by_number, invalid = collect_numbers(csv_path, cols)
+    items = sorted(rows_by_number)
+    if req_data.get('limit'):
+        items = items[:int(req_data['limit'])]
+
+    progress_path, report_path = default_paths(csv_path)
+    validator = BulkValidator(
+        concurrency=int(req_data.get('concurrency', 4)),
+        rate=float(req_data.get('rate', 5.0)),
+        # Nur per Umgebung umleitbar (z.B. auf fake_shop_server.py), nicht per Request
+        base_url=os.environ.get('VALIDATION_BASE_URL') or None,
+        progress_path=progress_path
+    )
+
+    checked = []
+
+    def on_result(result, done, total):
+        if job is not None:
+            checked.append(result)
+            job.update(done, total, checked)
+
+    summary = validator.run_sync(items, on_result=on_result,
+                                 cancel_event=job.cancel_event if job is not None else None,
+                                 resume=not req_data.get('restart', False))
+
+    item_set = set(items)
+    results = [r for r in validator.results() if (r['col'], r['number']) in item_set]
+    write_report(report_path, results, rows_by_number)
+
+    dead = []
+    for result in results:
+        if result['status'] != 'ok':
+            entry = dict(result)
+            entry['syskomp_neu'] = rows_by_number.get((result['col'], result['number']), [])
+            dead.append(entry)
+
+    summary['invalid_format'] = invalid
+    return {
+        'success': True,
+        'summary': summary,
+        'dead': dead,
+        'report_path': report_path
+    }, 200
+
+def job_handler(run):
+    """Macht aus einer Kernfunktion (req_data, job) -> (Antwort, Status) eine Job-Funktion"""
+    def handler(params, job):
+        ensure_data_loaded()
+        result, status = run(params, job)
+        if status != 200:
+            raise ValueError(result.get('error', f'Status {status}'))
+        return result
+    return handler
+
+for job_kind, job_run in {
+    'batch-convert': run_batch_convert,
+    'batch-convert-path': run_batch_convert_path,
+    'load-catalog': run_load_catalog,
+    'find-similar': run_find_similar,
+    'bulk-validation': run_bulk_validation,
+}.items():
+    job_manager.register(job_kind, job_handler(job_run))
+
+@api_bp.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Reicht eine lange Operation als Hintergrund-Job ein (Antwort sofort mit Job-ID)"""
+    try:
+        req_data = request.json
+        kind = req_data.get('kind', '')
+        params = req_data.get('params', {})
 
-        matches = []
+        if kind not in job_manager.handlers:
+            return jsonify({'error': f'Unbekannter Job-Typ: {kind}',
+                            'kinds': sorted(job_manager.handlers)}), 400
+        if not isinstance(params, dict):
+            return jsonify({'error': 'params muss ein Objekt sein'}), 400
 
-        # Durchsuche alle Zeilen im Portfolio CSV (now lists)
-        for col_letter in ['A']:  # Nur Syskomp neu
-            for syskomp_neu, row_list in data.get(col_letter, {}).items():
-                for row_data in row_list:
-                    description = row_data.get('C', '').lower()
+        return jsonify(job_manager.submit(kind, params)), 202
 
-                    if not description:
-                        continue
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-                    # Filter nach Typ (Item/Bosch)
-                    item_nr = row_data.get('D', '')
-                    bosch_nr = row_data.get('E', '')
+@api_bp.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """Alle Jobs (neueste zuerst), auch aus anderen Workern"""
+    try:
+        return jsonify({'jobs': job_manager.list(), 'kinds': sorted(job_manager.handlers)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-                    if filter_type == 'item' and not item_nr:
-                        continue
-                    if filter_type == 'bosch' and not bosch_nr:
-                        continue
-
-                    # Berechne Ähnlichkeit
-                    similarity = SequenceMatcher(None, search_description, description).ratio()
-
-                    # Bonus für "Profil X" <-> "Nut X" Matching
-                    profil_match = re.search(r'profil\s*(\d+)', search_description)
-                    nut_match = re.search(r'nut\s*(\d+)', description)
-
-                    if profil_match and nut_match:
-                        if profil_match.group(1) == nut_match.group(1):
-                            similarity = min(1.0, similarity + 0.3)
-
-                    # Reverse check
-                    nut_match1 = re.search(r'nut\s*(\d+)', search_description)
-                    profil_match2 = re.search(r'profil\s*(\d+)', description)
-
-                    if nut_match1 and profil_match2:
-                        if nut_match1.group(1) == profil_match2.group(1):
-                            similarity = min(1.0, similarity + 0.3)
-
-                    if similarity >= min_similarity:
-                        matches.append({
-                            'syskomp_neu': row_data.get('A', ''),
-                            'syskomp_alt': row_data.get('B', ''),
-                            'description': row_data.get('C', ''),
-                            'item': row_data.get('D', ''),
-                            'bosch': row_data.get('E', ''),
-                            'alvaris_artnr': row_data.get('F', ''),
-                            'alvaris_matnr': row_data.get('G', ''),
-                            'ask': row_data.get('H', ''),
-                            'similarity': similarity
-                        })
-
-        # Sortiere nach Ähnlichkeit (höchste zuerst)
-        matches.sort(key=lambda x: x['similarity'], reverse=True)
+@api_bp.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Status und Fortschritt eines Jobs"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job nicht gefunden'}), 404
+    return jsonify(job)
+
+@api_bp.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Ergebnis eines fertigen Jobs (?download=1 als Datei)"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job nicht gefunden'}), 404
+    if job['status'] != 'done':
+        return jsonify({'error': f"Job ist nicht fertig (Status: {job['status']})", 'job': job}), 409
+
+    result_path = job_manager.result_path(job_id)
+    if result_path is None:
+        return jsonify({'error': 'Ergebnis nicht mehr vorhanden'}), 404
+
+    with open(result_path, 'rb') as f:
+        response = Response(f.read(), mimetype='application/json')
+    if request.args.get('download') == '1':
+        response.headers['Content-Disposition'] = f"attachment; filename={job['kind']}_{job_id}.json"
+    return response
+
+def format_sse(event, payload, event_id=None):
+    """Formatiert ein Server-Sent Event (Daten als einzeiliges JSON)"""
+    if event == 'keepalive':
+        return ': keepalive\n\n'
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {current_app.json.dumps(payload)}")
+    return '\n'.join(lines) + '\n\n'
+
+@api_bp.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """
+    Fortschritt eines Jobs als Server-Sent Events (EventSource)
+
+    Events: progress (verarbeitet, gesamt, Prozent, Durchsatz, Restzeit), partial
+    (Teilergebnisse), zum Schluss done/failed/cancelled. Query-Parameter:
+    partial=0 ohne Teilergebnisse, cancel_on_disconnect=1 bricht den Job ab,
+    wenn der Client die Verbindung schließt.
+    """
+    if job_manager.get(job_id) is None:
+        return jsonify({'error': 'Job nicht gefunden'}), 404
+
+    include_partial = request.args.get('partial', '1') != '0'
+    cancel_on_disconnect = request.args.get('cancel_on_disconnect') == '1'
+    try:
+        # EventSource sendet nach Verbindungsabbruch die letzte partial-ID mit
+        offset = int(request.headers.get('Last-Event-ID') or request.args.get('offset') or 0)
+    except ValueError:
+        offset = 0
 
-        return jsonify({
-            'success': True,
-            'matches': matches[:20],  # Top 20
-            'total_found': len(matches)
-        })
+    def stream():
+        finished = False
+        try:
+            yield 'retry: 2000\n\n'
+            for event, payload in job_manager.events(job_id, include_partial, offset):
+                event_id = payload['offset'] if event == 'partial' else None
+                yield format_sse(event, payload, event_id)
+            finished = True
+        finally:
+            # Client hat die Verbindung geschlossen (GeneratorExit) - Kapazität freigeben
+            if not finished and cancel_on_disconnect:
+                job_manager.cancel(job_id)
+
+    return Response(stream_with_context(stream()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+@api_bp.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Bricht einen wartenden oder laufenden Job ab"""
+    if job_manager.get(job_id) is None:
+        return jsonify({'error': 'Job nicht gefunden'}), 404
+    if not job_manager.cancel(job_id):
+        return jsonify({'error': 'Job ist bereits abgeschlossen'}), 409
+    return jsonify({'success': True, 'job': job_manager.get(job_id)})
+
+@api_bp.route('/api/jobs/<job_id>', methods=['DELETE'])
+def delete_job(job_id):
+    """Löscht einen abgeschlossenen Job samt Ergebnis"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job nicht gefunden'}), 404
+    if not job_manager.delete(job_id):
+        return jsonify({'error': 'Job läuft noch - Abbruch wurde angefordert'}), 409
+    return jsonify({'success': True})
 
 # Serve frontend (must be after all API routes)
-@app.route('/')
+@api_bp.route('/')
 def serve_frontend():
     """Serve the frontend index.html"""
-    if os.path.exists(app.static_folder):
-        return send_from_directory(app.static_folder, 'index.html')
+    if os.path.exists(current_app.static_folder):
+        return send_from_directory(current_app.static_folder, 'index.html')
     else:
         return jsonify({'error': 'Frontend not built. Run: cd frontend && npm run build'}), 404
 
-@app.route('/<path:path>')
+@api_bp.route('/<path:path>')
 def serve_static(path):
     """Serve static files or fallback to index.html for client-side routing"""
     # Skip API routes
     if path.startswith('api/'):
         return jsonify({'error': 'API endpoint not found'}), 404
 
-    file_path = os.path.join(app.static_folder, path)
+    file_path = os.path.join(current_app.static_folder, path)
     if os.path.exists(file_path):
-        return send_from_directory(app.static_folder, path)
+        return send_from_directory(current_app.static_folder, path)
     else:
         # For client-side routing, return index.html
-        if os.path.exists(app.static_folder):
-            return send_from_directory(app.static_folder, 'index.html')
+        if os.path.exists(current_app.static_folder):
+            return send_from_directory(current_app.static_folder, 'index.html')
         else:
             return jsonify({'error': 'Frontend not built'}), 404
 
-# Load data on startup
-load_data()
+def create_app(preload=None):
+    """
+    Application Factory
+
+    Args:
+        preload: Zeitpunkt für das Laden des Index
+                 'eager'      - sofort (blockiert bis der Index bereit ist)
+                 'background' - in einem Thread, Server ist sofort erreichbar (Standard)
+                 'lazy'       - beim ersten Request
+                 Standardwert kommt aus der Umgebungsvariable INDEX_PRELOAD.
+    """
+    if preload is None:
+        preload = os.environ.get('INDEX_PRELOAD', 'background')
+
+    app = Flask(__name__, static_folder=frontend_dist, static_url_path='')
+    app.json = get_provider_class()(app)
+    CORS(app)
+    app.register_blueprint(api_bp)
+    # Nach dem Blueprint registriert -> läuft vor der Latenzmessung, Komprimierung zählt mit
+    response_compressor.init_app(app)
+
+    if preload == 'eager':
+        ensure_data_loaded()
+    elif preload == 'background':
+        start_background_load()
+
+    return app
 
 if __name__ == '__main__':
+    app = create_app()
     app.run(debug=True, port=5000, host='0.0.0.0')
@@ -0,0 +1,456 @@
+"""
+Massenprüfung der Artikelnummern gegen item24 und Alvaris (asyncio)
+
+Prüft, ob die Nummern einer Spalte (D, F, G) oder des ganzen Portfolios in
+den Shops noch gefunden werden. Statt validate_url_exists Nummer für Nummer
+aufzurufen, laufen die Abfragen nebenläufig:
+  - begrenzte Parallelität je Domain (Semaphore)
+  - Token-Bucket je Domain gegen zu hohe Request-Raten (429 bremst zusätzlich)
+  - Wiederholung mit exponentiellem Backoff bei Timeouts, 429 und 5xx
+  - Fortschritt wird laufend als JSON gespeichert; ein erneuter Lauf setzt
+    dort fort (Fehler werden erneut geprüft, Treffer nicht)
+  - Bericht der toten Nummern als CSV (Spalte, Nummer, Syskomp neu, Meldung, URL)
+
+HTTP läuft über aiohttp, wenn installiert, sonst über requests in Threads.
+Zum Testen ohne echte Shops: fake_shop_server.py und --base-url.
+
+Verwendung:
+    python bulk_validation.py --col D
+    python bulk_validation.py --all --concurrency 4 --rate 5
+    python bulk_validation.py --col F --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from portfolio_index import split_values
+from validators import check_page, get_validation_url, validate_generic
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Nur diese Spalten lassen sich online prüfen (Bosch/ASK: siehe validate_url_exists)
+ONLINE_COLUMNS = ['D', 'F', 'G']
+
+PROGRESS_VERSION = 1
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FetchError(Exception):
+    """Netzwerkfehler oder Timeout beim Laden einer Seite (wird wiederholt)"""
+
+
+class TokenBucket:
+    """Begrenzt die Rate auf `rate` Requests/s, kurzzeitig bis zu `burst` am Stück"""
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Nach einem 429: für `seconds` keine neuen Tokens"""
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+class _AiohttpFetcher:
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.session = None
+
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.session.close()
+
+    async def get(self, url: str) -> Tuple[int, str, Dict]:
+        try:
+            async with self.session.get(url, allow_redirects=True) as response:
+                text = await response.text(errors='replace')
+                return response.status, text, dict(response.headers)
+        except asyncio.TimeoutError:
+            raise FetchError("Timeout beim Laden der URL")
+        except aiohttp.ClientError as e:
+            raise FetchError(f"Fehler beim Laden: {e}")
+
+
+class _ThreadFetcher:
+    """Fallback ohne aiohttp: requests in Threads (eine Session je Thread)"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._local = threading.local()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def _get(self, url: str) -> Tuple[int, str, Dict]:
+        import requests
+
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        try:
+            response = session.get(url, timeout=self.timeout, allow_redirects=True)
+            return response.status_code, response.text, dict(response.headers)
+        except requests.exceptions.Timeout:
+            raise FetchError("Timeout beim Laden der URL")
+        except requests.exceptions.RequestException as e:
+            raise FetchError(f"Fehler beim Laden: {e}")
+
+    async def get(self, url: str) -> Tuple[int, str, Dict]:
+        return await asyncio.to_thread(self._get, url)
+
+
+def collect_numbers(csv_path: str, cols: Iterable[str] = ONLINE_COLUMNS) -> Tuple[Dict, int]:
+    """
+    Liest alle Einzelnummern der Spalten aus der Portfolio-CSV
+
+    Returns:
+        Tuple[Dict, int]: ({(spalte, nummer): [syskomp_neu, ...]}, Anzahl formal ungültiger Nummern)
+    """
+    cols = [col for col in cols if col in ONLINE_COLUMNS]
+    items = {}
+    invalid = 0
+
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f, delimiter=';')
+        next(reader, None)
+
+        for row in reader:
+            syskomp_neu = row[0].strip() if row else ''
+            for col in cols:
+                col_idx = ord(col) - ord('A')
+                cell = row[col_idx].strip() if col_idx < len(row) else ''
+                for number in split_values(cell):
+                    if not validate_generic(number, col)[0]:
+                        invalid += 1
+                        continue
+                    rows = items.setdefault((col, number), [])
+                    if syskomp_neu and syskomp_neu not in rows:
+                        rows.append(syskomp_neu)
+
+    return items, invalid
+
+
+class ValidationProgress:
+    """Ergebnisse je (Spalte, Nummer) als JSON-Datei, damit ein Lauf fortgesetzt werden kann"""
+
+    def __init__(self, path: Optional[str], save_every: int = 50):
+        self.path = path
+        self.save_every = save_every
+        self.results = {}
+        self._unsaved = 0
+
+    @staticmethod
+    def key(col: str, number: str) -> str:
+        return f"{col}|{number}"
+
+    def load(self) -> int:
+        """Lädt gespeicherte Ergebnisse (fehlerhafte Einträge werden erneut geprüft)"""
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Fortschritt nicht lesbar, starte neu: {e}")
+            return 0
+        if state.get('version') != PROGRESS_VERSION:
+            return 0
+        self.results = {key: result for key, result in state.get('results', {}).items()
+                        if result.get('status') != 'error'}
+        return len(self.results)
+
+    def is_done(self, col: str, number: str) -> bool:
+        return self.key(col, number) in self.results
+
+    def record(self, result: Dict):
+        self.results[self.key(result['col'], result['number'])] = result
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.save()
+
+    def save(self):
+        """Schreibt den Fortschritt atomar (temporäre Datei + os.replace)"""
+        if not self.path or not self._unsaved:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': PROGRESS_VERSION, 'results': self.results}, f)
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+    def remove(self):
+        self.results = {}
+        self._unsaved = 0
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class BulkValidator:
+    """Prüft viele Nummern nebenläufig mit Limits je Domain"""
+
+    def __init__(self, concurrency: int = 4, rate: float = 5.0, burst: float = None,
+                 timeout: float = 10.0, retries: int = 3, backoff: float = 1.0,
+                 base_url: str = None, progress_path: str = None, use_aiohttp: bool = None):
+        """
+        Args:
+            concurrency: Gleichzeitige Requests je Domain
+            rate: Requests pro Sekunde je Domain (Token-Bucket)
+            retries: Wiederholungen nach Timeout, 429 oder 5xx
+            backoff: Wartezeit vor der ersten Wiederholung (verdoppelt sich danach)
+            base_url: Ersetzt Schema und Host der Shop-URLs (z.B. lokaler Fake-Server)
+            progress_path: JSON-Datei für den Fortschritt (None = nicht speichern)
+            use_aiohttp: None = automatisch (wenn installiert)
+        """
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.base_url = base_url
+        self.progress = ValidationProgress(progress_path)
+        self.use_aiohttp = aiohttp is not None if use_aiohttp is None else use_aiohttp
+        self._semaphores = {}
+        self._buckets = {}
+
+    def build_url(self, col: str, number: str) -> str:
+        url = get_validation_url(col, number)
+        if self.base_url:
+            base = urlsplit(self.base_url)
+            parts = urlsplit(url)
+            url = urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+        return url
+
+    def _limits(self, domain: str):
+        if domain not in self._semaphores:
+            self._semaphores[domain] = asyncio.Semaphore(self.concurrency)
+            self._buckets[domain] = TokenBucket(self.rate, self.burst)
+        return self._semaphores[domain], self._buckets[domain]
+
+    async def check(self, fetcher, col: str, number: str) -> Dict:
+        """Prüft eine Nummer inkl. Wiederholungen und gibt das Ergebnis-Dict zurück"""
+        url = self.build_url(col, number)
+        semaphore, bucket = self._limits(urlsplit(url).netloc)
+        message = ''
+        http_status = None
+
+        for attempt in range(1, self.retries + 2):
+            async with semaphore:
+                await bucket.acquire()
+                try:
+                    http_status, text, headers = await fetcher.get(url)
+                except FetchError as e:
+                    message = str(e)
+                else:
+                    if http_status not in RETRY_STATUS:
+                        ok, message = check_page(col, number, http_status, text)
+                        return self._result(col, number, 'ok' if ok else 'dead', message, http_status, attempt, url)
+                    message = f"Fehler beim Laden (Status: {http_status})"
+                    if http_status == 429:
+                        bucket.pause(_retry_after(headers, self.backoff))
+
+            if attempt <= self.retries:
+                await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+
+        return self._result(col, number, 'error', message, http_status, self.retries + 1, url)
+
+    @staticmethod
+    def _result(col, number, status, message, http_status, attempts, url) -> Dict:
+        return {
+            'col': col,
+            'number': number,
+            'status': status,
+            'message': message,
+            'http_status': http_status,
+            'attempts': attempts,
+            'url': url,
+            'checked_at': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    async def run(self, items: Iterable[Tuple[str, str]], on_result: Callable = None,
+                  cancel_event: threading.Event = None, resume: bool = True) -> Dict:
+        """
+        Prüft alle (Spalte, Nummer)-Paare
+
+        Args:
+            on_result: Wird je Ergebnis mit (ergebnis, erledigt, gesamt) aufgerufen
+            cancel_event: Abbruch von außen (z.B. aus einem anderen Thread)
+            resume: Bereits gespeicherte Ergebnisse übernehmen
+
+        Returns:
+            Zusammenfassung mit Zählern je Status
+        """
+        if resume:
+            self.progress.load()
+        else:
+            self.progress.remove()
+
+        items = list(items)
+        pending = [(col, number) for col, number in items if not self.progress.is_done(col, number)]
+        summary = {'total': len(items), 'resumed': len(items) - len(pending), 'checked': 0,
+                   'ok': 0, 'dead': 0, 'error': 0, 'cancelled': False}
+        start = time.perf_counter()
+
+        queue = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+
+        domains = {urlsplit(self.build_url(col, number)).netloc for col, number in pending}
+        worker_count = max(1, min(len(pending), self.concurrency * len(domains)))
+
+        fetcher_class = _AiohttpFetcher if self.use_aiohttp else _ThreadFetcher
+        async with fetcher_class(self.timeout) as fetcher:
+
+            async def worker():
+                while not queue.empty():
+                    if cancel_event is not None and cancel_event.is_set():
+                        summary['cancelled'] = True
+                        return
+                    col, number = queue.get_nowait()
+                    result = await self.check(fetcher, col, number)
+                    self.progress.record(result)
+                    summary['checked'] += 1
+                    summary[result['status']] += 1
+                    if on_result is not None:
+                        on_result(result, summary['resumed'] + summary['checked'], summary['total'])
+
+            try:
+                await asyncio.gather(*(worker() for _ in range(worker_count)))
+            finally:
+                self.progress.save()
+
+        summary['seconds'] = round(time.perf_counter() - start, 3)
+        return summary
+
+    def run_sync(self, items: Iterable[Tuple[str, str]], **kwargs) -> Dict:
+        """Synchroner Einstieg (eigene Event-Loop), z.B. aus einem Worker-Thread"""
+        return asyncio.run(self.run(items, **kwargs))
+
+    def results(self) -> List[Dict]:
+        return list(self.progress.results.values())
+
+
+def _retry_after(headers: Dict, default: float) -> float:
+    for name, value in headers.items():
+        if name.lower() == 'retry-after':
+            try:
+                return float(value)
+            except ValueError:
+                break
+    return default
+
+
+def write_report(path: str, results: Iterable[Dict], rows_by_number: Dict = None,
+                 include_errors: bool = True) -> int:
+    """
+    Schreibt tote (und optional nicht prüfbare) Nummern als CSV (Semikolon, utf-8-sig für Excel)
+
+    Returns:
+        Anzahl geschriebener Zeilen
+    """
+    statuses = ('dead', 'error') if include_errors else ('dead',)
+    selected = sorted((r for r in results if r['status'] in statuses),
+                      key=lambda r: (r['status'], r['col'], r['number']))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['Status', 'Spalte', 'Nummer', 'Syskomp neu', 'Meldung', 'HTTP', 'URL', 'Geprüft'])
+        for r in selected:
+            rows = (rows_by_number or {}).get((r['col'], r['number']), [])
+            writer.writerow([r['status'], r['col'], r['number'], '|'.join(rows), r['message'],
+                             r['http_status'] or '', r['url'], r['checked_at']])
+    return len(selected)
+
+
+def default_paths(csv_path: str) -> Tuple[str, str]:
+    """Standardpfade für Fortschritt (cache/) und Bericht (reports/) neben der CSV"""
+    csv_dir = os.path.dirname(os.path.abspath(csv_path))
+    name = os.path.basename(csv_path)
+    progress_path = os.path.join(csv_dir, 'cache', name + '.validation.json')
+    report_path = os.path.join(csv_dir, 'reports', name + '.dead_numbers.csv')
+    return progress_path, report_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--csv', default=os.environ.get('PORTFOLIO_CSV') or
+                        os.path.join(base_dir, 'Portfolio_Syskomp_pA.csv'))
+    parser.add_argument('--col', action='append', choices=ONLINE_COLUMNS, help='Spalte (mehrfach möglich)')
+    parser.add_argument('--all', action='store_true', help='Alle prüfbaren Spalten (D, F, G)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Gleichzeitige Requests je Domain')
+    parser.add_argument('--rate', type=float, default=5.0, help='Requests pro Sekunde je Domain')
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--base-url', help='Shop-Host ersetzen (z.B. http://127.0.0.1:8765 für fake_shop_server.py)')
+    parser.add_argument('--progress', help='Fortschrittsdatei (Standard: cache/<csv>.validation.json)')
+    parser.add_argument('--report', help='Bericht (Standard: reports/<csv>.dead_numbers.csv)')
+    parser.add_argument('--restart', action='store_true', help='Gespeicherten Fortschritt verwerfen')
+    parser.add_argument('--limit', type=int, help='Nur die ersten N Nummern prüfen')
+    args = parser.parse_args()
+
+    cols = ONLINE_COLUMNS if args.all or not args.col else args.col
+    progress_path, report_path = default_paths(args.csv)
+
+    rows_by_number, invalid = collect_numbers(args.csv, cols)
+    items = sorted(rows_by_number)
+    if args.limit:
+        items = items[:args.limit]
+    print(f"{len(items)} Nummern in Spalte(n) {', '.join(cols)} ({invalid} formal ungültig, übersprungen)")
+
+    validator = BulkValidator(concurrency=args.concurrency, rate=args.rate, timeout=args.timeout,
+                              retries=args.retries, base_url=args.base_url,
+                              progress_path=args.progress or progress_path)
+
+    def on_result(result, done, total):
+        if done % 100 == 0 or done == total:
+            print(f"  {done}/{total} geprüft")
+
+    try:
+        summary = validator.run_sync(items, on_result=on_result, resume=not args.restart)
+    except KeyboardInterrupt:
+        print("Abgebrochen - Fortschritt ist gespeichert, erneuter Aufruf setzt fort")
+        return
+
+    written = write_report(args.report or report_path, validator.results(), rows_by_number)
+    print(f"Fertig in {summary['seconds']} s: {summary['ok']} ok, {summary['dead']} tot, "
+          f"{summary['error']} Fehler, {summary['resumed']} aus früherem Lauf")
+    print(f"Bericht ({written} Einträge): {args.report or report_path}")
+
+
+if __name__ == '__main__':
+    main()
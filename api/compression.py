@@ -0,0 +1,162 @@
+"""
+Komprimierung der API-Antworten (gzip, optional brotli)
+
+Das Verfahren wird über Accept-Encoding ausgehandelt (brotli bevorzugt,
+sofern das Paket installiert ist). Komprimiert werden nur Text/JSON-Antworten
+ab einer Mindestgröße; Dateien (send_file) und bereits kodierte Antworten
+bleiben unverändert. Gestreamte Antworten werden Chunk für Chunk komprimiert
+und nach jedem Chunk geflusht, damit der Client nicht auf das Ende warten muss.
+Server-Sent Events (und alles mit `X-Accel-Buffering: no`) bleiben unkomprimiert:
+manche Proxys und Clients puffern komprimierte Streams trotz Flush.
+
+Die Stufen sind bewusst niedrig gewählt (gzip 6, brotli 4): der Großteil der
+Ersparnis bei überschaubarer CPU-Last pro Request.
+"""
+
+import zlib
+from threading import Lock
+from typing import Dict, Iterable, Iterator, Optional
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'image/svg+xml',
+}
+
+# Ereignisse müssen sofort beim Client ankommen
+UNBUFFERED_MIMETYPES = {
+    'text/event-stream',
+}
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        # wbits 31 = gzip-Header und -Prüfsumme
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, level: int):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.finish()
+
+
+class ResponseCompressor:
+    """after_request-Hook, der passende Antworten komprimiert"""
+
+    def __init__(self, min_size: int = 1024, gzip_level: int = 6, brotli_level: int = 4,
+                 enabled: bool = True):
+        self.min_size = min_size
+        self.gzip_level = max(1, min(gzip_level, 9))
+        self.brotli_level = max(0, min(brotli_level, 11))
+        self.enabled = enabled
+        self.encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+        self._lock = Lock()
+        self._stats = {'responses': 0, 'streamed': 0, 'bytes_in': 0, 'bytes_out': 0}
+
+    def init_app(self, app):
+        app.after_request(self.after_request)
+
+    def _encoder(self, encoding: str):
+        if encoding == 'br':
+            return _BrotliEncoder(self.brotli_level)
+        return _GzipEncoder(self.gzip_level)
+
+    def _count(self, streamed: bool, bytes_in: int, bytes_out: int):
+        with self._lock:
+            self._stats['responses'] += 1
+            self._stats['streamed'] += int(streamed)
+            self._stats['bytes_in'] += bytes_in
+            self._stats['bytes_out'] += bytes_out
+
+    def choose_encoding(self, accept_encodings) -> Optional[str]:
+        """Bestes unterstütztes Verfahren laut Accept-Encoding (None = unkomprimiert)"""
+        return accept_encodings.best_match(self.encodings)
+
+    def is_compressible(self, response) -> bool:
+        if not (200 <= response.status_code < 300) or response.status_code == 204:
+            return False
+        if response.direct_passthrough or 'Content-Encoding' in response.headers:
+            return False
+        if response.headers.get('X-Accel-Buffering', '').lower() == 'no':
+            return False
+        mimetype = response.mimetype or ''
+        if mimetype in UNBUFFERED_MIMETYPES:
+            return False
+        return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
+
+    def after_request(self, response):
+        if not self.enabled or not self.is_compressible(response):
+            return response
+
+        encoding = self.choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.iter_encoded(), self._encoder(encoding))
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            encoder = self._encoder(encoding)
+            compressed = encoder.compress(data) + encoder.finish()
+            if len(compressed) >= len(data):
+                return response
+            response.set_data(compressed)
+            self._count(False, len(data), len(compressed))
+
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # Komprimierter Inhalt ist nicht mehr byte-identisch
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _stream(self, chunks: Iterable[bytes], encoder) -> Iterator[bytes]:
+        bytes_in = 0
+        bytes_out = 0
+        for chunk in chunks:
+            bytes_in += len(chunk)
+            data = encoder.compress(chunk) + encoder.flush()
+            if data:
+                bytes_out += len(data)
+                yield data
+        tail = encoder.finish()
+        bytes_out += len(tail)
+        self._count(True, bytes_in, bytes_out)
+        yield tail
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats['encodings'] = list(self.encodings)
+        stats['min_size'] = self.min_size
+        stats['ratio'] = round(stats['bytes_in'] / stats['bytes_out'], 2) if stats['bytes_out'] else None
+        return stats
@@ -0,0 +1,33 @@
+"""
+Gemeinsame Fixtures der API-Tests
+"""
+
+import os
+
+import pytest
+
+HEADER = 'Syskomp neu;Syskomp alt;Beschreibung;Item;Bosch;Alvaris Artnr;Alvaris Matnr;ASK\n'
+
+
+@pytest.fixture(scope='session')
+def api_app(tmp_path_factory):
+    """
+    Das app-Modul mit Portfolio-CSV, cache/ und backups/ in einem temporären Ordner
+
+    app liest PORTFOLIO_CSV beim Import und legt daneben Cache, Backups und
+    Job-Verzeichnis an - daher hier importieren, nicht auf Modulebene im Test.
+    """
+    csv_path = tmp_path_factory.mktemp('portfolio') / 'Portfolio_Syskomp_pA.csv'
+    csv_path.write_text(HEADER + '100001;200001;Profil 30x30;0.0.1.1;3842500001;;;500001\n', encoding='utf-8')
+
+    previous = os.environ.get('PORTFOLIO_CSV')
+    os.environ['PORTFOLIO_CSV'] = str(csv_path)
+    try:
+        import app
+        assert app.csv_path == str(csv_path), 'app wurde bereits mit anderem Pfad importiert'
+        yield app
+    finally:
+        if previous is None:
+            os.environ.pop('PORTFOLIO_CSV', None)
+        else:
+            os.environ['PORTFOLIO_CSV'] = previous
@@ -0,0 +1,150 @@
+"""
+Konvertierungsgraph zwischen allen Nummernspalten
+
+Bipartiter Graph: auf der einen Seite Artikelnummern (Spalte, Wert), auf der
+anderen Seite Portfolio-Zeilen (identifiziert über Syskomp neu). Jede Nummer
+zeigt auf alle Zeilen, in denen sie vorkommt, jede Zeile auf alle ihre
+Nummern (Pipe-Werte bereits getrennt).
+
+Damit ist jede Konvertierung Spalte X -> Spalte Y genau ein Sprung über die
+Syskomp-Zeile (z.B. Bosch -> Syskomp -> Item), inklusive Pfad.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from portfolio_index import split_values
+
+NUMBER_COLUMNS = ['A', 'B', 'D', 'E', 'F', 'G', 'H']
+
+
+def check_final_hop(to_col: str, mode: str) -> Tuple[bool, str]:
+    """
+    Modus-Regel für den letzten Sprung (Syskomp-Zeile -> Zielspalte)
+
+    extern: Ziel muss A oder B sein
+    intern: jedes Ziel erlaubt (Start ist implizit die Syskomp-Zeile)
+    """
+    if to_col not in NUMBER_COLUMNS:
+        return False, f"Ungültige Zielspalte: {to_col}"
+    if mode == 'extern' and to_col not in ['A', 'B']:
+        return False, "Extern-Modus: Nur Konvertierung nach A oder B erlaubt"
+    return True, ""
+
+
+class ConversionGraph:
+    """Vorberechneter Graph Nummer <-> Portfolio-Zeile"""
+
+    def __init__(self):
+        self.rows = []         # row_id -> Zeilen-Dict (wie im Index)
+        self.row_values = []   # row_id -> {spalte: (werte, ...)}
+        self.value_rows = {col: {} for col in NUMBER_COLUMNS}  # spalte -> {wert: [row_id, ...]}
+
+    @classmethod
+    def from_index(cls, index: Dict[str, Dict[str, List[Dict]]]) -> 'ConversionGraph':
+        """Baut den Graph aus dem Spalten-Index der API (Zeilen werden über ihre Identität erkannt)"""
+        graph = cls()
+        row_ids = {}
+
+        for col in NUMBER_COLUMNS:
+            for row_list in index.get(col, {}).values():
+                for row_data in row_list:
+                    if id(row_data) not in row_ids:
+                        row_ids[id(row_data)] = graph._add_row(row_data)
+
+        return graph
+
+    def _add_row(self, row_data: Dict) -> int:
+        row_id = len(self.rows)
+        self.rows.append(row_data)
+
+        values = {}
+        for col in NUMBER_COLUMNS:
+            col_values = split_values(row_data.get(col, ''))
+            values[col] = col_values
+            for value in col_values:
+                self.value_rows[col].setdefault(value, []).append(row_id)
+        self.row_values.append(values)
+
+        return row_id
+
+    def lookup(self, value: str, from_cols: Iterable[str]) -> List[Tuple[str, int]]:
+        """Findet alle (Spalte, row_id) für einen Wert in den angegebenen Spalten"""
+        hits = []
+        for col in from_cols:
+            for row_id in self.value_rows.get(col, {}).get(value, ()):
+                hits.append((col, row_id))
+        return hits
+
+    def convert(self, value: str, to_col: str, from_col: Optional[str] = None,
+                max_results: int = 20) -> Tuple[List[Dict], bool]:
+        """
+        Konvertiert einen Wert in die Zielspalte über die Syskomp-Zeile
+
+        Args:
+            value: Gesuchte Nummer
+            to_col: Zielspalte (A, B, D-H)
+            from_col: Quellspalte oder None (alle Spalten durchsuchen)
+            max_results: Maximale Anzahl unterschiedlicher Zielwerte
+
+        Returns:
+            Tuple[List[Dict], bool]: (Ergebnisse mit Pfaden, abgeschnitten)
+        """
+        from_cols = [from_col] if from_col else NUMBER_COLUMNS
+        results = {}
+        truncated = False
+
+        for found_col, row_id in self.lookup(value, from_cols):
+            row_data = self.rows[row_id]
+            for target in self.row_values[row_id][to_col]:
+                result = results.get(target)
+                if result is None:
+                    if len(results) >= max_results:
+                        truncated = True
+                        continue
+                    result = results[target] = {'value': target, 'paths': []}
+
+                result['paths'].append([
+                    {'col': found_col, 'value': value},
+                    {'col': 'A', 'value': row_data.get('A', ''), 'description': row_data.get('C', '')},
+                    {'col': to_col, 'value': target},
+                ])
+
+        return list(results.values()), truncated
+
+    def convert_all(self, value: str, to_cols: Iterable[str], from_col: Optional[str] = None) -> Dict:
+        """
+        Konvertiert einen Wert in mehrere Zielspalten (ein Lookup für alle Ziele)
+
+        Returns:
+            Dict mit 'found_in' (Spalten), 'syskomp_neu' (Zeilen) und 'targets' {spalte: [werte]}
+        """
+        from_cols = [from_col] if from_col else NUMBER_COLUMNS
+        to_cols = list(to_cols)
+        hits = self.lookup(value, from_cols)
+
+        # Dicts als geordnete Mengen: Duplikate in O(1) statt Listensuche
+        targets = {col: {} for col in to_cols}
+        found_in = {}
+        syskomp_neu = {}
+
+        for found_col, row_id in hits:
+            found_in[found_col] = None
+            row_key = self.rows[row_id].get('A', '')
+            if row_key:
+                syskomp_neu[row_key] = None
+
+            values = self.row_values[row_id]
+            for col in to_cols:
+                targets[col].update(dict.fromkeys(values[col]))
+
+        return {
+            'found_in': list(found_in),
+            'syskomp_neu': list(syskomp_neu),
+            'targets': {col: list(col_targets) for col, col_targets in targets.items()}
+        }
+
+    def stats(self) -> Dict:
+        return {
+            'rows': len(self.rows),
+            'values': {col: len(values) for col, values in self.value_rows.items()},
+        }
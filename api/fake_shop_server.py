@@ -0,0 +1,175 @@
+"""
+Lokaler Ersatz für die Suchseiten von item24 und Alvaris
+
+Für Tests und Benchmarks der Massenprüfung (bulk_validation), ohne die echten
+Shops zu belasten. Die Antworten haben denselben Aufbau wie die Originale:
+  item24:  /de-de/search/?q=<nummer>  -> "<n> Treffer" bzw. "0 Treffer"
+  Alvaris: /de/?s=<nummer>            -> Links mit class="uk-link-reset"
+
+Welche Nummern "existieren", bestimmt eine Funktion (Standard: etwa 10% der
+Nummern sind tot, deterministisch über CRC32). Zusätzlich lassen sich
+Latenz, Serverfehler (503), Timeouts und ein Rate-Limit (429) simulieren.
+
+Verwendung:
+    python fake_shop_server.py --port 8765 --latency 0.05 --error-rate 0.02
+    python bulk_validation.py --col D --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+def default_exists(number: str) -> bool:
+    """Etwa 90% der Nummern existieren (stabil über Läufe hinweg)"""
+    return zlib.crc32(number.encode('utf-8')) % 10 != 0
+
+
+def item_page(number: str, exists: bool) -> str:
+    hits = 3 if exists else 0
+    results = ''.join(
+        f'<div class="product-tile"><a href="/de-de/product/{number}-{i}">{number} Profil</a></div>'
+        for i in range(hits)
+    )
+    return (f'<html><body><h1>Suche nach "{number}"</h1>'
+            f'<p class="search-count">{hits} Treffer</p>{results}</body></html>')
+
+
+def alvaris_page(number: str, exists: bool) -> str:
+    links = ''
+    if exists:
+        links = (f'<li><a class="uk-link-reset" href="/de/produkt/{number}/">{number} Profil 40x40</a></li>'
+                 f'<li><a class="uk-link-reset" href="/de/produkt/{number}9/">{number}9 Zubehör</a></li>')
+    return (f'<html><body><h1>Suchergebnisse für: {number}</h1>'
+            f'<ul class="uk-list">{links}</ul></body></html>')
+
+
+class FakeShopServer(ThreadingHTTPServer):
+    """HTTP-Server mit den Simulations-Parametern als Attributen"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], exists: Callable[[str], bool] = default_exists,
+                 latency: float = 0.0, error_rate: float = 0.0, hang_rate: float = 0.0,
+                 hang_seconds: float = 30.0, max_rps: float = 0.0, seed: int = 42):
+        super().__init__(address, FakeShopHandler)
+        self.exists = exists
+        self.latency = latency
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.max_rps = max_rps
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rejected = 0
+        self._window = (0, 0)  # (Sekunde, Anzahl Requests)
+
+    def handle_error(self, request, client_address):
+        # Client hat nach Timeout aufgelegt (simulierte hängende Requests) - kein Stacktrace
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def rate_limited(self) -> bool:
+        if not self.max_rps:
+            return False
+        with self.lock:
+            second = int(time.monotonic())
+            current, count = self._window
+            count = count + 1 if second == current else 1
+            self._window = (second, count)
+            return count > self.max_rps
+
+
+class FakeShopHandler(BaseHTTPRequestHandler):
+    server: FakeShopServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str, headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            roll = server.rng.random()
+
+        if server.rate_limited():
+            with server.lock:
+                server.rejected += 1
+            self._send(429, 'Too Many Requests', {'Retry-After': '1'})
+            return
+
+        if roll < server.hang_rate:
+            time.sleep(server.hang_seconds)
+        elif server.latency:
+            time.sleep(server.latency)
+
+        if roll > 1 - server.error_rate:
+            self._send(503, 'Service Unavailable')
+            return
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        if url.path.startswith('/de-de/search'):
+            number = query.get('q', [''])[0]
+            self._send(200, item_page(number, server.exists(number)))
+        elif url.path.rstrip('/') == '/de' and 's' in query:
+            number = query['s'][0]
+            self._send(200, alvaris_page(number, server.exists(number)))
+        else:
+            self._send(404, 'Not Found')
+
+
+def start_fake_server(host: str = '127.0.0.1', port: int = 0, **options) -> FakeShopServer:
+    """Startet den Server in einem Daemon-Thread (port=0: freier Port, siehe server.base_url)"""
+    server = FakeShopServer((host, port), **options)
+    thread = threading.Thread(target=server.serve_forever, name='fake-shop', daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help='Antwortzeit in Sekunden')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Anteil 503-Antworten')
+    parser.add_argument('--hang-rate', type=float, default=0.0, help='Anteil hängender Requests')
+    parser.add_argument('--max-rps', type=float, default=0.0, help='Requests pro Sekunde bis 429 (0 = aus)')
+    args = parser.parse_args()
+
+    server = FakeShopServer((args.host, args.port), latency=args.latency, error_rate=args.error_rate,
+                            hang_rate=args.hang_rate, max_rps=args.max_rps)
+    print(f"Fake-Shop läuft auf {server.base_url} (Strg+C beendet)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
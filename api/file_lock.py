@@ -5,12 +5,366 @@ CSV-Manager mit File-Locking, Backup und Undo-Funktionalität
 import csv
 import os
 import shutil
-from threading import Lock
+import socket
+import sys
+from threading import Event, Lock, Thread, get_ident, local
 from datetime import datetime, timedelta
 from collections import deque
 from typing import Dict, List, Optional, Tuple
 import time
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+def pid_alive(pid: int) -> bool:
+    """Prüft ob ein Prozess mit dieser PID noch läuft (nur lokaler Rechner)"""
+    if sys.platform == 'win32':
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        handle = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def process_identity(pid: int) -> Optional[str]:
+    """
+    Kennung eines laufenden Prozesses, die bei Wiederverwendung der PID wechselt
+
+    Linux: Boot-ID + Startzeit aus /proc, Windows: Erstellungszeit des Prozesses.
+    None, wenn der Prozess nicht läuft oder das System keine Startzeit liefert.
+    """
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return None
+        try:
+            created, exited, kernel, user = (wintypes.FILETIME() for _ in range(4))
+            if not kernel32.GetProcessTimes(handle, ctypes.byref(created), ctypes.byref(exited),
+                                            ctypes.byref(kernel), ctypes.byref(user)):
+                return None
+            return str((created.dwHighDateTime << 32) | created.dwLowDateTime)
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        with open(f'/proc/{pid}/stat', 'r', encoding='ascii', errors='replace') as f:
+            # Feld 22 (starttime); der Prozessname in Klammern kann Leerzeichen enthalten
+            start_ticks = f.read().rsplit(')', 1)[1].split()[19]
+        with open('/proc/sys/kernel/random/boot_id', 'r', encoding='ascii') as f:
+            boot_id = f.read().strip()
+        return f"{boot_id}:{start_ticks}"
+    except (OSError, IndexError):
+        return None
+
+
+class InterProcessLock:
+    """
+    Prozessübergreifende Lese-/Schreibsperre über eine Lock-Datei
+
+    Linux/macOS: fcntl.flock auf <datei>.lock - mehrere Leser gleichzeitig
+    (LOCK_SH), Schreiber exklusiv (LOCK_EX). Das Betriebssystem gibt die Sperre
+    frei, wenn der Prozess abstürzt.
+    Windows: Schreiber legen die Lock-Datei exklusiv an (O_EXCL) und warten,
+    bis keine Leser mehr aktiv sind. Jeder Leser legt eine eigene Marker-Datei
+    <datei>.lock.<rechner>.<pid>.<nr>.read an und prüft danach, ob ein Schreiber
+    die Lock-Datei hält (dann zieht er sich zurück und wartet). Da beide Seiten
+    erst anmelden und dann prüfen, sieht mindestens einer den anderen - Leser
+    laufen parallel, Schreiber exklusiv.
+    Solange eine Sperre gehalten wird, setzt ein Heartbeat-Thread die mtime der
+    Datei regelmäßig neu. Verwaist ist eine Sperre nur, wenn der Prozess auf
+    demselben Rechner nachweislich beendet ist oder der Heartbeat länger als
+    stale_after ausbleibt (z.B. Absturz auf einem anderen Rechner) - langsames
+    Schreiben oder Parsen bricht die Sperre also nicht auf.
+
+    In beiden Fällen steht in der Lock-Datei der Besitzer (PID, Rechner, Zeit).
+    Warte- und Haltezeiten werden in stats gesammelt.
+
+    Hinweis: nicht reentrant - wer die Schreibsperre hält, darf nicht
+    zusätzlich die Lesesperre anfordern.
+    """
+
+    def __init__(self, lock_path: str, stale_after: float = 60.0, poll_interval: float = 0.05):
+        self.lock_path = lock_path
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+
+        # Schreiber innerhalb des Prozesses zuerst über Thread-Lock serialisieren
+        self._thread_lock = Lock()
+        self._held = local()
+
+        # Marker-Dateien der Leser (nur ohne fcntl)
+        self._reader_prefix = os.path.basename(lock_path) + '.'
+        self._reader_counter = 0
+
+        self._stats_lock = Lock()
+        self.stats = {
+            mode: {'acquired': 0, 'timeouts': 0, 'wait_total': 0.0, 'wait_max': 0.0,
+                   'hold_total': 0.0, 'hold_max': 0.0}
+            for mode in ('read', 'write')
+        }
+
+    def _owner_info(self) -> bytes:
+        return f"{os.getpid()};{socket.gethostname()};{datetime.now().isoformat(timespec='seconds')}".encode()
+
+    def owner(self) -> Optional[Dict]:
+        """Gibt den Besitzer der Sperre laut Lock-Datei zurück (oder None)"""
+        return self._read_owner(self.lock_path)
+
+    @staticmethod
+    def _read_owner(path: str) -> Optional[Dict]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                pid, host, since = f.read().strip().split(';', 2)
+            return {'pid': int(pid), 'host': host, 'since': since}
+        except (OSError, ValueError):
+            return None
+
+    def _acquire_flock(self, shared: bool, deadline: float) -> Optional[int]:
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+        flags = (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB
+
+        while True:
+            try:
+                fcntl.flock(fd, flags)
+                break
+            except BlockingIOError:
+                if time.perf_counter() >= deadline:
+                    os.close(fd)
+                    return None
+                time.sleep(self.poll_interval)
+
+        if not shared:
+            os.ftruncate(fd, 0)
+            os.write(fd, self._owner_info())
+        return fd
+
+    def _inspect(self, path: str) -> Optional[Tuple[Optional[Dict], int]]:
+        """Besitzer und mtime (ns) einer Lock-/Marker-Datei, None wenn sie nicht existiert"""
+        info = self._read_owner(path)
+        try:
+            return info, os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _is_stale(self, seen: Tuple[Optional[Dict], int]) -> bool:
+        """Verwaist: Prozess auf diesem Rechner beendet oder Heartbeat länger als stale_after ausgeblieben"""
+        info, mtime_ns = seen
+        if info and info['host'] == socket.gethostname() and not pid_alive(info['pid']):
+            return True
+        return time.time() - mtime_ns / 1e9 > self.stale_after
+
+    def _break_stale(self, path: str, seen: Tuple[Optional[Dict], int]) -> bool:
+        """
+        Bricht die als verwaist geprüfte Sperre auf (True, wenn sie entfernt wurde)
+
+        Erst umbenennen (atomar), damit nur ein Prozess sie aufbricht. Zwischen
+        Prüfen und Umbenennen kann ein anderer Prozess die alte Sperre bereits
+        entfernt und eine neue angelegt haben - ist die umbenannte Datei nicht
+        mehr die geprüfte (Besitzer oder mtime anders), kommt sie zurück.
+        """
+        stale_path = f"{path}.{os.getpid()}.{get_ident()}.stale"
+        try:
+            os.replace(path, stale_path)
+        except OSError:
+            return False
+
+        if self._inspect(stale_path) != seen:
+            try:
+                os.replace(stale_path, path)
+            except OSError:
+                pass
+            return False
+
+        try:
+            os.remove(stale_path)
+        except OSError:
+            pass
+        print(f"Verwaiste Sperre entfernt: {path}")
+        return True
+
+    def _active_readers(self) -> List[str]:
+        """Marker-Dateien lebender Leser (verwaiste werden entfernt)"""
+        directory = os.path.dirname(self.lock_path) or '.'
+        readers = []
+        for name in os.listdir(directory):
+            if name.startswith(self._reader_prefix) and name.endswith('.read'):
+                path = os.path.join(directory, name)
+                seen = self._inspect(path)
+                if seen is None or (self._is_stale(seen) and self._break_stale(path, seen)):
+                    continue
+                readers.append(path)
+        return readers
+
+    def _writer_active(self) -> bool:
+        seen = self._inspect(self.lock_path)
+        if seen is None:
+            return False
+        return not (self._is_stale(seen) and self._break_stale(self.lock_path, seen))
+
+    def _acquire_lockfile(self, shared: bool, deadline: float) -> Optional[Tuple[str, int]]:
+        if shared:
+            return self._acquire_reader(deadline)
+
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o666)
+                os.write(fd, self._owner_info())
+                break
+            except FileExistsError:
+                if self._writer_active():
+                    if time.perf_counter() >= deadline:
+                        return None
+                    time.sleep(self.poll_interval)
+                continue
+
+        # Lock-Datei hält neue Leser fern - laufende Leser noch abwarten
+        handle = (self.lock_path, fd)
+        while self._active_readers():
+            if time.perf_counter() >= deadline:
+                self._release_lockfile(handle)
+                return None
+            os.utime(self.lock_path)  # Heartbeat auch während des Wartens
+            time.sleep(self.poll_interval)
+        return handle
+
+    def _acquire_reader(self, deadline: float) -> Optional[Tuple[str, int]]:
+        with self._stats_lock:
+            self._reader_counter += 1
+            number = self._reader_counter
+        marker = f"{self.lock_path}.{socket.gethostname()}.{os.getpid()}.{number}.read"
+
+        while True:
+            fd = os.open(marker, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o666)
+            os.write(fd, self._owner_info())
+            if not self._writer_active():
+                return marker, fd
+
+            # Schreiber aktiv: abmelden, damit er nicht auf uns wartet
+            self._release_lockfile((marker, fd))
+            if time.perf_counter() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    @staticmethod
+    def _release_lockfile(handle: Tuple[str, int]):
+        path, fd = handle
+        os.close(fd)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _heartbeat(self, path: str, stop: Event):
+        # Hält die mtime der gehaltenen Sperre frisch, damit andere sie nicht für verwaist halten
+        interval = max(self.stale_after / 4, self.poll_interval)
+        while not stop.wait(interval):
+            try:
+                os.utime(path)
+            except OSError:
+                return
+
+    def acquire(self, timeout: float = 5, shared: bool = False) -> bool:
+        """
+        Erwirbt die Sperre
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden
+            shared: True = Lesesperre (parallel zu anderen Lesern), False = Schreibsperre
+
+        Returns:
+            bool: True wenn die Sperre erworben wurde
+        """
+        mode = 'read' if shared else 'write'
+        start = time.perf_counter()
+        deadline = start + timeout
+
+        if not shared and not self._thread_lock.acquire(timeout=timeout):
+            self._record_timeout(mode)
+            return False
+
+        try:
+            if fcntl is not None:
+                handle = self._acquire_flock(shared, deadline)
+            else:
+                handle = self._acquire_lockfile(shared, deadline)
+        except Exception:
+            if not shared:
+                self._thread_lock.release()
+            raise
+
+        if handle is None:
+            if not shared:
+                self._thread_lock.release()
+            self._record_timeout(mode)
+            return False
+
+        heartbeat = None
+        if fcntl is None:
+            heartbeat = Event()
+            Thread(target=self._heartbeat, args=(handle[0], heartbeat), daemon=True).start()
+
+        acquired_at = time.perf_counter()
+        if not hasattr(self._held, 'stack'):
+            self._held.stack = []
+        self._held.stack.append((mode, handle, acquired_at, heartbeat))
+
+        with self._stats_lock:
+            stats = self.stats[mode]
+            wait = acquired_at - start
+            stats['acquired'] += 1
+            stats['wait_total'] += wait
+            stats['wait_max'] = max(stats['wait_max'], wait)
+
+        return True
+
+    def release(self):
+        """Gibt die zuletzt erworbene Sperre dieses Threads frei"""
+        mode, handle, acquired_at, heartbeat = self._held.stack.pop()
+
+        if fcntl is not None:
+            if mode == 'write':
+                os.ftruncate(handle, 0)  # Besitzer-Info entfernen
+            fcntl.flock(handle, fcntl.LOCK_UN)
+            os.close(handle)
+        else:
+            heartbeat.set()
+            self._release_lockfile(handle)
+
+        if mode == 'write':
+            self._thread_lock.release()
+
+        with self._stats_lock:
+            stats = self.stats[mode]
+            hold = time.perf_counter() - acquired_at
+            stats['hold_total'] += hold
+            stats['hold_max'] = max(stats['hold_max'], hold)
+
+    def _record_timeout(self, mode: str):
+        with self._stats_lock:
+            self.stats[mode]['timeouts'] += 1
+
+    def get_stats(self) -> Dict:
+        """Gibt eine Kopie der Warte-/Haltezeiten zurück"""
+        with self._stats_lock:
+            return {mode: dict(values) for mode, values in self.stats.items()}
+
 class UndoManager:
     """Verwaltet Undo-Aktionen (letzte 3 Minuten)"""
 
@@ -51,12 +405,14 @@ class BackupManager:
     def __init__(self, backup_dir: str, retention_days: int = 1):
         self.backup_dir = backup_dir
         self.retention_days = retention_days
+        self.stats = {'count': 0, 'seconds_total': 0.0, 'seconds_max': 0.0}
 
         # Backup-Verzeichnis erstellen wenn nicht vorhanden
         os.makedirs(backup_dir, exist_ok=True)
 
     def create_backup(self, source_file: str) -> str:
         """Erstellt ein Backup der Datei"""
+        start = time.perf_counter()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_name = f"Portfolio_Syskomp_pA_{timestamp}.csv"
         backup_path = os.path.join(self.backup_dir, backup_name)
@@ -64,6 +420,11 @@ class BackupManager:
         shutil.copy(source_file, backup_path)
         print(f"Backup erstellt: {backup_path}")
 
+        duration = time.perf_counter() - start
+        self.stats['count'] += 1
+        self.stats['seconds_total'] += duration
+        self.stats['seconds_max'] = max(self.stats['seconds_max'], duration)
+
         return backup_path
 
     def cleanup_old_backups(self):
@@ -86,11 +447,11 @@ class BackupManager:
 
 
 class CSVManager:
-    """Verwaltet CSV-Datei mit Thread-Safe Lock"""
+    """Verwaltet CSV-Datei mit prozessübergreifender Lese-/Schreibsperre"""
 
     def __init__(self, csv_path: str, backup_dir: str = None):
         self.csv_path = csv_path
-        self.lock = Lock()
+        self.lock = InterProcessLock(csv_path + '.lock')
         self.undo_manager = UndoManager(retention_minutes=3)
 
         # Backup-Manager initialisieren
@@ -98,30 +459,50 @@ class CSVManager:
             backup_dir = os.path.join(os.path.dirname(csv_path), 'backups')
         self.backup_manager = BackupManager(backup_dir, retention_days=1)
 
-    def read_all(self) -> List[List[str]]:
-        """Liest alle Zeilen aus der CSV"""
+    def _locked_message(self) -> str:
+        """Fehlermeldung mit Besitzer der Sperre (falls bekannt)"""
+        owner = self.lock.owner()
+        if owner:
+            return (f"Datei momentan gesperrt (PID {owner['pid']} auf {owner['host']} seit {owner['since']}). "
+                    "Bitte erneut versuchen.")
+        return "Datei momentan gesperrt. Bitte erneut versuchen."
+
+    def _read_rows(self) -> List[List[str]]:
+        """Liest alle Zeilen ohne Sperre (Aufrufer hält die Sperre)"""
         with open(self.csv_path, 'r', encoding='utf-8-sig', newline='') as f:
             reader = csv.reader(f, delimiter=';')
             return list(reader)
 
+    def read_all(self) -> List[List[str]]:
+        """Liest alle Zeilen aus der CSV (unter Lesesperre)"""
+        if not self.lock.acquire(timeout=5, shared=True):
+            raise TimeoutError(self._locked_message())
+
+        try:
+            return self._read_rows()
+        finally:
+            self.lock.release()
+
     def write_all(self, rows: List[List[str]]):
-        """Schreibt alle Zeilen in die CSV"""
+        """Schreibt alle Zeilen in die CSV (Aufrufer hält die Schreibsperre)"""
         with open(self.csv_path, 'w', encoding='utf-8-sig', newline='') as f:
             writer = csv.writer(f, delimiter=';', quoting=csv.QUOTE_MINIMAL)
             writer.writerows(rows)
 
-    def find_row_by_syskomp(self, syskomp_neu: str) -> Tuple[int, Optional[List[str]]]:
-        """Findet eine Zeile anhand der Syskomp neu Nummer"""
-        rows = self.read_all()
-
+    @staticmethod
+    def _find_row(rows: List[List[str]], syskomp_neu: str) -> Tuple[int, Optional[List[str]]]:
         for idx, row in enumerate(rows):
             if idx == 0:  # Skip Header
                 continue
-            if row[0] == syskomp_neu:  # Column A = Syskomp neu
+            if row and row[0] == syskomp_neu:  # Column A = Syskomp neu
                 return idx, row
 
         return -1, None
 
+    def find_row_by_syskomp(self, syskomp_neu: str) -> Tuple[int, Optional[List[str]]]:
+        """Findet eine Zeile anhand der Syskomp neu Nummer"""
+        return self._find_row(self.read_all(), syskomp_neu)
+
     def update_cell(self, syskomp_neu: str, col_index: int, value: str) -> Tuple[bool, str]:
         """
         Aktualisiert eine Zelle in der CSV
@@ -136,17 +517,17 @@ class CSVManager:
         """
         acquired = self.lock.acquire(timeout=5)
         if not acquired:
-            return False, "Datei momentan gesperrt. Bitte erneut versuchen."
+            return False, self._locked_message()
 
         try:
             # Backup erstellen
             backup_path = self.backup_manager.create_backup(self.csv_path)
 
             # CSV lesen
-            rows = self.read_all()
+            rows = self._read_rows()
 
             # Zeile finden
-            row_idx, old_row = self.find_row_by_syskomp(syskomp_neu)
+            row_idx, old_row = self._find_row(rows, syskomp_neu)
 
             if row_idx == -1:
                 return False, f"Syskomp-Nummer {syskomp_neu} nicht gefunden"
@@ -194,14 +575,14 @@ class CSVManager:
         """
         acquired = self.lock.acquire(timeout=5)
         if not acquired:
-            return False, "Datei momentan gesperrt. Bitte erneut versuchen."
+            return False, self._locked_message()
 
         try:
             # Backup erstellen
             backup_path = self.backup_manager.create_backup(self.csv_path)
 
             # CSV lesen
-            rows = self.read_all()
+            rows = self._read_rows()
 
             # Neue Zeile anhängen
             rows.append(new_row)
@@ -238,17 +619,17 @@ class CSVManager:
         """
         acquired = self.lock.acquire(timeout=5)
         if not acquired:
-            return False, "Datei momentan gesperrt. Bitte erneut versuchen."
+            return False, self._locked_message()
 
         try:
             # Backup erstellen
             backup_path = self.backup_manager.create_backup(self.csv_path)
 
             # CSV lesen
-            rows = self.read_all()
+            rows = self._read_rows()
 
             # Zeile finden
-            row_idx, old_row = self.find_row_by_syskomp(syskomp_neu)
+            row_idx, old_row = self._find_row(rows, syskomp_neu)
 
             if row_idx == -1:
                 return False, f"Syskomp-Nummer {syskomp_neu} nicht gefunden"
@@ -285,7 +666,7 @@ class CSVManager:
         """Macht die letzte Aktion rückgängig (wenn < 3 Min alt)"""
         acquired = self.lock.acquire(timeout=5)
         if not acquired:
-            return False, "Datei momentan gesperrt"
+            return False, self._locked_message()
 
         try:
             last_action = self.undo_manager.get_last_action()
@@ -297,8 +678,8 @@ class CSVManager:
                 data = last_action['data']
 
                 # Alten Wert wiederherstellen
-                rows = self.read_all()
-                row_idx, _ = self.find_row_by_syskomp(data['syskomp_neu'])
+                rows = self._read_rows()
+                row_idx, _ = self._find_row(rows, data['syskomp_neu'])
 
                 if row_idx == -1:
                     return False, "Zeile nicht mehr gefunden"
@@ -315,7 +696,7 @@ class CSVManager:
                 data = last_action['data']
 
                 # Letzte Zeile entfernen
-                rows = self.read_all()
+                rows = self._read_rows()
                 if len(rows) > 1:  # Nicht nur Header
                     rows.pop()
                     self.write_all(rows)
@@ -331,7 +712,7 @@ class CSVManager:
                 data = last_action['data']
 
                 # Gelöschte Zeile wiederherstellen
-                rows = self.read_all()
+                rows = self._read_rows()
                 row_index = data['row_index']
                 row_data = data['row_data']
 
@@ -0,0 +1,25 @@
+"""
+gunicorn-Konfiguration für die Portfolio-API
+
+Start:  gunicorn -c gunicorn.conf.py
+Umgebungsvariablen: API_BIND (Standard 0.0.0.0:5000), API_WORKERS, API_THREADS
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = 'wsgi:app'
+bind = os.environ.get('API_BIND', '0.0.0.0:5000')
+
+# Index einmal im Master laden und an alle Worker vererben
+preload_app = True
+
+workers = int(os.environ.get('API_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+threads = int(os.environ.get('API_THREADS', 2))
+
+# Lange Batch-Konvertierungen nicht vorzeitig abbrechen
+timeout = 120
+graceful_timeout = 30
+
+accesslog = '-'
+errorlog = '-'
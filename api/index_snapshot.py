@@ -0,0 +1,180 @@
+"""
+Binärer Snapshot des Portfolio-Index für schnellen API-Start
+"""
+
+import hashlib
+import os
+import pickle
+import uuid
+from typing import Dict, Optional, Tuple
+
+# Bei Änderungen am Aufbau des Index erhöhen - alte Snapshots werden dann verworfen
+SNAPSHOT_VERSION = 2
+
+
+def file_signature(path: str) -> Dict:
+    """Gibt mtime und Größe der Datei zurück"""
+    stat = os.stat(path)
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def file_hash(path: str) -> str:
+    """Berechnet den SHA1-Hash der Datei (blockweise)"""
+    sha1 = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def file_state(path: str) -> Dict:
+    """Signatur und Hash der Datei - vor dem Parsen (unter der Lesesperre) erfassen"""
+    state = file_signature(path)
+    state['sha1'] = file_hash(path)
+    return state
+
+
+class IndexSnapshot:
+    """
+    Speichert den fertig aufgebauten Spalten-Index als Pickle neben der CSV.
+
+    Die Datei besteht aus zwei Pickle-Objekten: einem kleinen Header
+    (Version, mtime, Größe, Hash der CSV) und dem eigentlichen Index.
+    So kann der Header geprüft werden, ohne den Index zu laden.
+    """
+
+    def __init__(self, csv_path: str, snapshot_path: str = None):
+        self.csv_path = csv_path
+
+        if snapshot_path is None:
+            cache_dir = os.path.join(os.path.dirname(csv_path), 'cache')
+            snapshot_name = os.path.basename(csv_path) + '.index.pickle'
+            snapshot_path = os.path.join(cache_dir, snapshot_name)
+        self.snapshot_path = snapshot_path
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def _read_header(self, f) -> Optional[Dict]:
+        header = pickle.load(f)
+        if not isinstance(header, dict) or header.get('version') != SNAPSHOT_VERSION:
+            return None
+        return header
+
+    def is_current(self, header: Dict) -> bool:
+        """Prüft ob der Snapshot zur aktuellen CSV passt"""
+        signature = file_signature(self.csv_path)
+
+        if signature['size'] != header.get('size'):
+            return False
+
+        if signature['mtime_ns'] == header.get('mtime_ns'):
+            return True
+
+        # Nur mtime geändert (z.B. Kopie, touch) - Inhalt über Hash vergleichen
+        return file_hash(self.csv_path) == header.get('sha1')
+
+    def load(self) -> Optional[Dict]:
+        """
+        Lädt den Snapshot wenn er zur CSV passt
+
+        Returns:
+            Dict mit 'index' und 'row_count' oder None (CSV muss neu geparst werden)
+        """
+        if not os.path.exists(self.snapshot_path) or not os.path.exists(self.csv_path):
+            self.stats['misses'] += 1
+            return None
+
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                header = self._read_header(f)
+                if header is None or not self.is_current(header):
+                    self.stats['misses'] += 1
+                    return None
+
+                payload = pickle.load(f)
+                self.stats['hits'] += 1
+                return {
+                    'index': payload,
+                    'row_count': header.get('row_count', 0)
+                }
+
+        except Exception as e:
+            print(f"Snapshot nicht lesbar, CSV wird neu geparst: {e}")
+            self.stats['misses'] += 1
+            return None
+
+    def save(self, index: Dict, row_count: int, state: Dict) -> bool:
+        """
+        Schreibt den Snapshot atomar (temporäre Datei + os.replace)
+
+        state ist file_state() der CSV, erfasst bevor sie geparst wurde. Die CSV
+        wird hier nicht erneut gelesen: wurde sie inzwischen geändert, passt der
+        Header nicht mehr und der Snapshot wird beim nächsten Laden verworfen.
+        """
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+
+            header = {
+                'mtime_ns': state['mtime_ns'],
+                'size': state['size'],
+                'sha1': state['sha1'],
+                'version': SNAPSHOT_VERSION,
+                'row_count': row_count
+            }
+
+            tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.snapshot_path)
+            return True
+
+        except Exception as e:
+            print(f"Snapshot konnte nicht geschrieben werden: {e}")
+            return False
+
+    def remove(self):
+        """Löscht den Snapshot (erzwingt Neuaufbau beim nächsten Laden)"""
+        if os.path.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
+
+
+class GenerationCounter:
+    """
+    Prozessübergreifender Generationszähler des Index
+
+    Nach jeder Änderung an der CSV schreibt der schreibende Prozess eine neue
+    Generation: laufende Nummer plus ein eindeutiges Token je Änderung.
+    Andere Worker vergleichen das Token mit ihrem Stand und laden den Index neu.
+
+    Die Nummer ist nur informativ (Metriken, Health-Check): zwei gleichzeitige
+    Schreiber können dieselbe Nummer vergeben, ihre Tokens unterscheiden sich
+    aber immer. Wer das Token vor dem Laden liest, verpasst daher keine Änderung.
+    """
+
+    def __init__(self, csv_path: str, counter_path: str = None):
+        if counter_path is None:
+            cache_dir = os.path.join(os.path.dirname(csv_path), 'cache')
+            counter_path = os.path.join(cache_dir, os.path.basename(csv_path) + '.generation')
+        self.counter_path = counter_path
+
+    def read(self) -> Tuple[int, str]:
+        """Liest (Nummer, Token) der aktuellen Generation ((0, '') wenn noch keine Änderung)"""
+        try:
+            with open(self.counter_path, 'r', encoding='ascii') as f:
+                parts = f.read().split()
+            return int(parts[0]), parts[1] if len(parts) > 1 else parts[0]
+        except (OSError, ValueError, IndexError):
+            return 0, ''
+
+    def bump(self) -> Tuple[int, str]:
+        """Schreibt eine neue Generation (atomar ersetzt) und gibt (Nummer, Token) zurück"""
+        generation = self.read()[0] + 1
+        token = uuid.uuid4().hex
+
+        os.makedirs(os.path.dirname(self.counter_path), exist_ok=True)
+        tmp_path = f"{self.counter_path}.{os.getpid()}.{token}.tmp"
+        with open(tmp_path, 'w', encoding='ascii') as f:
+            f.write(f"{generation} {token}")
+        os.replace(tmp_path, self.counter_path)
+
+        return generation, token
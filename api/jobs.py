@@ -0,0 +1,478 @@
+"""
+Hintergrund-Jobs für lange Operationen der API
+
+Batch-Konvertierungen, Katalog-Abgleich, Ähnlichkeitssuche und Online-Prüfung
+können als Job eingereicht werden, statt den Request-Thread zu blockieren.
+Jobs laufen in einem Thread-Pool des Worker-Prozesses; Status, Fortschritt
+und Ergebnis liegen zusätzlich als Dateien im Job-Verzeichnis:
+
+    <id>.json          Status (atomar geschrieben)
+    <id>.result.json   Ergebnis
+    <id>.partial.jsonl Teilergebnisse während der Laufzeit (eine JSON-Liste je Zeile)
+    <id>.cancel        Abbruch-Wunsch (auch aus einem anderen Worker)
+    <id>.claim         Ein Worker übernimmt gerade einen verwaisten Job
+
+Dadurch sieht jeder Worker jeden Job, und nach einem Neustart bleiben fertige
+Ergebnisse abrufbar. Jobs, deren Prozess nicht mehr läuft, werden beim Start
+eines Workers neu eingereiht (die Operationen sind wiederholbar). Ein Prozess
+gilt nur als derselbe, wenn PID und Startzeit passen (file_lock.process_identity),
+da ein neu gestarteter Container oft wieder dieselbe PID bekommt.
+Abgeschlossene Jobs werden nach Ablauf der TTL gelöscht.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from file_lock import pid_alive, process_identity
+
+ACTIVE_STATES = ('queued', 'running')
+FINISHED_STATES = ('done', 'failed', 'cancelled')
+
+# Wie oft ein laufender Job seinen Status schreibt bzw. nach Abbruch-Wünschen schaut
+PERSIST_INTERVAL = 0.5
+
+# Event-Stream: Abfrageintervall des Job-Verzeichnisses und Keepalive für Proxys
+EVENT_POLL_INTERVAL = 0.25
+EVENT_KEEPALIVE = 15.0
+
+# Claim-Datei eines Workers, der beim Übernehmen abgestürzt ist, gilt danach als verwaist
+CLAIM_STALE_AFTER = 60.0
+
+
+class JobCancelled(Exception):
+    """Wird in der Job-Funktion ausgelöst, wenn der Job abgebrochen wurde"""
+
+
+class JobContext:
+    """Wird der Job-Funktion übergeben: Fortschritt melden und Abbruch prüfen"""
+
+    def __init__(self, manager: 'JobManager', job_id: str):
+        self.manager = manager
+        self.job_id = job_id
+        self.cancel_event = threading.Event()
+        self._last_persist = 0.0
+        self._partial = None
+        self._published = 0
+
+    @property
+    def cancelled(self) -> bool:
+        if not self.cancel_event.is_set() and self.manager.cancel_requested(self.job_id):
+            self.cancel_event.set()
+        return self.cancel_event.is_set()
+
+    def update(self, processed: int, total: int = None, partial: List = None):
+        """
+        Meldet den Fortschritt (billig genug für jeden Schleifendurchlauf)
+
+        Args:
+            processed: Anzahl erledigter Einträge
+            total: Gesamtzahl (falls bekannt)
+            partial: Wachsende Ergebnisliste; die ersten `processed` Einträge gelten
+                     als fertig und werden periodisch als Teilergebnis veröffentlicht
+
+        Raises:
+            JobCancelled: Job wurde abgebrochen
+        """
+        job = self.manager.jobs[self.job_id]
+        job['processed'] = processed
+        if total is not None:
+            job['total'] = total
+        if partial is not None:
+            self._partial = partial
+        if job.get('total'):
+            job['progress'] = round(min(100.0, processed * 100.0 / job['total']), 1)
+
+        now = time.monotonic()
+        if now - self._last_persist >= PERSIST_INTERVAL:
+            self._last_persist = now
+            self._update_rate(job)
+            self.flush_partial(processed)
+            self.manager.save_state(job)
+            if self.cancelled:
+                raise JobCancelled()
+        elif self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def _update_rate(self, job: Dict):
+        """Durchsatz und geschätzte Restzeit"""
+        total = job.get('total')
+        processed = job['processed']
+        elapsed = time.time() - (job.get('started_ts') or time.time())
+        if elapsed > 0 and processed:
+            rate = processed / elapsed
+            job['rate_per_s'] = round(rate, 1)
+            job['eta_seconds'] = round((total - processed) / rate, 1) if total else None
+
+    def flush_partial(self, limit: int = None):
+        """Schreibt noch nicht veröffentlichte Teilergebnisse (bis Index `limit`)"""
+        if self._partial is None:
+            return
+        end = len(self._partial) if limit is None else min(limit, len(self._partial))
+        if end > self._published:
+            self.manager.append_partial(self.job_id, self._partial[self._published:end])
+            self._published = end
+
+
+class JobManager:
+    """Verwaltet Jobs eines Prozesses (Thread-Pool) mit Status im Job-Verzeichnis"""
+
+    def __init__(self, store_dir: str, workers: int = 2, ttl: float = 24 * 3600):
+        self.store_dir = store_dir
+        self.workers = workers
+        self.ttl = ttl
+        self.jobs = {}        # id -> Status-Dict (nur Jobs dieses Prozesses)
+        self.contexts = {}    # id -> JobContext laufender/wartender Jobs
+        self.handlers = {}    # kind -> Funktion(params, ctx) -> Ergebnis-Dict
+        self._executor = None
+        self._pid = None
+        self._process = None  # process_identity() dieses Prozesses (PID allein wird nach Neustart wiederverwendet)
+        self._lock = threading.Lock()
+
+    def register(self, kind: str, func: Callable[[Dict, JobContext], Dict]):
+        self.handlers[kind] = func
+        return func
+
+    def _path(self, job_id: str, suffix: str = '.json') -> str:
+        return os.path.join(self.store_dir, f"{job_id}{suffix}")
+
+    def _ensure_started(self):
+        """Pool und Wiederaufnahme erst im Worker-Prozess (nicht im Gunicorn-Master vor dem Fork)"""
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            os.makedirs(self.store_dir, exist_ok=True)
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='job')
+            self.jobs = {}
+            self.contexts = {}
+            self._process = process_identity(os.getpid())
+            self._pid = os.getpid()
+        self.recover()
+
+    # --- Speicher ---
+
+    def save_state(self, job: Dict):
+        tmp_path = self._path(job['id'], f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(job['id']))
+
+    def _read_state(self, job_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(job_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def append_partial(self, job_id: str, items: List):
+        """Hängt Teilergebnisse als eine Zeile an (Leser verarbeiten nur vollständige Zeilen)"""
+        line = json.dumps(items, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with open(self._path(job_id, '.partial.jsonl'), 'a', encoding='utf-8') as f:
+            f.write(line)
+
+    def _remove_partial(self, job_id: str):
+        try:
+            os.remove(self._path(job_id, '.partial.jsonl'))
+        except FileNotFoundError:
+            pass
+
+    def _remove_files(self, job_id: str):
+        for suffix in ('.json', '.result.json', '.partial.jsonl', '.cancel', '.claim'):
+            try:
+                os.remove(self._path(job_id, suffix))
+            except FileNotFoundError:
+                pass
+
+    # --- Ausführung ---
+
+    def submit(self, kind: str, params: Dict) -> Dict:
+        """Reiht einen Job ein und gibt seinen Status zurück"""
+        if kind not in self.handlers:
+            raise ValueError(f"Unbekannter Job-Typ: {kind}")
+        self._ensure_started()
+        self.cleanup()
+
+        job = {
+            'id': uuid.uuid4().hex,
+            'kind': kind,
+            'params': params,
+            'status': 'queued',
+            'progress': 0.0,
+            'processed': 0,
+            'total': None,
+            'error': None,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'started_at': None,
+            'finished_at': None,
+            'finished_ts': None,
+            'started_ts': None,
+            'rate_per_s': None,
+            'eta_seconds': None,
+        }
+        self._enqueue(job)
+        return self._public(job)
+
+    def _enqueue(self, job: Dict):
+        job['pid'] = os.getpid()
+        job['process'] = self._process
+        job['host'] = socket.gethostname()
+        self.jobs[job['id']] = job
+        self.contexts[job['id']] = JobContext(self, job['id'])
+        self.save_state(job)
+        self._executor.submit(self._run, job['id'])
+
+    def _run(self, job_id: str):
+        job = self.jobs[job_id]
+        ctx = self.contexts[job_id]
+
+        try:
+            if ctx.cancelled:
+                raise JobCancelled()
+            job['status'] = 'running'
+            job['started_at'] = datetime.now().isoformat(timespec='seconds')
+            job['started_ts'] = time.time()
+            self.save_state(job)
+
+            result = self.handlers[job['kind']](job['params'], ctx)
+            ctx.flush_partial()
+
+            tmp_path = self._path(job_id, f".result.{os.getpid()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self._path(job_id, '.result.json'))
+
+            job['status'] = 'done'
+            job['progress'] = 100.0
+            job['eta_seconds'] = 0
+        except JobCancelled:
+            job['status'] = 'cancelled'
+        except Exception as e:
+            print(f"Job {job_id} ({job['kind']}) fehlgeschlagen: {e}")
+            job['status'] = 'failed'
+            job['error'] = str(e)
+        finally:
+            job['finished_at'] = datetime.now().isoformat(timespec='seconds')
+            job['finished_ts'] = time.time()
+            self.save_state(job)
+            self.contexts.pop(job_id, None)
+
+    def recover(self):
+        """Reiht Jobs neu ein, deren Prozess nicht mehr läuft (z.B. nach Neustart eines Workers)"""
+        host = socket.gethostname()
+        for name in os.listdir(self.store_dir):
+            if not name.endswith('.json') or name.endswith('.result.json'):
+                continue
+            job_id = name[:-len('.json')]
+            job = self._read_state(job_id)
+            if not job or job['status'] not in ACTIVE_STATES:
+                continue
+            if self._owner_alive(job, host):
+                continue
+            if job['kind'] not in self.handlers:
+                continue
+
+            if not self._claim(job_id):
+                continue
+            try:
+                # Erneut lesen: ein anderer Worker kann den Job seit unserem Lesen übernommen
+                # und seinen Claim (nach dem Speichern des Status) schon wieder entfernt haben
+                job = self._read_state(job_id)
+                if not job or job['status'] not in ACTIVE_STATES or self._owner_alive(job, host):
+                    continue
+                print(f"Job {job_id} ({job['kind']}) wird nach Neustart erneut ausgeführt")
+                job.update({'status': 'queued', 'progress': 0.0, 'processed': 0, 'started_at': None})
+                self._remove_partial(job_id)
+                # Claim erst entfernen, wenn der Status mit dem neuen Besitzer gespeichert ist
+                self._enqueue(job)
+            finally:
+                self._release_claim(job_id)
+
+    def _claim(self, job_id: str) -> bool:
+        """Nur ein Worker darf einen verwaisten Job übernehmen (Claim-Datei per O_EXCL)"""
+        claim_path = self._path(job_id, '.claim')
+        for _ in range(2):
+            try:
+                fd = os.open(claim_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+            except FileExistsError:
+                if not self._break_stale_claim(claim_path):
+                    return False
+                continue
+            os.close(fd)
+            return True
+        return False
+
+    @staticmethod
+    def _break_stale_claim(claim_path: str) -> bool:
+        """Entfernt eine Claim-Datei, die älter als CLAIM_STALE_AFTER ist (Absturz beim Übernehmen)"""
+        stale_path = f"{claim_path}.{os.getpid()}.{threading.get_ident()}.stale"
+        try:
+            if time.time() - os.path.getmtime(claim_path) < CLAIM_STALE_AFTER:
+                return False
+            os.replace(claim_path, stale_path)
+        except OSError:
+            return False
+
+        # Zwischen Prüfen und Umbenennen kann ein anderer Worker die alte Datei
+        # entfernt und einen neuen Claim angelegt haben - der gehört zurück
+        try:
+            if time.time() - os.path.getmtime(stale_path) < CLAIM_STALE_AFTER:
+                os.replace(stale_path, claim_path)
+                return False
+            os.remove(stale_path)
+        except OSError:
+            return False
+        return True
+
+    def _release_claim(self, job_id: str):
+        try:
+            os.remove(self._path(job_id, '.claim'))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _owner_alive(job: Dict, host: str) -> bool:
+        """Läuft der Prozess, der den Job eingereiht hat, noch? (gleiche PID nach Neustart zählt nicht)"""
+        pid = job.get('pid', 0)
+        if job.get('host') != host or not pid_alive(pid):
+            return False
+        return process_identity(pid) == job.get('process')
+
+    # --- Abfragen ---
+
+    @staticmethod
+    def _public(job: Dict) -> Dict:
+        return {k: v for k, v in job.items() if k not in ('pid', 'process', 'host', 'finished_ts', 'started_ts')}
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Status eines Jobs (auch aus anderen Workern, über das Job-Verzeichnis)"""
+        self._ensure_started()
+        job = self.jobs.get(job_id)
+        if job is None:
+            if not all(c in '0123456789abcdef' for c in job_id):
+                return None
+            job = self._read_state(job_id)
+        return self._public(job) if job else None
+
+    def list(self) -> List[Dict]:
+        self._ensure_started()
+        self.cleanup()
+        jobs = []
+        for name in os.listdir(self.store_dir):
+            if name.endswith('.json') and not name.endswith('.result.json'):
+                job = self.get(name[:-len('.json')])
+                if job:
+                    jobs.append(job)
+        jobs.sort(key=lambda j: j['created_at'], reverse=True)
+        return jobs
+
+    def result_path(self, job_id: str) -> Optional[str]:
+        path = self._path(job_id, '.result.json')
+        return path if os.path.exists(path) else None
+
+    def cancel_requested(self, job_id: str) -> bool:
+        return os.path.exists(self._path(job_id, '.cancel'))
+
+    def cancel(self, job_id: str) -> bool:
+        """Fordert den Abbruch an (wirkt beim nächsten Fortschritts-Update der Job-Funktion)"""
+        job = self.get(job_id)
+        if job is None or job['status'] not in ACTIVE_STATES:
+            return False
+        ctx = self.contexts.get(job_id)
+        if ctx is not None:
+            ctx.cancel_event.set()
+        else:
+            # Job läuft in einem anderen Worker
+            open(self._path(job_id, '.cancel'), 'w').close()
+        return True
+
+    def delete(self, job_id: str) -> bool:
+        job = self.get(job_id)
+        if job is None:
+            return False
+        if job['status'] in ACTIVE_STATES:
+            self.cancel(job_id)
+            return False
+        self.jobs.pop(job_id, None)
+        self._remove_files(job_id)
+        return True
+
+    def cleanup(self) -> int:
+        """Löscht abgeschlossene Jobs, deren TTL abgelaufen ist"""
+        removed = 0
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.store_dir):
+            if not name.endswith('.json') or name.endswith('.result.json'):
+                continue
+            job_id = name[:-len('.json')]
+            job = self.jobs.get(job_id) or self._read_state(job_id)
+            if job and job['status'] in FINISHED_STATES and (job.get('finished_ts') or 0) < cutoff:
+                self.jobs.pop(job_id, None)
+                self._remove_files(job_id)
+                removed += 1
+        return removed
+
+    def events(self, job_id: str, partial: bool = True, offset: int = 0) -> Iterator[Tuple[str, Dict]]:
+        """
+        Fortschritt eines Jobs als Folge von (event, daten) bis zum Abschluss
+
+        Liest nur das Job-Verzeichnis und funktioniert daher auch, wenn der Job
+        in einem anderen Worker läuft.
+
+        Args:
+            partial: Teilergebnisse mitsenden
+            offset: Byte-Position in der Teilergebnis-Datei (Wiederaufnahme nach Verbindungsabbruch)
+
+        Events: 'progress', 'partial' (mit 'offset' für Last-Event-ID), 'keepalive' und
+        zum Schluss 'done', 'failed' oder 'cancelled'
+        """
+        partial_path = self._path(job_id, '.partial.jsonl')
+        last_state = None
+        last_sent = time.monotonic()
+
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                yield 'failed', {'error': 'Job nicht gefunden'}
+                return
+
+            if partial and os.path.exists(partial_path):
+                with open(partial_path, 'rb') as f:
+                    f.seek(offset)
+                    chunk = f.read()
+                # Nur vollständige Zeilen (der Schreiber hängt gerade evtl. noch an)
+                complete = chunk[:chunk.rfind(b'\n') + 1]
+                for line in complete.splitlines():
+                    offset += len(line) + 1
+                    yield 'partial', {'items': json.loads(line), 'offset': offset}
+                    last_sent = time.monotonic()
+
+            state = (job['status'], job['processed'], job.get('total'))
+            if state != last_state:
+                last_state = state
+                yield 'progress', {key: job.get(key) for key in
+                                   ('status', 'processed', 'total', 'progress', 'rate_per_s', 'eta_seconds')}
+                last_sent = time.monotonic()
+
+            if job['status'] in FINISHED_STATES:
+                yield job['status'], job
+                return
+
+            if time.monotonic() - last_sent >= EVENT_KEEPALIVE:
+                yield 'keepalive', {}
+                last_sent = time.monotonic()
+
+            time.sleep(EVENT_POLL_INTERVAL)
+
+    def stats(self) -> Dict:
+        counts = {}
+        for job in self.jobs.values():
+            counts[job['status']] = counts.get(job['status'], 0) + 1
+        return {'workers': self.workers, 'ttl_seconds': self.ttl, 'jobs': counts}
@@ -0,0 +1,92 @@
+"""
+JSON-Provider für die Flask-App
+
+batch-convert, load-catalog und find-similar liefern Listen mit tausenden
+Dicts; die Serialisierung ist dort ein spürbarer Teil der Antwortzeit.
+Ist orjson installiert, wird es verwendet, sonst der Standard-Provider von
+Flask. Beide geben kompakte Ausgabe ohne Einrückung und ohne Sortierung der
+Schlüssel aus (Reihenfolge wie im Dict).
+
+Auswahl über die Umgebungsvariable JSON_PROVIDER:
+  'auto'    - orjson wenn verfügbar, sonst Standard (Standardwert)
+  'orjson'  - wie 'auto', mit Warnung wenn orjson fehlt
+  'default' - immer der Standard-Provider
+"""
+
+import os
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class CompactJSONProvider(DefaultJSONProvider):
+    """Standard-Provider (json-Modul) mit kompakter Ausgabe, Schlüssel unsortiert"""
+
+    name = 'json'
+    compact = True
+    sort_keys = False
+
+
+class OrjsonProvider(CompactJSONProvider):
+    """
+    Provider auf Basis von orjson
+
+    Typen, die orjson nicht kennt (Decimal, Sets, ...), gehen über dieselbe
+    default-Funktion wie beim Standard-Provider. Datumswerte ebenfalls
+    (OPT_PASSTHROUGH_DATETIME), damit sie wie dort als HTTP-Datum statt ISO
+    erscheinen. Schlägt orjson trotzdem fehl (z.B. Ganzzahl größer 64 Bit),
+    wird auf das json-Modul zurückgefallen.
+    """
+
+    name = 'orjson'
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+    def _dump_bytes(self, obj) -> bytes:
+        try:
+            return orjson.dumps(obj, default=self.default, option=self.option)
+        except TypeError:
+            return super().dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            # Explizite json-Argumente (indent, separators, ...) nur mit dem json-Modul
+            return super().dumps(obj, **kwargs)
+        return self._dump_bytes(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """Wie beim Standard-Provider, aber ohne Umweg über str (Bytes direkt in den Body)"""
+        # Ein Wert, mehrere als Liste oder Keyword-Argumente als Dict (wie jsonify)
+        if args and kwargs:
+            raise TypeError("app.json.response() takes either args or kwargs, not both")
+        obj = args[0] if len(args) == 1 else (args or kwargs or None)
+        return self._app.response_class(self._dump_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+
+def get_provider_class(choice: str = None):
+    """
+    Wählt die Provider-Klasse
+
+    Args:
+        choice: 'auto', 'orjson' oder 'default' (None: Umgebungsvariable JSON_PROVIDER)
+    """
+    if choice is None:
+        choice = os.environ.get('JSON_PROVIDER', 'auto')
+
+    if choice == 'default':
+        return CompactJSONProvider
+
+    if orjson is None:
+        if choice == 'orjson':
+            print("JSON_PROVIDER=orjson, aber orjson ist nicht installiert - verwende json-Modul")
+        return CompactJSONProvider
+
+    return OrjsonProvider
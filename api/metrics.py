@@ -0,0 +1,342 @@
+"""
+Einfache Metriken (Counter, Gauge, Histogram) im Prometheus-Textformat
+
+Bewusst ohne externe Abhängigkeit. Jede Metrik hält ihre Werte pro
+Label-Kombination in einem Dict; ein Update kostet ein Lock und ein paar
+Dict-Zugriffe. Werte gelten zunächst pro Prozess; mit mehreren Workern
+(gunicorn) fasst set_multiprocess_dir() sie über Dateien zusammen.
+"""
+
+import json
+import os
+import uuid
+from bisect import bisect_left
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from file_lock import pid_alive, process_identity
+
+# Standard-Buckets für Latenzen in Sekunden
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(label_names: Tuple[str, ...], label_values: Tuple[str, ...], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(label_names, label_values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    metric_type = ''
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = Lock()
+        self._values = {}
+
+    # Werte mehrerer Prozesse addieren (Gauges werden je Worker ausgegeben)
+    aggregate = True
+
+    def render(self, items=None, label_names: Tuple[str, ...] = None) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+        if items is None:
+            items = self.snapshot()
+        if label_names is None:
+            label_names = self.label_names
+        for label_values, value in sorted(items):
+            lines.extend(self._render_sample(label_names, label_values, value))
+        return lines
+
+    def _render_sample(self, label_names, label_values, value) -> List[str]:
+        return [f'{self.name}{_format_labels(label_names, label_values)} {_format_value(value)}']
+
+    def snapshot(self) -> List[Tuple[Tuple[str, ...], object]]:
+        """Kopie aller Werte als [(label_values, wert), ...]"""
+        with self._lock:
+            return [(label_values, self._copy(value)) for label_values, value in self._values.items()]
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+    @staticmethod
+    def merge(value, other):
+        return value + other
+
+    def reset(self):
+        """Nach dem Fork: Werte des Elternprozesses verwerfen (Lock evtl. mitten im Update kopiert)"""
+        self._lock = Lock()
+        self._values = {}
+
+
+class Counter(_Metric):
+    """Monoton steigender Zähler"""
+    metric_type = 'counter'
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def get(self, *label_values) -> float:
+        return self._values.get(label_values, 0)
+
+
+class Gauge(_Metric):
+    """Momentaufnahme (kann steigen und fallen)"""
+    metric_type = 'gauge'
+    aggregate = False
+
+    def reset(self):
+        # Zustand des Prozesses (z.B. geerbter Index) gilt im Kind weiter
+        self._lock = Lock()
+
+    def set(self, *label_values, value: float):
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram(_Metric):
+    """Verteilung von Messwerten in festen Buckets (kumulativ wie bei Prometheus)"""
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, *label_values, value: float):
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(label_values)
+            if entry is None:
+                # [Zähler je Bucket (+Inf am Ende), Summe, Anzahl]
+                entry = self._values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][idx] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def _render_sample(self, label_names, label_values, value) -> List[str]:
+        bucket_counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), bucket_counts):
+            cumulative += bucket_count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f'{self.name}_bucket{_format_labels(label_names, label_values, le)} {cumulative}')
+        labels = _format_labels(label_names, label_values)
+        lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+        lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+    @staticmethod
+    def _copy(value):
+        return [list(value[0]), value[1], value[2]]
+
+    @staticmethod
+    def merge(value, other):
+        return [[a + b for a, b in zip(value[0], other[0])], value[1] + other[1], value[2] + other[2]]
+
+
+# Collector: liefert beim Rendern (name, typ, hilfe, [(labels_dict, wert), ...])
+CollectorResult = Iterable[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]
+
+
+class MetricsRegistry:
+    """Sammelt Metriken und Collector-Funktionen und rendert sie im Prometheus-Format"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+        self.multiprocess_dir = None
+        self.flush_interval = 1.0
+        self._file_path = None
+        self._file_pid = None
+        self._written = None
+        self._flush_lock = Lock()
+        self._flusher_stop = None
+
+    def counter(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Iterable[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], CollectorResult]):
+        """Registriert eine Funktion, deren Werte erst beim Abruf berechnet werden"""
+        self._collectors.append(collector)
+        return collector
+
+    # --- Mehrere Worker-Prozesse ---
+
+    def set_multiprocess_dir(self, path: str, clear: bool = False):
+        """
+        Fasst die Werte mehrerer Worker-Prozesse über ein Verzeichnis zusammen
+
+        Jeder Prozess schreibt seine Werte jede flush_interval Sekunden (und bei
+        jedem Abruf) nach <path>/<pid>.<token>.json. render() addiert Counter und
+        Histogramme aller Dateien - auch beendeter Worker, damit die Summen nicht
+        zurückspringen. Gauges und Collector-Werte gelten pro Prozess und werden
+        nur für laufende Prozesse mit dem Label worker="<pid>" ausgegeben.
+
+        Nach einem Fork beginnt das Kind bei 0 (die Werte des Elternprozesses
+        stehen bereits in dessen Datei).
+
+        Args:
+            clear: Dateien eines früheren Server-Laufs löschen - nur einmal vor
+                   dem Fork aufrufen (gunicorn mit preload_app)
+        """
+        os.makedirs(path, exist_ok=True)
+        if clear:
+            for name in os.listdir(path):
+                if name.endswith('.json'):
+                    try:
+                        os.remove(os.path.join(path, name))
+                    except OSError:
+                        pass
+        self.multiprocess_dir = path
+        self._start_flusher()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(before=self._flush_quietly, after_in_child=self._after_fork)
+
+    def _start_flusher(self):
+        self._flusher_stop = Event()
+        Thread(target=self._flush_loop, args=(self._flusher_stop,), name='metrics-flush', daemon=True).start()
+
+    def _flush_loop(self, stop: Event):
+        while not stop.wait(self.flush_interval):
+            self._flush_quietly()
+
+    def _flush_quietly(self):
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Metriken konnten nicht geschrieben werden: {e}")
+
+    def _after_fork(self):
+        for metric in self._metrics:
+            metric.reset()
+        self._flush_lock = Lock()
+        self._start_flusher()
+
+    def flush(self):
+        """Schreibt die Werte dieses Prozesses in seine Datei (atomar)"""
+        if self.multiprocess_dir is None:
+            return
+        with self._flush_lock:
+            pid = os.getpid()
+            if self._file_pid != pid:
+                self._file_pid = pid
+                self._written = None
+                self._file_path = os.path.join(self.multiprocess_dir, f"{pid}.{uuid.uuid4().hex}.json")
+            content = {
+                'pid': pid,
+                'process': process_identity(pid),
+                'metrics': {metric.name: metric.snapshot() for metric in self._metrics},
+                'collected': [[name, metric_type, documentation, list(samples)]
+                              for name, metric_type, documentation, samples in self._collect()],
+            }
+            data = json.dumps(content, ensure_ascii=False, separators=(',', ':'))
+            if data == self._written:
+                return  # unverändert seit dem letzten Schreiben
+            tmp_path = f"{self._file_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self._file_path)
+            self._written = data
+
+    def _collect(self):
+        for collector in self._collectors:
+            yield from collector()
+
+    def _read_processes(self) -> List[Dict]:
+        processes = []
+        for name in os.listdir(self.multiprocess_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.multiprocess_dir, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            entry['alive'] = path == self._file_path or self._process_alive(entry)
+            processes.append(entry)
+        processes.sort(key=lambda entry: entry['pid'])
+        return processes
+
+    @staticmethod
+    def _process_alive(entry: Dict) -> bool:
+        if entry.get('process') is None:
+            return pid_alive(entry['pid'])
+        return process_identity(entry['pid']) == entry['process']
+
+    # --- Ausgabe ---
+
+    def render(self) -> str:
+        if self.multiprocess_dir is None:
+            return self._render_local()
+        self.flush()
+        return self._render_processes(self._read_processes())
+
+    def _render_local(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, metric_type, documentation, samples in self._collect():
+            lines.extend(self._render_collected(name, metric_type, documentation, samples))
+        return '\n'.join(lines) + '\n'
+
+    def _render_processes(self, processes: List[Dict]) -> str:
+        lines = []
+        for metric in self._metrics:
+            if metric.aggregate:
+                merged = {}
+                for entry in processes:
+                    for label_values, value in entry['metrics'].get(metric.name, []):
+                        key = tuple(label_values)
+                        merged[key] = metric.merge(merged[key], value) if key in merged else value
+                lines.extend(metric.render(merged.items()))
+            else:
+                items = [((str(entry['pid']),) + tuple(label_values), value)
+                         for entry in processes if entry['alive']
+                         for label_values, value in entry['metrics'].get(metric.name, [])]
+                lines.extend(metric.render(items, ('worker',) + metric.label_names))
+
+        # Collector-Werte je laufendem Prozess, gruppiert nach Name
+        collected = {}
+        for entry in processes:
+            if not entry['alive']:
+                continue
+            for name, metric_type, documentation, samples in entry['collected']:
+                group = collected.setdefault(name, (metric_type, documentation, []))
+                group[2].extend((dict({'worker': str(entry['pid'])}, **labels), value) for labels, value in samples)
+        for name, (metric_type, documentation, samples) in collected.items():
+            lines.extend(self._render_collected(name, metric_type, documentation, samples))
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _render_collected(name: str, metric_type: str, documentation: str, samples) -> List[str]:
+        lines = [f'# HELP {name} {documentation}', f'# TYPE {name} {metric_type}']
+        for labels, value in samples:
+            label_str = _format_labels(tuple(labels.keys()), tuple(labels.values()))
+            lines.append(f'{name}{label_str} {_format_value(value)}')
+        return lines
@@ -0,0 +1,250 @@
+"""
+Gemeinsamer Portfolio-Index für die API und die Desktop-Tools
+
+Ein Loader für Portfolio_Syskomp_pA (CSV mit ';' oder Excel) und ein Index
+{Spalte: {Wert: [Zeilen]}}, den api/app.py, src/conversion.py und
+src/conversion_app.py gleichermaßen verwenden:
+  - alle Nummern-Spalten A, B, D-H werden indiziert (auch G, Alvaris Matnr)
+  - Pipe-getrennte Zellen ("370010|370011") ergeben mehrere Einträge,
+    der Platzhalter '-' keinen (split_values, auch für Graph und Online-Prüfung)
+  - gleiche Nummer in mehreren Zeilen: alle Zeilen bleiben erhalten
+
+Excel wird gestreamt (read_only + values_only). PortfolioIndex.load nutzt den
+binären Snapshot aus index_snapshot, sodass ein unveränderter Bestand beim
+nächsten Start ohne Parsen geladen wird.
+
+Desktop-Tools liegen in src/ und importieren das Modul über den api-Ordner:
+    sys.path.insert(0, <Projekt>/api)
+    from portfolio_index import PortfolioIndex
+"""
+
+import csv
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from index_snapshot import IndexSnapshot, file_state
+
+COLUMNS = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
+
+# Alle Spalten außer C (Beschreibung) sind Nummern und werden indiziert
+INDEX_COLUMNS = ['A', 'B', 'D', 'E', 'F', 'G', 'H']
+
+# Zeilen zwischen zwei Fortschrittsmeldungen beim Laden
+PROGRESS_EVERY = 2000
+
+Index = Dict[str, Dict[str, List[Dict[str, str]]]]
+
+
+def clean_value(value) -> str:
+    """Zellwert als getrimmter String ('' für leer/None)"""
+    if value is None:
+        return ''
+    value = str(value).strip()
+    return '' if value == 'None' else value
+
+
+def split_values(cell: str) -> List[str]:
+    """Einzelwerte einer Zelle: Pipe-getrennt, ohne Platzhalter '-', doppelte Werte nur einmal"""
+    if '|' not in cell:
+        cell = cell.strip()
+        return [cell] if cell and cell != '-' else []
+    values = (v.strip() for v in cell.split('|'))
+    return list(dict.fromkeys(v for v in values if v and v != '-'))
+
+
+def iter_csv_rows(path: str) -> Iterator[List[str]]:
+    """Zeilen der Portfolio-CSV (ohne Header), je 8 bereinigte Werte"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f, delimiter=';')
+        next(reader, None)
+        for row in reader:
+            values = [clean_value(v) for v in row[:8]]
+            if len(values) < 8:
+                values.extend([''] * (8 - len(values)))
+            yield values
+
+
+def iter_xlsx_rows(path: str) -> Iterator[List[str]]:
+    """Zeilen der aktiven Tabelle (ohne Header), gestreamt statt ws.cell() je Zelle"""
+    from openpyxl import load_workbook  # Nur für Excel nötig (API arbeitet mit der CSV)
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in wb.active.iter_rows(min_row=2, max_col=8, values_only=True):
+            values = [clean_value(v) for v in row]
+            if len(values) < 8:
+                values.extend([''] * (8 - len(values)))
+            yield values
+    finally:
+        wb.close()
+
+
+def iter_rows(path: str) -> Iterator[List[str]]:
+    if path.lower().endswith(('.xlsx', '.xlsm')):
+        return iter_xlsx_rows(path)
+    return iter_csv_rows(path)
+
+
+def build_index(rows: Iterable[List[str]],
+                progress: Optional[Callable[[int], None]] = None) -> Tuple[Index, int]:
+    """
+    Baut den Spalten-Index aus Zeilen mit 8 Werten (A-H)
+
+    Returns:
+        (index, row_count) - index[spalte][wert] ist die Liste aller Zeilen mit diesem Wert
+    """
+    index = {col: {} for col in INDEX_COLUMNS}
+    row_count = 0
+
+    for values in rows:
+        row_dict = dict(zip(COLUMNS, values))
+
+        for col in INDEX_COLUMNS:
+            cell = row_dict[col]
+            if cell:
+                col_index = index[col]
+                for value in split_values(cell):
+                    rows_for_value = col_index.get(value)
+                    if rows_for_value is None:
+                        col_index[value] = [row_dict]
+                    else:
+                        rows_for_value.append(row_dict)
+
+        row_count += 1
+        if progress and row_count % PROGRESS_EVERY == 0:
+            progress(row_count)
+
+    # Spalten ohne Einträge weglassen (wie bisher beim Dict pro Spalte)
+    return {col: values for col, values in index.items() if values}, row_count
+
+
+def read_index(path: str, progress: Optional[Callable[[int], None]] = None) -> Tuple[Index, int]:
+    """Parst CSV oder Excel (nach Dateiendung) und baut den Index"""
+    return build_index(iter_rows(path), progress)
+
+
+def collect_candidates(row_list, to_col, max_candidates):
+    """
+    Sammelt alle verschiedenen Zielwerte der gefundenen Zeilen in einem Durchlauf
+
+    Pipe-Werte werden getrennt, doppelte Werte über Zeilen und Zellen hinweg
+    zusammengefasst. Jeder Kandidat listet die Syskomp-neu-Nummern der Zeilen,
+    aus denen er stammt.
+
+    Returns:
+        Tuple[list, bool]: (Kandidaten, abgeschnitten)
+    """
+    candidates = {}
+    syskomp_sets = {}  # Wert -> {Syskomp neu: None} (Dict als geordnete Menge)
+    truncated = False
+
+    for row_data in row_list:
+        syskomp_neu = row_data.get('A', '')
+        for value in split_values(row_data.get(to_col, '')):
+            syskomp_set = syskomp_sets.get(value)
+            if syskomp_set is None:
+                if len(candidates) >= max_candidates:
+                    truncated = True
+                    continue
+                candidates[value] = {'value': value, 'syskomp_neu': []}
+                syskomp_set = syskomp_sets[value] = {}
+
+            if syskomp_neu and syskomp_neu not in syskomp_set:
+                syskomp_set[syskomp_neu] = None
+                candidates[value]['syskomp_neu'].append(syskomp_neu)
+
+    return list(candidates.values()), truncated
+
+
+class PortfolioIndex:
+    """
+    Geladener Portfolio-Index mit Lookup- und Batch-Funktionen
+
+    Leer (bool False), bis load() bzw. der Konstruktor einen Index bekommt.
+    """
+
+    def __init__(self, index: Optional[Index] = None, row_count: int = 0, source: str = ''):
+        self.index = index or {}
+        self.row_count = row_count
+        self.source = source  # 'snapshot', 'csv' oder 'xlsx'
+
+    @classmethod
+    def load(cls, path: str, use_snapshot: bool = True,
+             progress: Optional[Callable[[int], None]] = None) -> 'PortfolioIndex':
+        """Lädt den Index aus dem Snapshot (wenn aktuell) oder parst die Datei und legt ihn an"""
+        start = time.perf_counter()
+        snapshot = IndexSnapshot(path) if use_snapshot else None
+
+        if snapshot is not None:
+            cached = snapshot.load()
+            if cached is not None:
+                result = cls(cached['index'], cached['row_count'], 'snapshot')
+                print(f"Portfolio aus Snapshot: {result.row_count} Zeilen in {time.perf_counter() - start:.2f}s")
+                return result
+
+        state = file_state(path) if snapshot is not None else None
+        index, row_count = read_index(path, progress)
+        source = 'xlsx' if path.lower().endswith(('.xlsx', '.xlsm')) else 'csv'
+        result = cls(index, row_count, source)
+        print(f"Portfolio geparst ({source}): {row_count} Zeilen in {time.perf_counter() - start:.2f}s")
+
+        if snapshot is not None:
+            snapshot.save(index, row_count, state)
+        return result
+
+    def __bool__(self):
+        return bool(self.index)
+
+    def lookup(self, col: str, value: str) -> List[Dict[str, str]]:
+        """Alle Zeilen, in denen value in Spalte col steht (leere Liste wenn keine)"""
+        return self.index.get(col, {}).get(value.strip(), [])
+
+    def find(self, value: str, cols: Iterable[str] = INDEX_COLUMNS) -> Tuple[Optional[str], List[Dict[str, str]]]:
+        """Erste Spalte (in der Reihenfolge von cols), die value enthält: (spalte, zeilen)"""
+        value = value.strip()
+        for col in cols:
+            rows = self.index.get(col, {}).get(value)
+            if rows:
+                return col, rows
+        return None, []
+
+    def target_values(self, rows: List[Dict[str, str]], to_col: str, max_candidates: int = 200) -> List[str]:
+        """Verschiedene Werte der Zielspalte über alle Zeilen (Pipe-Werte einzeln)"""
+        candidates, _ = collect_candidates(rows, to_col, max_candidates)
+        return [candidate['value'] for candidate in candidates]
+
+    def result_text(self, rows: List[Dict[str, str]], to_col: str) -> str:
+        """Zielwerte für die Anzeige: Alvaris als 'Artnr / Matnr', sonst durch Komma getrennt ('-' wenn leer)"""
+        if to_col in ('F', 'G'):
+            pairs = []
+            for row in rows:
+                pair = f"{row.get('F') or '-'} / {row.get('G') or '-'}"
+                if pair not in pairs:
+                    pairs.append(pair)
+            return ', '.join(pairs) or '-'
+        return ', '.join(self.target_values(rows, to_col)) or '-'
+
+    def convert(self, from_col: str, value: str, to_col: str) -> Tuple[List[Dict[str, str]], List[str]]:
+        """Konvertiert eine Nummer: (gefundene Zeilen, Zielwerte)"""
+        rows = self.lookup(from_col, value)
+        return rows, self.target_values(rows, to_col)
+
+    def batch_convert(self, values: Iterable[str], to_col: str,
+                      cols: Iterable[str] = INDEX_COLUMNS) -> List[Dict]:
+        """
+        Sucht jede Nummer in der ersten passenden Spalte und liefert die Zielwerte
+
+        Returns:
+            Liste von Dicts mit value, column (None = nicht gefunden), rows, results
+        """
+        cols = list(cols)
+        results = []
+        for value in values:
+            col, rows = self.find(value, cols)
+            results.append({
+                'value': value,
+                'column': col,
+                'rows': rows,
+                'results': self.target_values(rows, to_col) if rows else []
+            })
+        return results
@@ -0,0 +1,129 @@
+"""
+Profiling einzelner Requests mit cProfile (ohne Neustart oder Debug-Modus)
+
+Zwei Wege, einen Request zu profilen:
+  - gezielt: Header "X-Profile: 1" oder Query "?profile=1" zusammen mit
+    gültigem Admin-Token (Header "X-Admin-Token", Umgebungsvariable API_ADMIN_TOKEN)
+  - stichprobenartig: Anteil sample_rate aller Requests (PROFILE_SAMPLE_RATE,
+    zur Laufzeit über /api/profiles/config änderbar)
+
+Aufbewahrt werden jeweils die langsamsten N profilierten Requests.
+"""
+
+import cProfile
+import heapq
+import io
+import itertools
+import marshal
+import pstats
+import random
+from datetime import datetime
+from threading import Lock
+from typing import Dict, List, Optional
+
+# Erlaubte Sortierungen für format_stats (pstats-Schlüssel wie 'cumulative', 'tottime')
+SORT_KEYS = tuple(pstats.Stats.sort_arg_dict_default)
+
+
+class ProfileStore:
+    """Hält die langsamsten N Profile (Min-Heap nach Dauer)"""
+
+    def __init__(self, keep: int = 20, sample_rate: float = 0.0):
+        self.keep = keep
+        self.sample_rate = sample_rate
+        self._heap = []  # (dauer, id, eintrag)
+        self._by_id = {}
+        self._ids = itertools.count(1)
+        self._lock = Lock()
+
+    def should_sample(self) -> bool:
+        """Zufallsentscheidung für die Stichprobe"""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """
+        Startet einen Profiler für den aktuellen Request
+
+        Returns:
+            Profiler oder None, falls gerade ein anderer aktiv ist (ab Python 3.12
+            erlaubt sys.monitoring nur einen Profiler gleichzeitig) - der Request
+            läuft dann einfach ohne Profiling
+        """
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            return None
+        return profiler
+
+    @staticmethod
+    def discard(profiler: cProfile.Profile):
+        """Beendet das Profiling ohne zu speichern (Request mit Exception)"""
+        profiler.disable()
+
+    def finish(self, profiler: cProfile.Profile, duration: float, info: Dict) -> Optional[int]:
+        """
+        Beendet das Profiling und speichert das Ergebnis, falls es zu den langsamsten gehört
+
+        Returns:
+            ID des gespeicherten Profils oder None (zu schnell für die Top N)
+        """
+        profiler.disable()
+
+        with self._lock:
+            if len(self._heap) >= self.keep and duration <= self._heap[0][0]:
+                return None
+
+        profiler.create_stats()
+        entry = dict(info)
+        entry['id'] = next(self._ids)
+        entry['duration_ms'] = round(duration * 1000, 3)
+        entry['timestamp'] = datetime.now().isoformat(timespec='seconds')
+        entry['stats'] = profiler.stats
+
+        with self._lock:
+            heapq.heappush(self._heap, (duration, entry['id'], entry))
+            self._by_id[entry['id']] = entry
+            while len(self._heap) > self.keep:
+                _, removed_id, _ = heapq.heappop(self._heap)
+                self._by_id.pop(removed_id, None)
+
+        return entry['id']
+
+    def list(self) -> List[Dict]:
+        """Übersicht der gespeicherten Profile, langsamste zuerst"""
+        with self._lock:
+            entries = sorted(self._by_id.values(), key=lambda e: e['duration_ms'], reverse=True)
+        return [{k: v for k, v in entry.items() if k != 'stats'} for entry in entries]
+
+    def get(self, profile_id: int) -> Optional[Dict]:
+        with self._lock:
+            return self._by_id.get(profile_id)
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+            self._by_id.clear()
+
+    @staticmethod
+    def format_stats(entry: Dict, sort_by: str = 'cumulative', limit: int = 40) -> str:
+        """Formatiert ein Profil als pstats-Text"""
+        stream = io.StringIO()
+        stats = pstats.Stats(_StatsSource(entry['stats']), stream=stream)
+        stats.sort_stats(sort_by).print_stats(limit)
+        return stream.getvalue()
+
+    @staticmethod
+    def dump_stats(entry: Dict) -> bytes:
+        """Rohdaten im .prof-Format (lesbar mit pstats.Stats(datei) oder snakeviz)"""
+        return marshal.dumps(entry['stats'])
+
+
+class _StatsSource:
+    """Minimale Quelle für pstats.Stats aus bereits gesammelten Profil-Daten"""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
@@ -0,0 +1,68 @@
+"""
+Produktions-Start der Portfolio-API (ohne Debugger und Reloader)
+
+Linux/macOS: gunicorn mit vorgeforkten Workern. Der Index wird vor dem Fork
+             geladen und von allen Workern geteilt (siehe gunicorn.conf.py).
+Windows:     waitress (mehrere Threads in einem Prozess), da gunicorn dort
+             nicht läuft. Ohne waitress: Werkzeug im Thread-Modus.
+
+Änderungen eines Workers erreichen die anderen über den Generationszähler
+in cache/ (siehe index_snapshot.GenerationCounter).
+
+Verwendung:
+    python serve.py [--bind 0.0.0.0:5000] [--workers 4] [--threads 2]
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+
+api_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def serve_gunicorn(args):
+    """Ersetzt den aktuellen Prozess durch gunicorn"""
+    env = dict(os.environ, API_BIND=args.bind)
+    if args.workers:
+        env['API_WORKERS'] = str(args.workers)
+    if args.threads:
+        env['API_THREADS'] = str(args.threads)
+
+    conf_path = os.path.join(api_dir, 'gunicorn.conf.py')
+    os.chdir(api_dir)
+    os.execve(sys.executable, [sys.executable, '-m', 'gunicorn', '-c', conf_path], env)
+
+
+def serve_threaded(args):
+    """Ein Prozess mit mehreren Threads (waitress, sonst Werkzeug)"""
+    sys.path.insert(0, api_dir)
+    from wsgi import app
+
+    host, _, port = args.bind.rpartition(':')
+    threads = args.threads or 8
+
+    if importlib.util.find_spec('waitress'):
+        from waitress import serve
+        print(f"Starte waitress auf {args.bind} ({threads} Threads)")
+        serve(app, host=host, port=int(port), threads=threads)
+    else:
+        print(f"waitress nicht installiert - starte Werkzeug (threaded) auf {args.bind}")
+        app.run(host=host, port=int(port), threaded=True, debug=False, use_reloader=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Portfolio-API im Produktionsmodus starten")
+    parser.add_argument('--bind', default=os.environ.get('API_BIND', '0.0.0.0:5000'))
+    parser.add_argument('--workers', type=int, default=0, help='Anzahl Worker-Prozesse (nur gunicorn)')
+    parser.add_argument('--threads', type=int, default=0, help='Threads pro Worker')
+    args = parser.parse_args()
+
+    if sys.platform != 'win32' and importlib.util.find_spec('gunicorn'):
+        serve_gunicorn(args)
+    else:
+        serve_threaded(args)
+
+
+if __name__ == '__main__':
+    main()
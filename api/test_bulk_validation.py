@@ -0,0 +1,43 @@
+"""
+Tests der Massenprüfung gegen den lokalen Fake-Shop (kein Internet nötig)
+"""
+
+from bulk_validation import BulkValidator, write_report
+from fake_shop_server import default_exists, start_fake_server
+from validators import check_page
+
+ITEMS = [('D', f'0.0.{i}.{i % 90 + 10}') for i in range(40)] + [('F', str(1010000 + i)) for i in range(40)]
+
+
+def test_check_page_alvaris():
+    """Artikelnummer muss am Anfang eines Ergebnis-Links stehen"""
+    page = '<a class="uk-link-reset" href="/p/1">1010072 Profil</a>'
+    assert check_page('F', '1010072', 200, page)[0]
+    assert not check_page('F', '1010073', 200, page)[0]
+    assert not check_page('D', '0.0.479.76', 200, '<p>0 Treffer</p>')[0]
+
+
+def test_bulk_validation_with_retries_and_resume(tmp_path):
+    """Fehler (503) werden wiederholt, Ergebnisse stimmen, zweiter Lauf setzt fort"""
+    server = start_fake_server(error_rate=0.2)
+    progress_path = str(tmp_path / 'progress.json')
+    try:
+        validator = BulkValidator(concurrency=4, rate=200, timeout=2, retries=6, backoff=0.01,
+                                  base_url=server.base_url, progress_path=progress_path)
+        summary = validator.run_sync(ITEMS)
+
+        assert summary['error'] == 0
+        assert summary['checked'] == len(ITEMS)
+        for result in validator.results():
+            assert (result['status'] == 'ok') == default_exists(result['number'])
+
+        dead = sum(1 for _, number in ITEMS if not default_exists(number))
+        assert write_report(str(tmp_path / 'report.csv'), validator.results()) == dead
+
+        requests_before = server.requests
+        resumed = BulkValidator(base_url=server.base_url, progress_path=progress_path).run_sync(ITEMS)
+        assert resumed['resumed'] == len(ITEMS)
+        assert server.requests == requests_before
+    finally:
+        server.shutdown()
+        server.server_close()
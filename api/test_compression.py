@@ -0,0 +1,102 @@
+"""
+Tests der Antwort-Komprimierung (eigene Flask-App, ohne Portfolio-Daten)
+"""
+
+import gzip
+import os
+import zlib
+
+import pytest
+from flask import Flask, Response
+
+from compression import ResponseCompressor
+
+LARGE_TEXT = 'Syskomp;Item;Bosch\n' * 200
+
+
+@pytest.fixture
+def compressor():
+    return ResponseCompressor(min_size=256)
+
+
+@pytest.fixture
+def client(compressor):
+    app = Flask(__name__)
+    compressor.encodings = ['gzip']  # unabhängig davon, ob brotli installiert ist
+    compressor.init_app(app)
+
+    @app.route('/small')
+    def small():
+        return Response('kurz', mimetype='text/plain')
+
+    @app.route('/large')
+    def large():
+        response = Response(LARGE_TEXT, mimetype='text/plain')
+        response.set_etag('v1')
+        return response
+
+    @app.route('/random')
+    def random_data():
+        return Response(os.urandom(2048), mimetype='application/json')
+
+    @app.route('/stream')
+    def stream():
+        return Response((f"{i};Zeile\n" for i in range(100)), mimetype='text/plain')
+
+    @app.route('/events')
+    def events():
+        return Response((f"data: {i}\n\n" for i in range(100)), mimetype='text/event-stream')
+
+    @app.route('/unbuffered')
+    def unbuffered():
+        return Response(LARGE_TEXT, mimetype='text/plain', headers={'X-Accel-Buffering': 'no'})
+
+    return app.test_client()
+
+
+def get(client, path):
+    return client.get(path, headers={'Accept-Encoding': 'gzip'})
+
+
+def test_small_response_is_not_compressed(client):
+    response = get(client, '/small')
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data(as_text=True) == 'kurz'
+
+
+def test_large_response_is_compressed_with_weak_etag_and_vary(client, compressor):
+    response = get(client, '/large')
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.headers['ETag'] == 'W/"v1"'
+    assert gzip.decompress(response.get_data()).decode('utf-8') == LARGE_TEXT
+    assert compressor.stats()['bytes_in'] == len(LARGE_TEXT)
+
+
+def test_response_without_gain_stays_uncompressed(client):
+    """Wird die Antwort durch Komprimieren nicht kleiner, bleibt sie unverändert"""
+    response = get(client, '/random')
+    assert 'Content-Encoding' not in response.headers
+    assert 'Vary' not in response.headers
+
+
+def test_streamed_response_is_compressed_chunk_by_chunk(client, compressor):
+    response = get(client, '/stream')
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+
+    decoder = zlib.decompressobj(31)
+    text = decoder.decompress(response.get_data()) + decoder.flush()
+    assert text.decode('utf-8') == ''.join(f"{i};Zeile\n" for i in range(100))
+    assert compressor.stats()['streamed'] == 1
+
+
+def test_event_stream_is_not_compressed(client):
+    response = get(client, '/events')
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data(as_text=True).startswith('data: 0\n\n')
+
+
+def test_unbuffered_response_is_not_compressed(client):
+    response = get(client, '/unbuffered')
+    assert 'Content-Encoding' not in response.headers
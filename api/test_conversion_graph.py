@@ -0,0 +1,50 @@
+"""
+Tests des Konvertierungsgraphen gegen den direkten Index-Lookup
+"""
+
+from conversion_graph import NUMBER_COLUMNS, ConversionGraph
+from portfolio_index import build_index, collect_candidates
+
+ROWS = [
+    ['100001', '200001', 'Profil 30x30', '0.0.1.1', '3842500001', '1010001', '2010001', '500001'],
+    ['100002', '200002', 'Profil 40x40', '0.0.1.2|0.0.1.3', '3842500002', '-', '', '500002'],
+    # Gleicher Wert zweimal in einer Zelle, Item-Nummer auch in Zeile 2
+    ['100003', '200003', 'Nutenstein', '0.0.1.3', '3842500003|3842500003', '1010003', '2010003', '500002'],
+    ['100004', '', 'Winkel', '', '3842500001', '1010004|1010005', '2010004', ''],
+]
+
+
+def unique_rows(rows):
+    return list({id(row): row for row in rows}.values())
+
+
+def test_graph_matches_index_lookup():
+    index, _ = build_index(ROWS)
+    graph = ConversionGraph.from_index(index)
+
+    for from_col in NUMBER_COLUMNS:
+        for value, rows in index.get(from_col, {}).items():
+            expected_rows = unique_rows(rows)
+            hits = graph.lookup(value, [from_col])
+            assert [graph.rows[row_id] for _, row_id in hits] == expected_rows
+
+            for to_col in NUMBER_COLUMNS:
+                candidates, _ = collect_candidates(expected_rows, to_col, 200)
+                expected = [candidate['value'] for candidate in candidates]
+
+                results, truncated = graph.convert(value, to_col, from_col, max_results=200)
+                assert not truncated
+                assert [result['value'] for result in results] == expected
+
+                conversion = graph.convert_all(value, [to_col], from_col)
+                assert conversion['targets'][to_col] == expected
+                assert conversion['found_in'] == [from_col]
+
+
+def test_convert_all_searches_every_column():
+    graph = ConversionGraph.from_index(build_index(ROWS)[0])
+
+    conversion = graph.convert_all('0.0.1.3', ['A', 'H'])
+    assert conversion['found_in'] == ['D']
+    assert conversion['syskomp_neu'] == ['100002', '100003']
+    assert conversion['targets'] == {'A': ['100002', '100003'], 'H': ['500002']}
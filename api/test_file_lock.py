@@ -0,0 +1,120 @@
+"""
+Tests der prozessübergreifenden Sperre (fcntl und Lock-Datei-Variante für Windows)
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+import file_lock
+from file_lock import InterProcessLock
+
+
+@pytest.fixture(params=['fcntl', 'lockfile'])
+def lock_path(request, monkeypatch, tmp_path):
+    """Pfad einer Lock-Datei; 'lockfile' simuliert Windows (ohne fcntl)"""
+    if request.param == 'lockfile':
+        monkeypatch.setattr(file_lock, 'fcntl', None)
+    elif file_lock.fcntl is None:
+        pytest.skip('fcntl nicht verfügbar')
+    return str(tmp_path / 'portfolio.csv.lock')
+
+
+@pytest.fixture
+def lockfile_path(monkeypatch, tmp_path):
+    monkeypatch.setattr(file_lock, 'fcntl', None)
+    return str(tmp_path / 'portfolio.csv.lock')
+
+
+def test_writer_is_exclusive(lock_path):
+    """Während ein Schreiber die Sperre hält, bekommt niemand sonst sie"""
+    writer = InterProcessLock(lock_path)
+    other = InterProcessLock(lock_path)
+
+    assert writer.acquire(timeout=1)
+    assert not other.acquire(timeout=0.2)
+    assert not other.acquire(timeout=0.2, shared=True)
+    writer.release()
+
+    assert other.acquire(timeout=1, shared=True)
+    other.release()
+    assert other.get_stats()['write']['timeouts'] == 1
+
+
+def test_readers_share_the_lock(lock_path):
+    """Leser laufen parallel, ein Schreiber wartet bis alle fertig sind"""
+    readers = [InterProcessLock(lock_path) for _ in range(2)]
+    writer = InterProcessLock(lock_path)
+
+    for reader in readers:
+        assert reader.acquire(timeout=1, shared=True)
+    assert not writer.acquire(timeout=0.2)
+
+    for reader in readers:
+        reader.release()
+    assert writer.acquire(timeout=1)
+    writer.release()
+
+
+def test_lock_of_dead_process_is_broken(lockfile_path):
+    """Lock-Datei eines beendeten Prozesses auf diesem Rechner wird aufgebrochen"""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    with open(lockfile_path, 'w', encoding='utf-8') as f:
+        f.write(f"{process.pid};{socket.gethostname()};2024-01-01T00:00:00")
+
+    lock = InterProcessLock(lockfile_path)
+    assert lock.acquire(timeout=1)
+    assert lock.owner()['pid'] == os.getpid()
+    lock.release()
+
+
+def test_lock_without_heartbeat_is_broken(lockfile_path):
+    """Lock-Datei eines anderen Rechners ohne Heartbeat gilt nach stale_after als verwaist"""
+    with open(lockfile_path, 'w', encoding='utf-8') as f:
+        f.write("4242;anderer-rechner;2024-01-01T00:00:00")
+    old = time.time() - 10
+    os.utime(lockfile_path, (old, old))
+
+    lock = InterProcessLock(lockfile_path, stale_after=5)
+    assert lock.acquire(timeout=1)
+    lock.release()
+
+
+def test_slow_holder_keeps_lock_via_heartbeat(lockfile_path):
+    """Eine Sperre, die länger als stale_after gehalten wird, bleibt dank Heartbeat bestehen"""
+    holder = InterProcessLock(lockfile_path, stale_after=0.3, poll_interval=0.02)
+    other = InterProcessLock(lockfile_path, stale_after=0.3, poll_interval=0.02)
+
+    assert holder.acquire(timeout=1)
+    time.sleep(0.8)
+    assert not other.acquire(timeout=0.5)
+    holder.release()
+    assert other.acquire(timeout=1)
+    other.release()
+
+
+def test_fresh_lock_created_after_check_is_not_broken(lockfile_path, monkeypatch):
+    """Ein anderer Prozess bricht die verwaiste Sperre zuerst auf und legt eine neue an"""
+    with open(lockfile_path, 'w', encoding='utf-8') as f:
+        f.write("4242;anderer-rechner;2024-01-01T00:00:00")
+    old = time.time() - 10
+    os.utime(lockfile_path, (old, old))
+
+    lock = InterProcessLock(lockfile_path, stale_after=5)
+    is_stale = lock._is_stale
+
+    def replaced_after_check(seen):
+        stale = is_stale(seen)
+        with open(lockfile_path, 'w', encoding='utf-8') as f:
+            f.write("4343;dritter-rechner;2024-01-01T00:00:01")
+        return stale
+
+    monkeypatch.setattr(lock, '_is_stale', replaced_after_check)
+    assert lock._writer_active()
+    assert lock.owner()['pid'] == 4343
+    assert [name for name in os.listdir(os.path.dirname(lockfile_path)) if name.endswith('.stale')] == []
@@ -0,0 +1,72 @@
+"""
+Tests des Index-Snapshots (temporäre CSV, kein Zugriff auf die echte Portfolio-Datei)
+"""
+
+import os
+
+from index_snapshot import GenerationCounter, IndexSnapshot, file_state
+from portfolio_index import read_index
+
+HEADER = 'Syskomp neu;Syskomp alt;Beschreibung;Item;Bosch;Alvaris Artnr;Alvaris Matnr;ASK\n'
+
+
+def write_csv(path, rows):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(HEADER)
+        for row in rows:
+            f.write(';'.join(row) + '\n')
+
+
+def test_snapshot_round_trip(tmp_path):
+    """Unveränderte CSV: Snapshot wird geladen"""
+    csv_path = str(tmp_path / 'portfolio.csv')
+    write_csv(csv_path, [['100001', '200001', 'Profil', '0.0.1.1', '', '', '', '']])
+    snapshot = IndexSnapshot(csv_path)
+
+    state = file_state(csv_path)
+    index, row_count = read_index(csv_path)
+    assert snapshot.save(index, row_count, state)
+
+    loaded = snapshot.load()
+    assert loaded is not None
+    assert loaded['row_count'] == 1
+    assert loaded['index'] == index
+
+
+def test_snapshot_rejected_if_csv_changed_during_parse(tmp_path):
+    """Wird die CSV zwischen Parsen und Speichern geschrieben, gilt der Snapshot nicht"""
+    csv_path = str(tmp_path / 'portfolio.csv')
+    write_csv(csv_path, [['100001', '200001', 'Profil', '0.0.1.1', '', '', '', '']])
+    snapshot = IndexSnapshot(csv_path)
+
+    state = file_state(csv_path)
+    index, row_count = read_index(csv_path)
+
+    # Anderer Prozess schreibt die CSV (gleiche Größe, mtime und Inhalt neu)
+    write_csv(csv_path, [['100002', '200001', 'Profil', '0.0.1.1', '', '', '', '']])
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, state['mtime_ns'] + 1_000_000_000))
+    assert os.path.getsize(csv_path) == state['size']
+
+    snapshot.save(index, row_count, state)
+    assert snapshot.load() is None
+
+
+def test_generation_token_changes_on_concurrent_bumps(tmp_path):
+    """Zwei Schreiber vergeben dieselbe Nummer - das Token unterscheidet die Änderungen trotzdem"""
+    counter = GenerationCounter(str(tmp_path / 'portfolio.csv'))
+    assert counter.read() == (0, '')
+
+    # Beide Schreiber lesen vor dem Schreiben noch Generation 0
+    first = GenerationCounter(counter.counter_path, counter_path=counter.counter_path)
+    second = GenerationCounter(counter.counter_path, counter_path=counter.counter_path)
+    first.read = second.read = lambda: (0, '')
+
+    generation, token = first.bump()
+    assert counter.read() == (1, token)
+
+    # Worker hat bei (1, token) neu geladen, danach schreibt der zweite Schreiber
+    generation2, token2 = second.bump()
+    assert generation2 == generation
+    assert token2 != token
+    assert counter.read()[1] == token2
@@ -0,0 +1,179 @@
+"""
+Tests der Hintergrund-Jobs (Job-Verzeichnis in einem temporären Ordner)
+"""
+
+import os
+import socket
+import threading
+import time
+
+import jobs
+from jobs import JobManager
+
+
+def make_manager(store_dir):
+    manager = JobManager(str(store_dir), workers=2)
+    blocker = threading.Event()
+
+    def double(params, ctx):
+        partial = []
+        for i, value in enumerate(params['values']):
+            partial.append(value * 2)
+            ctx.update(i + 1, len(params['values']), partial)
+        return {'results': partial}
+
+    def wait(params, ctx):
+        while not blocker.is_set():
+            ctx.update(0, 1)
+            time.sleep(0.01)
+        return {}
+
+    manager.register('double', double)
+    manager.register('wait', wait)
+    return manager, blocker
+
+
+def wait_for(manager, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job['status'] in jobs.FINISHED_STATES:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} nicht fertig: {manager.get(job_id)}")
+
+
+def test_submit_runs_job_and_stores_result(tmp_path):
+    manager, _ = make_manager(tmp_path)
+    job = manager.submit('double', {'values': [1, 2, 3]})
+    assert job['status'] == 'queued'
+    assert 'pid' not in job and 'process' not in job
+
+    done = wait_for(manager, job['id'])
+    assert done['status'] == 'done'
+    assert done['progress'] == 100.0
+    with open(manager.result_path(job['id']), 'r', encoding='utf-8') as f:
+        assert f.read() == '{"results":[2,4,6]}'
+
+
+def test_cancel_running_job(tmp_path):
+    manager, blocker = make_manager(tmp_path)
+    job = manager.submit('wait', {})
+    assert manager.cancel(job['id'])
+    assert wait_for(manager, job['id'])['status'] == 'cancelled'
+    assert not manager.cancel(job['id'])
+    blocker.set()
+
+
+def test_events_stream_partial_results_until_done(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, 'PERSIST_INTERVAL', 0)
+    monkeypatch.setattr(jobs, 'EVENT_POLL_INTERVAL', 0.01)
+    manager, _ = make_manager(tmp_path)
+    job = manager.submit('double', {'values': [1, 2, 3]})
+
+    events = list(manager.events(job['id']))
+    items = [item for event, payload in events if event == 'partial' for item in payload['items']]
+    assert items == [2, 4, 6]
+    assert events[-1][0] == 'done'
+
+    # Wiederaufnahme ab Offset: nichts doppelt
+    last_offset = [payload['offset'] for event, payload in events if event == 'partial'][-1]
+    resumed = list(manager.events(job['id'], offset=last_offset))
+    assert [event for event, _ in resumed if event == 'partial'] == []
+
+
+def write_running_job(manager, job_id, process, kind='double'):
+    os.makedirs(manager.store_dir, exist_ok=True)
+    manager.save_state({
+        'id': job_id, 'kind': kind, 'params': {'values': [5]}, 'status': 'running',
+        'progress': 50.0, 'processed': 0, 'total': 1, 'error': None,
+        'created_at': '2024-01-01T00:00:00', 'started_at': '2024-01-01T00:00:00',
+        'finished_at': None, 'finished_ts': None, 'started_ts': None,
+        'rate_per_s': None, 'eta_seconds': None,
+        'pid': os.getpid(), 'process': process, 'host': socket.gethostname(),
+    })
+
+
+def test_recover_requeues_job_of_restarted_process_with_same_pid(tmp_path):
+    """Gleiche PID, aber anderer Prozess (Neustart) - Job wird erneut ausgeführt"""
+    manager, _ = make_manager(tmp_path)
+    write_running_job(manager, 'a' * 32, process='vor-dem-neustart')
+
+    manager.list()  # startet den Manager -> recover()
+    assert wait_for(manager, 'a' * 32)['status'] == 'done'
+
+
+def test_recover_keeps_job_of_live_process(tmp_path):
+    manager, _ = make_manager(tmp_path)
+    write_running_job(manager, 'b' * 32, process=jobs.process_identity(os.getpid()))
+
+    manager.list()
+    time.sleep(0.1)
+    assert manager.get('b' * 32)['status'] == 'running'
+    assert 'b' * 32 not in manager.jobs
+
+
+
+def test_recover_in_two_workers_runs_job_once(tmp_path):
+    """Worker B hat den verwaisten Job gelesen, bevor A ihn übernommen und den Claim freigegeben hat"""
+    first, blocker = make_manager(tmp_path)
+    second, _ = make_manager(tmp_path)
+    runs = []
+
+    def count(params, ctx):
+        runs.append(ctx.manager)
+        while not blocker.is_set():
+            ctx.update(0, 1)
+            time.sleep(0.01)
+        return {}
+
+    first.register('count', count)
+    second.register('count', count)
+    write_running_job(first, 'c' * 32, process='vor-dem-neustart', kind='count')
+    orphaned = first._read_state('c' * 32)
+
+    first.list()  # A übernimmt den Job, speichert sich als Besitzer und entfernt den Claim
+    assert not os.path.exists(first._path('c' * 32, '.claim'))
+
+    # B sieht beim ersten Lesen noch den alten Stand
+    read_state = second._read_state
+    reads = []
+
+    def stale_first_read(job_id):
+        reads.append(job_id)
+        return orphaned if len(reads) == 1 else read_state(job_id)
+
+    second._read_state = stale_first_read
+    try:
+        second.list()
+        assert len(reads) >= 2
+        assert 'c' * 32 not in second.jobs
+    finally:
+        blocker.set()
+    assert wait_for(first, 'c' * 32)['status'] == 'done'
+    assert runs == [first]
+
+
+def test_recover_breaks_stale_claim(tmp_path):
+    """Claim eines beim Übernehmen abgestürzten Workers blockiert den Job nicht dauerhaft"""
+    manager, _ = make_manager(tmp_path)
+    write_running_job(manager, 'd' * 32, process='vor-dem-neustart')
+    claim_path = manager._path('d' * 32, '.claim')
+    open(claim_path, 'w').close()
+    old = time.time() - jobs.CLAIM_STALE_AFTER - 1
+    os.utime(claim_path, (old, old))
+
+    manager.list()
+    assert wait_for(manager, 'd' * 32)['status'] == 'done'
+    assert not os.path.exists(claim_path)
+
+
+def test_recover_respects_fresh_claim(tmp_path):
+    """Ein frischer Claim gehört einem Worker, der den Job gerade übernimmt"""
+    manager, _ = make_manager(tmp_path)
+    write_running_job(manager, 'e' * 32, process='vor-dem-neustart')
+    open(manager._path('e' * 32, '.claim'), 'w').close()
+
+    manager.list()
+    assert 'e' * 32 not in manager.jobs
+    assert manager.get('e' * 32)['status'] == 'running'
@@ -0,0 +1,58 @@
+"""
+Tests des orjson-Providers gegen den Standard-Provider von Flask
+"""
+
+import decimal
+import json
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from flask import Flask, jsonify
+
+from json_provider import CompactJSONProvider, OrjsonProvider, orjson
+
+pytestmark = pytest.mark.skipif(orjson is None, reason='orjson nicht installiert')
+
+VALUE = {
+    'zeit': datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc),
+    'tag': date(2024, 5, 1),
+    'preis': decimal.Decimal('1.50'),
+    'id': uuid.UUID('12345678123456781234567812345678'),
+    'nummern': ['100001', 200001],
+    'ä': None,
+}
+
+
+def make_app(provider_class):
+    app = Flask(__name__)
+    app.json = provider_class(app)
+    return app
+
+
+def body(provider_class, *args, **kwargs):
+    app = make_app(provider_class)
+    with app.app_context():
+        return jsonify(*args, **kwargs).get_data()
+
+
+@pytest.mark.parametrize('args, kwargs', [
+    ((VALUE,), {}),
+    ((1, 'zwei'), {}),
+    ((), {'a': 1, 'zeit': datetime(2024, 1, 2, 3, 4, 5)}),
+    ((), {}),
+])
+def test_same_result_as_default_provider(args, kwargs):
+    """Gleiche Werte (orjson schreibt Umlaute als UTF-8 statt \\u-Escapes)"""
+    assert json.loads(body(OrjsonProvider, *args, **kwargs)) == json.loads(body(CompactJSONProvider, *args, **kwargs))
+
+
+def test_datetime_is_http_date():
+    app = make_app(OrjsonProvider)
+    assert app.json.dumps({'zeit': VALUE['zeit']}) == '{"zeit":"Wed, 01 May 2024 12:30:00 GMT"}'
+
+
+def test_args_and_kwargs_together_are_rejected():
+    app = make_app(OrjsonProvider)
+    with app.app_context(), pytest.raises(TypeError):
+        app.json.response(1, a=2)
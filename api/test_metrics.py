@@ -0,0 +1,109 @@
+"""
+Tests der Metriken (Prometheus-Textformat, Zusammenfassung mehrerer Worker)
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from metrics import MetricsRegistry
+
+
+def make_registry():
+    registry = MetricsRegistry()
+    requests = registry.counter('api_requests_total', 'Anzahl Requests', ['endpoint', 'status'])
+    latency = registry.histogram('api_request_duration_seconds', 'Antwortzeit', ['endpoint'], buckets=(0.1, 1.0))
+    loaded = registry.gauge('index_load_seconds', 'Dauer des letzten Index-Ladevorgangs', ['source'])
+    return registry, requests, latency, loaded
+
+
+def test_counter_and_label_escaping():
+    registry, requests, _, _ = make_registry()
+    requests.inc('search', '200')
+    requests.inc('search', '200', amount=2)
+    requests.inc('pfad "a\\b"\nneu', '500')
+
+    lines = registry.render().splitlines()
+    assert '# TYPE api_requests_total counter' in lines
+    assert 'api_requests_total{endpoint="search",status="200"} 3' in lines
+    assert 'api_requests_total{endpoint="pfad \\"a\\\\b\\"\\nneu",status="500"} 1' in lines
+
+
+def test_histogram_buckets_are_cumulative():
+    registry, _, latency, _ = make_registry()
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe('search', value=value)
+
+    lines = registry.render().splitlines()
+    assert 'api_request_duration_seconds_bucket{endpoint="search",le="0.1"} 2' in lines
+    assert 'api_request_duration_seconds_bucket{endpoint="search",le="1.0"} 3' in lines
+    assert 'api_request_duration_seconds_bucket{endpoint="search",le="+Inf"} 4' in lines
+    assert 'api_request_duration_seconds_sum{endpoint="search"} 3.65' in lines
+    assert 'api_request_duration_seconds_count{endpoint="search"} 4' in lines
+
+
+def test_collector_values_are_rendered():
+    registry, _, _, _ = make_registry()
+    registry.register_collector(lambda: [('index_rows', 'gauge', 'Zeilen', [({}, 42)])])
+    assert 'index_rows 42' in registry.render().splitlines()
+
+
+def start_worker(path):
+    """Registry eines Workers mit Dateien in `path` (ohne Hintergrund-Flush während des Tests)"""
+    registry, requests, latency, loaded = make_registry()
+    registry.flush_interval = 3600
+    registry.set_multiprocess_dir(str(path))
+    return registry, requests, latency, loaded
+
+
+def test_workers_are_aggregated(tmp_path):
+    """Counter und Histogramme aller Worker werden summiert, Gauges je Worker ausgegeben"""
+    first, first_requests, first_latency, first_loaded = start_worker(tmp_path)
+    second, second_requests, second_latency, _ = start_worker(tmp_path)
+    first_requests.inc('search', '200', amount=2)
+    first_latency.observe('search', value=0.05)
+    first_loaded.set('csv', value=1.5)
+    second_requests.inc('search', '200', amount=3)
+    second_latency.observe('search', value=0.5)
+    second.flush()
+
+    lines = first.render().splitlines()
+    assert 'api_requests_total{endpoint="search",status="200"} 5' in lines
+    assert 'api_request_duration_seconds_bucket{endpoint="search",le="0.1"} 1' in lines
+    assert 'api_request_duration_seconds_count{endpoint="search"} 2' in lines
+    assert f'index_load_seconds{{worker="{os.getpid()}",source="csv"}} 1.5' in lines
+
+    # Der andere Worker liefert dieselben Summen
+    assert 'api_requests_total{endpoint="search",status="200"} 5' in second.render().splitlines()
+
+
+def test_finished_worker_keeps_counters_but_not_gauges(tmp_path):
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    with open(tmp_path / f'{process.pid}.beendet.json', 'w', encoding='utf-8') as f:
+        json.dump({
+            'pid': process.pid, 'process': 'vor-dem-neustart',
+            'metrics': {'api_requests_total': [[['search', '200'], 4]],
+                        'index_load_seconds': [[['csv'], 9.0]]},
+            'collected': [['index_rows', 'gauge', 'Zeilen', [[{}, 42]]]],
+        }, f)
+
+    registry, requests, _, _ = start_worker(tmp_path)
+    requests.inc('search', '200')
+
+    output = registry.render()
+    assert 'api_requests_total{endpoint="search",status="200"} 5' in output.splitlines()
+    assert '9.0' not in output
+    assert 'index_rows' not in output
+
+
+def test_child_starts_at_zero_after_fork(tmp_path):
+    """Werte des Elternprozesses stehen in dessen Datei und zählen im Kind nicht doppelt"""
+    registry, requests, _, loaded = start_worker(tmp_path)
+    requests.inc('search', '200')
+    loaded.set('csv', value=1.5)
+
+    registry._after_fork()
+    assert requests.get('search', '200') == 0
+    assert loaded.snapshot() == [(('csv',), 1.5)]
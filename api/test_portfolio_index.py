@@ -0,0 +1,119 @@
+"""
+Tests des gemeinsamen Portfolio-Index (kleine CSV im temporären Ordner)
+"""
+
+import pytest
+
+from portfolio_index import PortfolioIndex, build_index, collect_candidates, read_index, split_values
+
+CSV = """Syskomp neu;Syskomp alt;Beschreibung;Item;Bosch;Alvaris Artnr;Alvaris Matnr;ASK
+100001;200001;Profil 30x30;0.0.1.1;3842500001;1010001;2010001;500001
+100002;200002;Profil 40x40;0.0.1.2|0.0.1.3;3842500002;;;500002
+100003;200003;Nutenstein;0.0.1.3;3842500003|3842500003;1010003;2010003;500002
+100004;;Winkel;None;3842500001;1010004|1010005;2010004
+"""
+
+
+@pytest.fixture
+def fixture_path(tmp_path):
+    path = str(tmp_path / 'Portfolio_Syskomp_pA.csv')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(CSV)
+    return path
+
+
+def syskomp(rows):
+    return [row['A'] for row in rows]
+
+
+def test_split_values():
+    assert split_values('') == []
+    assert split_values('0.0.1.1') == ['0.0.1.1']
+    assert split_values(' 0.0.1.2 | 0.0.1.3 |') == ['0.0.1.2', '0.0.1.3']
+    assert split_values('3842500003|3842500003') == ['3842500003']
+    assert split_values('-') == []
+    assert split_values('1010004 | - |1010005') == ['1010004', '1010005']
+
+
+def test_build_index_keeps_all_rows_and_splits_pipes(fixture_path):
+    index, row_count = read_index(fixture_path)
+
+    assert row_count == 4
+    assert 'C' not in index
+    # Gleiche Nummer in mehreren Zeilen: alle Zeilen, in Dateireihenfolge
+    assert syskomp(index['D']['0.0.1.3']) == ['100002', '100003']
+    assert syskomp(index['E']['3842500001']) == ['100001', '100004']
+    # Doppelter Wert in einer Zelle zählt die Zeile nur einmal
+    assert syskomp(index['E']['3842500003']) == ['100003']
+    # Spalte G (Alvaris Matnr) wird indiziert, 'None' und kurze Zeilen ergeben leere Zellen
+    assert syskomp(index['G']['2010004']) == ['100004']
+    assert 'None' not in index['D']
+    assert index['H']['500002'][1]['H'] == '500002'
+    assert index['A']['100004'][0]['H'] == ''
+
+
+def test_build_index_reports_progress(monkeypatch):
+    import portfolio_index
+    monkeypatch.setattr(portfolio_index, 'PROGRESS_EVERY', 2)
+    seen = []
+    rows = [[str(i), '', '', '', '', '', '', ''] for i in range(5)]
+    assert build_index(rows, seen.append)[1] == 5
+    assert seen == [2, 4]
+
+
+def test_lookup_find_and_batch_convert(fixture_path):
+    portfolio = PortfolioIndex(*read_index(fixture_path))
+    assert portfolio
+
+    assert syskomp(portfolio.lookup('D', ' 0.0.1.3 ')) == ['100002', '100003']
+    assert portfolio.lookup('D', 'fehlt') == []
+    assert portfolio.lookup('X', '0.0.1.3') == []
+
+    # Erste Spalte in der Reihenfolge A, B, D-H; G wird mit durchsucht
+    assert portfolio.find('2010003') == ('G', portfolio.lookup('G', '2010003'))
+    assert portfolio.find('fehlt') == (None, [])
+
+    rows, values = portfolio.convert('D', '0.0.1.3', 'H')
+    assert syskomp(rows) == ['100002', '100003']
+    assert values == ['500002']
+
+    results = portfolio.batch_convert(['0.0.1.3', '2010004', 'fehlt'], 'A')
+    assert [(r['value'], r['column'], r['results']) for r in results] == [
+        ('0.0.1.3', 'D', ['100002', '100003']),
+        ('2010004', 'G', ['100004']),
+        ('fehlt', None, []),
+    ]
+
+
+def test_result_text(fixture_path):
+    portfolio = PortfolioIndex(*read_index(fixture_path))
+
+    assert portfolio.result_text(portfolio.lookup('D', '0.0.1.3'), 'A') == '100002, 100003'
+    assert portfolio.result_text(portfolio.lookup('E', '3842500001'), 'B') == '200001'
+    assert portfolio.result_text(portfolio.lookup('A', '100002'), 'H') == '500002'
+    # Alvaris: Artnr / Matnr je Zeile, fehlende Werte als '-'
+    assert portfolio.result_text(portfolio.lookup('D', '0.0.1.3'), 'F') == '- / -, 1010003 / 2010003'
+    assert portfolio.result_text(portfolio.lookup('A', '100004'), 'G') == '1010004|1010005 / 2010004'
+    assert portfolio.result_text([], 'A') == '-'
+
+
+def test_collect_candidates_merges_duplicates(fixture_path):
+    index, _ = read_index(fixture_path)
+    candidates, truncated = collect_candidates(index['H']['500002'], 'D', 10)
+    assert not truncated
+    assert candidates == [
+        {'value': '0.0.1.2', 'syskomp_neu': ['100002']},
+        {'value': '0.0.1.3', 'syskomp_neu': ['100002', '100003']},
+    ]
+
+    candidates, truncated = collect_candidates(index['H']['500002'], 'D', 1)
+    assert truncated and len(candidates) == 1
+
+
+def test_load_uses_snapshot_on_second_start(fixture_path):
+    path = fixture_path
+    first = PortfolioIndex.load(path)
+    second = PortfolioIndex.load(path)
+    assert first.source == 'csv'
+    assert second.source == 'snapshot'
+    assert second.index == first.index and second.row_count == 4
@@ -0,0 +1,118 @@
+"""
+Tests des Request-Profilings (Stichprobe, paralleler Profiler, Exceptions)
+"""
+
+import pytest
+
+import profiling
+from profiling import ProfileStore
+
+
+class BusyProfile:
+    """cProfile.Profile wie ab Python 3.12, wenn bereits ein anderer Profiler aktiv ist"""
+
+    def enable(self):
+        raise ValueError("Another profiling tool is already active")
+
+
+class RecordingProfile:
+    def __init__(self):
+        self.enabled = False
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+
+def test_start_skips_profiling_if_another_profiler_is_active(monkeypatch):
+    monkeypatch.setattr(profiling.cProfile, 'Profile', BusyProfile)
+    assert ProfileStore().start() is None
+
+
+def test_profile_is_stored_for_slow_request():
+    store = ProfileStore(keep=1)
+    profiler = store.start()
+    sum(range(1000))
+    profile_id = store.finish(profiler, 0.5, {'endpoint': 'test'})
+
+    assert store.list()[0]['id'] == profile_id
+    assert 'sum' in store.format_stats(store.get(profile_id))
+
+
+@pytest.fixture
+def client(api_app, monkeypatch):
+    application = api_app.create_app(preload='lazy')
+    application.testing = True
+
+    def boom():
+        raise RuntimeError('boom')
+
+    application.add_url_rule('/boom', 'boom', boom)
+    application.add_url_rule('/ok', 'ok', lambda: 'ok')
+    monkeypatch.setattr(api_app.profile_store, 'sample_rate', 1.0)
+    return application.test_client()
+
+
+def test_profiler_disabled_when_request_raises(api_app, client, monkeypatch):
+    """Im Test-/Debug-Modus läuft after_request nicht - teardown beendet den Profiler trotzdem"""
+    monkeypatch.setattr(profiling.cProfile, 'Profile', RecordingProfile)
+    started = []
+    original_start = api_app.profile_store.start
+
+    def start():
+        started.append(original_start())
+        return started[-1]
+
+    monkeypatch.setattr(api_app.profile_store, 'start', start)
+
+    with pytest.raises(RuntimeError):
+        client.get('/boom')
+
+    assert len(started) == 1
+    assert not started[0].enabled
+
+
+def test_request_without_free_profiler_succeeds(client, monkeypatch):
+    monkeypatch.setattr(profiling.cProfile, 'Profile', BusyProfile)
+    response = client.get('/ok')
+    assert response.status_code == 200
+    assert 'X-Profile-Id' not in response.headers
+
+
+@pytest.fixture
+def admin_headers(api_app, monkeypatch):
+    monkeypatch.setattr(api_app, 'ADMIN_TOKEN', 'geheim')
+    return {'X-Admin-Token': 'geheim'}
+
+
+def test_profile_config_rejects_invalid_input(api_app, client, admin_headers, monkeypatch):
+    monkeypatch.setattr(api_app.profile_store, 'keep', 20)
+    for body in ({'sample_rate': 'viel'}, {'keep': None}, {'sample_rate': 0.5, 'keep': 'x'}, [1, 2]):
+        response = client.post('/api/profiles/config', json=body, headers=admin_headers)
+        assert response.status_code == 400
+        assert 'error' in response.get_json()
+
+    response = client.post('/api/profiles/config', data='{kein json', headers=admin_headers,
+                           content_type='application/json')
+    assert response.status_code == 400
+
+    # Nichts übernommen, auch nicht der gültige Teil
+    assert api_app.profile_store.sample_rate == 1.0
+    assert api_app.profile_store.keep == 20
+
+    response = client.post('/api/profiles/config', json={'sample_rate': 0.25, 'keep': 5}, headers=admin_headers)
+    assert response.status_code == 200
+    assert response.get_json()['keep'] == 5
+
+
+def test_profile_view_rejects_invalid_limit_and_sort(api_app, client, admin_headers, monkeypatch):
+    monkeypatch.setattr(api_app, 'profile_store', ProfileStore(keep=1))
+    profiler = api_app.profile_store.start()
+    profile_id = api_app.profile_store.finish(profiler, 0.5, {'endpoint': 'test'})
+
+    assert client.get(f'/api/profiles/{profile_id}?limit=viele', headers=admin_headers).status_code == 400
+    assert client.get(f'/api/profiles/{profile_id}?limit=0', headers=admin_headers).status_code == 400
+    assert client.get(f'/api/profiles/{profile_id}?sort=zufall', headers=admin_headers).status_code == 400
+    assert client.get(f'/api/profiles/{profile_id}?limit=5&sort=tottime', headers=admin_headers).status_code == 200
@@ -3,7 +3,6 @@ Validierungsfunktionen für Artikelnummern
 """
 
 import re
-import requests
 from typing import Tuple
 
 def validate_item(number: str) -> Tuple[bool, str]:
@@ -221,11 +220,47 @@ def validate_generic(number: str, col: str) -> Tuple[bool, str]:
     return True, f"OK ({len(values)} Werte)"
 
 
+# Links in den Alvaris-Suchergebnissen: <a class="uk-link-reset" href="...">Artikelnummer ...</a>
+ALVARIS_RESULT_LINK = re.compile(r'<a class="uk-link-reset" href="[^"]*">([^<]*)</a>')
+
+
+def check_page(col: str, number: str, status_code: int, text: str) -> Tuple[bool, str]:
+    """
+    Wertet die geladene Suchseite aus (ohne Netzwerkzugriff)
+
+    Wird von validate_url_exists und der Massenprüfung (bulk_validation) genutzt.
+    """
+    if status_code != 200:
+        if status_code == 404:
+            return False, "Seite nicht gefunden (404)"
+        return False, f"Fehler beim Laden (Status: {status_code})"
+
+    # Für Item (Spalte D): Prüfe auf "0 Treffer" in der Antwort
+    if col == 'D':
+        if "0 Treffer" in text:
+            return False, "Artikel nicht gefunden (0 Treffer)"
+        return True, "Artikel gefunden"
+
+    # Für Alvaris (Spalte F/G): Prüfe ob ein Ergebnis-Link mit der Artikelnummer beginnt
+    # (ein vorkompiliertes Muster für alle Nummern statt eines Musters je Nummer)
+    if col in ['F', 'G'] and number:
+        for link_text in ALVARIS_RESULT_LINK.findall(text):
+            if link_text.startswith(number):
+                return True, f"Artikel gefunden (Artikelnummer {number} in Suchergebnissen)"
+        return False, f"Artikel nicht gefunden (Artikelnummer {number} nicht in Suchergebnissen)"
+
+    # Für andere Spalten: Einfacher Erreichbarkeits-Check
+    return True, "URL erreichbar"
+
+
 def validate_url_exists(url: str, col: str = None, number: str = None, timeout: int = 10) -> Tuple[bool, str]:
     """
     Prüft ob URL erreichbar ist und Artikel gefunden wurde
     Hinweis: Für ASK wird keine URL-Validierung durchgeführt (nur Format)
     """
+    # requests erst bei Bedarf importieren (spart Startzeit der API)
+    import requests
+
     try:
         # Für ASK und Bosch: Keine URL-Validierung (nur Format-Check)
         # ASK: CSRF-Schutz blockiert automatisierte Anfragen
@@ -235,31 +270,7 @@ def validate_url_exists(url: str, col: str = None, number: str = None, timeout:
 
         # Für andere Spalten: Vollständige GET-Anfrage um Seiteninhalt zu prüfen
         response = requests.get(url, timeout=timeout, allow_redirects=True)
-
-        if response.status_code != 200:
-            if response.status_code == 404:
-                return False, "Seite nicht gefunden (404)"
-            else:
-                return False, f"Fehler beim Laden (Status: {response.status_code})"
-
-        # Für Item (Spalte D): Prüfe auf "0 Treffer" in der Antwort
-        if col == 'D':
-            if "0 Treffer" in response.text:
-                return False, "Artikel nicht gefunden (0 Treffer)"
-            else:
-                return True, "Artikel gefunden"
-
-        # Für Alvaris (Spalte F/G): Prüfe ob Artikelnummer in uk-link-reset Link erscheint
-        if col in ['F', 'G'] and number:
-            # Suche nach Link mit class="uk-link-reset" der mit der Artikelnummer beginnt
-            pattern = rf'<a class="uk-link-reset" href="[^"]*">{re.escape(number)}[^<]*</a>'
-            if re.search(pattern, response.text):
-                return True, f"Artikel gefunden (Artikelnummer {number} in Suchergebnissen)"
-            else:
-                return False, f"Artikel nicht gefunden (Artikelnummer {number} nicht in Suchergebnissen)"
-
-        # Für andere Spalten: Einfacher Erreichbarkeits-Check
-        return True, "URL erreichbar"
+        return check_page(col, number, response.status_code, response.text)
 
     except requests.exceptions.Timeout:
         return False, "Timeout beim Laden der URL"
@@ -0,0 +1,22 @@
+"""
+WSGI-Einstiegspunkt für den Produktionsbetrieb (gunicorn, waitress)
+
+Der Index wird beim Import geladen. Mit gunicorn --preload (siehe
+gunicorn.conf.py) passiert das einmal im Master-Prozess, die Worker erben
+den fertigen Index per fork und teilen ihn Copy-on-Write.
+
+/api/metrics fasst die Werte aller Worker über Dateien in cache/metrics
+zusammen; die Dateien des vorherigen Laufs werden hier (einmal vor dem
+Fork) verworfen.
+"""
+
+import gc
+
+from app import create_app, metrics, metrics_dir
+
+app = create_app(preload='eager')
+metrics.set_multiprocess_dir(metrics_dir, clear=True)
+
+# Geladene Objekte aus der zyklischen GC nehmen: sonst schreibt die GC in den
+# Workern in jede Seite des Index und hebt das Copy-on-Write-Sharing auf
+gc.freeze()
@@ -0,0 +1,10 @@
+"""
+Benchmarks für die Portfolio-API
+
+    python -m benchmarks.bench_api --rows 10000        # API-Hot-Paths, Ergebnis als JSON
+    python -m benchmarks.compare alt.json neu.json     # Zwei Läufe vergleichen
+    python -m benchmarks.bench_json                    # JSON-Provider (json vs. orjson)
+    python -m benchmarks.bench_xlsx_load               # Excel-Laden der Desktop-Conversion
+    python benchmarks/bench_startup.py                 # Startzeit mit/ohne Index-Snapshot
+    python benchmarks/bench_coldstart.py               # Import-Zeit (python -X importtime)
+"""
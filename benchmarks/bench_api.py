@@ -0,0 +1,272 @@
+"""
+Reproduzierbarer Benchmark der API-Hot-Paths über den Flask-Test-Client
+
+Erzeugt ein synthetisches Portfolio (+ ASK- und Alvaris-Katalog) in einem
+temporären Verzeichnis, startet die App darauf und misst je Endpunkt
+Durchsatz, p50/p95/p99 und den Spitzenwert des Speicherverbrauchs (RSS).
+Das Ergebnis wird als JSON geschrieben und kann mit benchmarks.compare
+zwischen zwei Commits verglichen werden.
+
+Verwendung (im Projektverzeichnis):
+    python -m benchmarks.bench_api --rows 10000
+    python -m benchmarks.bench_api --sizes 10000,100000,1000000 --scale 0.2
+    python -m benchmarks.bench_api --rows 10000 --output results/base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from benchmarks import synthetic
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+api_dir = os.path.join(base_dir, 'api')
+results_dir = os.path.join(base_dir, 'benchmarks', 'results')
+
+# Anzahl Requests je Endpunkt bei --scale 1
+DEFAULT_ITERATIONS = {
+    'search': 2000,
+    'convert': 2000,
+    'batch-convert': 20,
+    'find-similar': 10,
+    'load-catalog': 10,
+    'update-entry': 10,
+    'create-entry': 10,
+    'delete-row': 10,
+    'undo': 5,
+}
+BATCH_SIZE = 500
+
+
+def peak_rss_mb():
+    """Spitzenwert des Speicherverbrauchs dieses Prozesses in MB (None wenn nicht ermittelbar)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux liefert KB, macOS Bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=base_dir,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def summarize(latencies, total_seconds, items_per_request=1):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'seconds': round(total_seconds, 4),
+        'throughput_rps': round(len(latencies) / total_seconds, 1) if total_seconds else None,
+        'items_per_second': round(len(latencies) * items_per_request / total_seconds, 1) if total_seconds else None,
+        'mean_ms': round(statistics.mean(latencies) * 1000, 3) if latencies else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def timed_requests(client, method, url, payloads, expect_status=200):
+    latencies = []
+    start = time.perf_counter()
+    for payload in payloads:
+        t = time.perf_counter()
+        response = client.open(url, method=method, json=payload)
+        latencies.append(time.perf_counter() - t)
+        if response.status_code != expect_status:
+            raise RuntimeError(f"{url}: Status {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return latencies, time.perf_counter() - start
+
+
+def build_workload(portfolio_path, rng, iterations):
+    """Mischung aus Treffern in allen Spalten (80%) und unbekannten Nummern (20%)"""
+    known = {col: synthetic.read_column_values(portfolio_path, col, limit=20000) for col in 'ABDEFGH'}
+    known = {col: values for col, values in known.items() if values}
+
+    def sample_number():
+        if rng.random() < 0.2:
+            return str(rng.randint(500000000, 599999999))
+        col = rng.choice(list(known))
+        return col, rng.choice(known[col])
+
+    searches = []
+    converts = []
+    for _ in range(iterations['search']):
+        sample = sample_number()
+        searches.append({'number': sample[1] if isinstance(sample, tuple) else sample})
+    for _ in range(iterations['convert']):
+        from_col = rng.choice(['A', 'B'])
+        converts.append({
+            'number': rng.choice(known[from_col]),
+            'from_col': from_col,
+            'to_col': rng.choice(['D', 'E', 'F', 'H']),
+            'mode': 'intern'
+        })
+
+    batches = []
+    for _ in range(iterations['batch-convert']):
+        numbers = []
+        for _ in range(BATCH_SIZE):
+            sample = sample_number()
+            numbers.append(sample[1] if isinstance(sample, tuple) else sample)
+        batches.append({'numbers': numbers, 'target_col': 'A', 'mode': 'extern'})
+
+    return known, searches, converts, batches
+
+
+def run(rows, catalog_rows, scale, seed, work_dir):
+    """Führt alle Messungen für eine Portfolio-Größe aus und gibt das Ergebnis-Dict zurück"""
+    rng = random.Random(seed)
+    iterations = {name: max(1, int(count * scale)) for name, count in DEFAULT_ITERATIONS.items()}
+
+    portfolio_path = os.path.join(work_dir, 'Portfolio_Syskomp_pA.csv')
+    t = time.perf_counter()
+    synthetic.generate_portfolio(portfolio_path, rows, seed)
+    ask_catalog = synthetic.generate_catalog(os.path.join(work_dir, 'ASK_CATALOG', 'ask_bench.csv'),
+                                             catalog_rows, portfolio_path, 'ASK', seed=seed + 1)
+    alvaris_catalog = synthetic.generate_catalog(os.path.join(work_dir, 'ALVARIS_CATALOG', 'alvaris_bench.csv'),
+                                                 catalog_rows, portfolio_path, 'ALVARIS', seed=seed + 2)
+    generate_seconds = time.perf_counter() - t
+
+    known, searches, converts, batches = build_workload(portfolio_path, rng, iterations)
+
+    # App erst jetzt importieren: der CSV-Pfad wird beim Import gelesen
+    os.environ['PORTFOLIO_CSV'] = portfolio_path
+    sys.path.insert(0, api_dir)
+    import app as app_module
+
+    t = time.perf_counter()
+    app = app_module.create_app(preload='eager')
+    startup_seconds = time.perf_counter() - t
+    client = app.test_client()
+
+    results = {}
+
+    latencies, total = timed_requests(client, 'POST', '/api/search', searches)
+    results['search'] = summarize(latencies, total)
+
+    latencies, total = timed_requests(client, 'POST', '/api/convert', converts)
+    results['convert'] = summarize(latencies, total)
+
+    latencies, total = timed_requests(client, 'POST', '/api/batch-convert', batches)
+    results['batch-convert'] = summarize(latencies, total, BATCH_SIZE)
+
+    with open(ask_catalog, 'r', encoding='utf-8') as f:
+        descriptions = [line.split(',')[1] for line in f.readlines()[1:]]
+    similar = [{'description': rng.choice(descriptions), 'min_similarity': 0.3}
+               for _ in range(iterations['find-similar'])]
+    latencies, total = timed_requests(client, 'POST', '/api/find-similar', similar)
+    results['find-similar'] = summarize(latencies, total)
+
+    catalogs = [{'catalog_path': rng.choice([ask_catalog, alvaris_catalog])}
+                for _ in range(iterations['load-catalog'])]
+    latencies, total = timed_requests(client, 'POST', '/api/load-catalog', catalogs)
+    results['load-catalog'] = summarize(latencies, total, catalog_rows)
+
+    # Schreibende Endpunkte (arbeiten auf der temporären Kopie)
+    updates = [{'syskomp_neu': rng.choice(known['A']), 'col': 'D', 'value': synthetic._item_nr(rng)}
+               for _ in range(iterations['update-entry'])]
+    latencies, total = timed_requests(client, 'POST', '/api/update-entry', updates)
+    results['update-entry'] = summarize(latencies, total)
+
+    new_numbers = [str(199000000 + i) for i in range(iterations['create-entry'])]
+    creates = [{'syskomp_neu': nr, 'description': 'Benchmark;;;', 'ask': synthetic._ask_nr(rng)} for nr in new_numbers]
+    latencies, total = timed_requests(client, 'POST', '/api/create-entry', creates)
+    results['create-entry'] = summarize(latencies, total)
+
+    deletes = [{'syskomp_neu': nr} for nr in new_numbers[:iterations['delete-row']]]
+    latencies, total = timed_requests(client, 'POST', '/api/delete-row', deletes)
+    results['delete-row'] = summarize(latencies, total)
+
+    latencies, total = timed_requests(client, 'POST', '/api/undo', [{}] * iterations['undo'])
+    results['undo'] = summarize(latencies, total)
+
+    return {
+        'meta': {
+            'rows': rows,
+            'catalog_rows': catalog_rows,
+            'scale': scale,
+            'seed': seed,
+            'batch_size': BATCH_SIZE,
+            'git_commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+        },
+        'setup': {
+            'generate_seconds': round(generate_seconds, 3),
+            'portfolio_mb': round(os.path.getsize(portfolio_path) / (1024 * 1024), 2),
+            'startup_seconds': round(startup_seconds, 3),
+        },
+        'endpoints': results,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def default_output(rows):
+    return os.path.join(results_dir, f"api_{rows}_{git_commit() or 'nogit'}.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=10000, help='Zeilen im synthetischen Portfolio')
+    parser.add_argument('--sizes', help='Mehrere Größen (kommagetrennt), je in eigenem Prozess')
+    parser.add_argument('--catalog-rows', type=int, default=2000, help='Zeilen je synthetischem Katalog')
+    parser.add_argument('--scale', type=float, default=1.0, help='Faktor für die Anzahl Requests')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='Ziel-JSON (Standard: benchmarks/results/api_<rows>_<commit>.json)')
+    args = parser.parse_args()
+
+    if args.sizes:
+        # Jede Größe in einem frischen Prozess, damit RSS und Import-Zustand getrennt bleiben
+        for rows in [int(v) for v in args.sizes.split(',')]:
+            cmd = [sys.executable, '-m', 'benchmarks.bench_api', '--rows', str(rows),
+                   '--catalog-rows', str(args.catalog_rows), '--scale', str(args.scale), '--seed', str(args.seed)]
+            subprocess.run(cmd, cwd=base_dir, check=True)
+        return
+
+    work_dir = tempfile.mkdtemp(prefix='bench_api_')
+    try:
+        result = run(args.rows, args.catalog_rows, args.scale, args.seed, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    output = args.output or default_output(args.rows)
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+
+    print(f"\n{args.rows} Zeilen - Start {result['setup']['startup_seconds']} s, Peak RSS {result['peak_rss_mb']} MB")
+    print(f"{'Endpunkt':<16}{'Req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in result['endpoints'].items():
+        print(f"{name:<16}{stats['throughput_rps']:>10}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}")
+    print(f"\nErgebnis: {output}")
+
+
+if __name__ == '__main__':
+    main()
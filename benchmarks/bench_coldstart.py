@@ -0,0 +1,94 @@
+"""
+Benchmark: Kaltstart der API (Import-Zeit und erster Request)
+
+Misst in frischen Python-Prozessen:
+  1. `python -X importtime -c "import app"` - Importkosten je Modul
+  2. Zeit bis create_app(preload='lazy') fertig ist und /api/health antwortet
+  3. Zeit bis der erste /api/search beantwortet ist (inkl. Laden des Index)
+
+Verwendung:
+    python benchmarks/bench_coldstart.py
+    python benchmarks/bench_coldstart.py --top 25
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+api_dir = os.path.join(base_dir, 'api')
+
+FIRST_REQUEST_SCRIPT = """
+import time
+t0 = time.perf_counter()
+import app as app_module
+app = app_module.create_app(preload='lazy')
+t1 = time.perf_counter()
+client = app.test_client()
+client.get('/api/health')
+t2 = time.perf_counter()
+client.post('/api/search', json={'number': '110000041'})
+t3 = time.perf_counter()
+print('TIMES', t1 - t0, t2 - t0, t3 - t0)
+"""
+
+
+def run_importtime():
+    """Führt `python -X importtime` aus und gibt [(modul, self_us, cumulative_us)] zurück"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=api_dir, capture_output=True, text=True, check=True
+    )
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        # Format: "import time:   self |  cumulative | package"
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        modules.append((name.rstrip(), int(self_us), int(cumulative_us)))
+
+    return modules
+
+
+def run_first_request():
+    """Startet einen frischen Prozess und misst create_app, /api/health und ersten /api/search"""
+    result = subprocess.run(
+        [sys.executable, '-c', FIRST_REQUEST_SCRIPT],
+        cwd=api_dir, capture_output=True, text=True, check=True
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith('TIMES'):
+            return [float(v) for v in line.split()[1:]]
+    raise RuntimeError(f"Keine Zeiten in Ausgabe:\n{result.stdout}\n{result.stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--top', type=int, default=15, help='Anzahl der teuersten Importe')
+    args = parser.parse_args()
+
+    modules = run_importtime()
+    app_us = next((m[2] for m in modules if m[0].strip() == 'app'), 0)
+    nested = [m for m in modules if m[0].strip() != 'app']
+
+    print(f"Import von app: {app_us / 1000:.1f} ms (kumulativ)")
+    print(f"\nTeuerste Importe (kumulativ, inkl. Abhängigkeiten):")
+    for name, self_us, cumulative_us in sorted(nested, key=lambda m: m[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name.strip()}")
+
+    heavy = [name.strip() for name, _, _ in modules if name.strip() in ('requests', 'PIL', 'difflib', 'openpyxl')]
+    print(f"\nSchwere Module beim Import geladen: {', '.join(heavy) if heavy else 'keine'}")
+
+    create_s, health_s, search_s = run_first_request()
+    print(f"\ncreate_app():          {create_s * 1000:8.1f} ms")
+    print(f"erster /api/health:    {health_s * 1000:8.1f} ms")
+    print(f"erster /api/search:    {search_s * 1000:8.1f} ms (inkl. Laden des Index)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Vergleich der JSON-Provider (json-Modul vs. orjson) auf realistischen Antworten
+
+Erzeugt ein synthetisches Portfolio mit Katalog, holt sich über den
+Test-Client echte Antworten von batch-convert, load-catalog und find-similar
+und misst dann nur die Serialisierung dieser Objekte mit jedem Provider
+(Flask-Standard, kompakt ohne Sortierung, orjson).
+
+Verwendung (im Projektverzeichnis):
+    python -m benchmarks.bench_json
+    python -m benchmarks.bench_json --rows 50000 --batch 5000 --catalog-rows 10000
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmarks import synthetic
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+api_dir = os.path.join(base_dir, 'api')
+
+
+def build_payloads(client, portfolio_path, catalog_path, batch_size, rng):
+    """Fragt die großen Endpunkte einmal ab und gibt die dekodierten Antworten zurück"""
+    known = synthetic.read_column_values(portfolio_path, 'D', limit=batch_size)
+    numbers = [rng.choice(known) for _ in range(batch_size)]
+
+    payloads = {}
+    requests = {
+        'batch-convert': ('/api/batch-convert', {'numbers': numbers, 'target_col': 'A', 'mode': 'intern',
+                                                 'all_candidates': True}),
+        'load-catalog': ('/api/load-catalog', {'catalog_path': catalog_path}),
+        'find-similar': ('/api/find-similar', {'description': 'PROFIL 40X40', 'min_similarity': 0.0}),
+    }
+    for name, (url, body) in requests.items():
+        response = client.post(url, json=body)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url}: Status {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        payloads[name] = response.get_json()
+    return payloads
+
+
+def measure(app, provider, obj, repeat):
+    """Zeit für provider.response(obj) inkl. Erzeugen des Response-Objekts"""
+    timings = []
+    size = 0
+    with app.app_context():
+        for _ in range(repeat):
+            t = time.perf_counter()
+            response = provider.response(obj)
+            timings.append(time.perf_counter() - t)
+            size = response.content_length or len(response.get_data())
+    return statistics.median(timings), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000, help='Zeilen im synthetischen Portfolio')
+    parser.add_argument('--catalog-rows', type=int, default=5000, help='Zeilen im synthetischen Katalog')
+    parser.add_argument('--batch', type=int, default=2000, help='Nummern je batch-convert')
+    parser.add_argument('--repeat', type=int, default=20, help='Wiederholungen je Messung (Median)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_json_')
+    try:
+        portfolio_path = synthetic.generate_portfolio(os.path.join(work_dir, 'Portfolio_Syskomp_pA.csv'),
+                                                      args.rows, args.seed)
+        catalog_path = synthetic.generate_catalog(os.path.join(work_dir, 'ASK_CATALOG', 'ask_bench.csv'),
+                                                  args.catalog_rows, portfolio_path, 'ASK', seed=args.seed + 1)
+
+        # App erst jetzt importieren: der CSV-Pfad wird beim Import gelesen
+        os.environ['PORTFOLIO_CSV'] = portfolio_path
+        sys.path.insert(0, api_dir)
+        import app as app_module
+        import json_provider
+        from flask.json.provider import DefaultJSONProvider
+
+        app = app_module.create_app(preload='eager')
+        payloads = build_payloads(app.test_client(), portfolio_path, catalog_path, args.batch,
+                                  random.Random(args.seed))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    providers = {
+        'flask-default': DefaultJSONProvider(app),
+        'compact': json_provider.CompactJSONProvider(app),
+    }
+    if json_provider.orjson is not None:
+        providers['orjson'] = json_provider.OrjsonProvider(app)
+    else:
+        print("orjson nicht installiert - nur json-Modul wird gemessen")
+
+    print(f"\n{'Antwort':<16}{'Provider':<16}{'ms':>10}{'KB':>10}{'Faktor':>10}")
+    for name, obj in payloads.items():
+        baseline = None
+        for provider_name, provider in providers.items():
+            seconds, size = measure(app, provider, obj, args.repeat)
+            baseline = baseline or seconds
+            print(f"{name:<16}{provider_name:<16}{seconds * 1000:>10.2f}{size / 1024:>10.1f}"
+                  f"{baseline / seconds:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: API-Startzeit mit und ohne Index-Snapshot
+
+Importiert `app` jeweils in einem frischen Python-Prozess und misst die
+Zeit bis der Index geladen ist:
+  - kalt:  Snapshot gelöscht -> CSV wird geparst und Snapshot geschrieben
+  - warm:  Snapshot vorhanden -> Index wird direkt geladen
+
+Verwendung:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --rows 100000 --repeat 5
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+api_dir = os.path.join(base_dir, 'api')
+sys.path.insert(0, api_dir)
+
+from index_snapshot import IndexSnapshot
+
+sys.path.insert(0, base_dir)
+from benchmarks.synthetic import generate_portfolio
+
+PORTFOLIO_CSV = os.path.join(base_dir, 'Portfolio_Syskomp_pA.csv')
+
+STARTUP_SCRIPT = (
+    "import time; t = time.perf_counter(); import app; app.ensure_data_loaded(); "
+    "print('STARTUP', time.perf_counter() - t)"
+)
+
+
+def measure_startup(csv_path):
+    """Startet einen frischen Interpreter und gibt die Startzeit in Sekunden zurück"""
+    env = dict(os.environ, PORTFOLIO_CSV=csv_path)
+    result = subprocess.run(
+        [sys.executable, '-c', STARTUP_SCRIPT],
+        cwd=api_dir, env=env, capture_output=True, text=True, check=True
+    )
+    for line in result.stdout.splitlines():
+        if line.startswith('STARTUP'):
+            return float(line.split()[1])
+    raise RuntimeError(f"Keine Startzeit in Ausgabe:\n{result.stdout}\n{result.stderr}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=0,
+                        help='Synthetische CSV mit N Zeilen verwenden (0 = echte Portfolio-CSV)')
+    parser.add_argument('--repeat', type=int, default=3, help='Anzahl Messungen pro Variante')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_startup_')
+    try:
+        csv_path = os.path.join(work_dir, 'Portfolio_Syskomp_pA.csv')
+        if args.rows:
+            generate_portfolio(csv_path, args.rows)
+        else:
+            shutil.copy(PORTFOLIO_CSV, csv_path)
+
+        snapshot = IndexSnapshot(csv_path)
+        cold, warm = [], []
+
+        for _ in range(args.repeat):
+            snapshot.remove()
+            cold.append(measure_startup(csv_path))
+            warm.append(measure_startup(csv_path))
+
+        size_kb = os.path.getsize(csv_path) / 1024
+        print(f"CSV: {size_kb:,.0f} KB ({args.rows or 'Portfolio'} Zeilen), {args.repeat} Messungen")
+        print(f"  kalt (CSV parsen):     {statistics.median(cold) * 1000:8.1f} ms (Median)")
+        print(f"  warm (Snapshot laden): {statistics.median(warm) * 1000:8.1f} ms (Median)")
+        print(f"  Faktor:                {statistics.median(cold) / statistics.median(warm):8.2f}x")
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Ladezeit der Portfolio-Excel in den Desktop-Tools (src/conversion.py, src/conversion_app.py)
+
+Erzeugt eine synthetische Portfolio_Syskomp_pA.xlsx und vergleicht das
+frühere Laden (load_workbook im Vollmodus + ws.cell() für 8 Spalten je Zeile)
+mit read_index aus api/portfolio_index.py (read_only + values_only, gestreamt)
+und dem Laden aus dem binären Snapshot (PortfolioIndex.load, zweiter Start).
+
+Verwendung (im Projektverzeichnis):
+    python -m benchmarks.bench_xlsx_load
+    python -m benchmarks.bench_xlsx_load --rows 50000 --repeat 3
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from openpyxl import Workbook, load_workbook
+
+from benchmarks import synthetic
+
+base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(base_dir, 'api'))
+
+from portfolio_index import PortfolioIndex, read_index, split_values  # noqa: E402
+
+
+def write_workbook(path, rows):
+    # Normaler Modus: Texte als Shared Strings wie in einer von Excel gespeicherten Datei
+    # (write_only schreibt Inline-Strings, die sich deutlich langsamer lesen)
+    wb = Workbook()
+    ws = wb.active
+    ws.append(synthetic.PORTFOLIO_HEADER)
+    for row in synthetic.generate_portfolio_rows(rows):
+        ws.append(row)
+    wb.save(path)
+
+
+def load_cell_by_cell(filepath):
+    """Bisheriges ConversionTool.load_data (ohne Tk)"""
+    data = defaultdict(dict)
+    wb = load_workbook(filepath, data_only=True)
+    ws = wb.active
+    for row_idx in range(2, ws.max_row + 1):
+        row_dict = {}
+        for col_idx, col_letter in enumerate(['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H'], start=1):
+            cell_value = ws.cell(row=row_idx, column=col_idx).value
+            row_dict[col_letter] = str(cell_value).strip() if cell_value else ""
+        for col_letter in ['A', 'B', 'D', 'E', 'F', 'H']:
+            value = row_dict.get(col_letter, "")
+            if value:
+                data[col_letter][value] = row_dict
+    return data, ws.max_row - 1
+
+
+def measure(load, path, repeat):
+    timings = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = load(path)
+        timings.append(time.perf_counter() - t)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_xlsx_')
+    try:
+        path = os.path.join(work_dir, 'Portfolio_Syskomp_pA.xlsx')
+        write_workbook(path, args.rows)
+        print(f"Workbook: {args.rows} Zeilen, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        old_time, (old_data, old_rows) = measure(load_cell_by_cell, path, args.repeat)
+        new_time, (new_data, new_rows) = measure(read_index, path, args.repeat)
+
+        # Der neue Index hält alle Zeilen je Wert und trennt Pipe-Zellen; der alte nur die letzte
+        assert old_rows == new_rows, "Zeilenzahl unterscheidet sich"
+        for col, values in old_data.items():
+            for cell, row in values.items():
+                for value in split_values(cell):
+                    assert row in new_data[col][value], f"{col}={value} fehlt"
+
+        PortfolioIndex.load(path)  # Erster Start: parsen + Snapshot anlegen
+        snapshot_time, snapshot = measure(PortfolioIndex.load, path, args.repeat)
+        assert snapshot.source == 'snapshot' and snapshot.index == new_data
+
+        print(f"{'Vollmodus + ws.cell()':28} {old_time:7.2f} s")
+        print(f"{'read_only + values_only':28} {new_time:7.2f} s   ({old_time / new_time:.1f}x)")
+        print(f"{'Snapshot':28} {snapshot_time:7.2f} s   ({old_time / snapshot_time:.1f}x)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Vergleicht zwei Ergebnisdateien von benchmarks.bench_api
+
+Verwendung:
+    python -m benchmarks.compare benchmarks/results/api_10000_abc123.json benchmarks/results/api_10000_def456.json
+"""
+
+import argparse
+import json
+
+METRICS = ['throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms', 'peak_rss_mb']
+
+
+def change(old, new):
+    if old in (None, 0) or new is None:
+        return ''
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zwei Benchmark-Ergebnisse vergleichen")
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding='utf-8') as f:
+        candidate = json.load(f)
+
+    print(f"Basis:     {baseline['meta'].get('git_commit')} ({baseline['meta']['rows']} Zeilen)")
+    print(f"Kandidat:  {candidate['meta'].get('git_commit')} ({candidate['meta']['rows']} Zeilen)")
+
+    for name in baseline['endpoints']:
+        if name not in candidate['endpoints']:
+            continue
+        old, new = baseline['endpoints'][name], candidate['endpoints'][name]
+        print(f"\n{name}")
+        for metric in METRICS:
+            print(f"  {metric:<16}{old.get(metric)!s:>12} -> {new.get(metric)!s:>12}  {change(old.get(metric), new.get(metric))}")
+
+    print(f"\nStartzeit: {baseline['setup']['startup_seconds']} s -> {candidate['setup']['startup_seconds']} s")
+
+
+if __name__ == '__main__':
+    main()
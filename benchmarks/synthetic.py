@@ -0,0 +1,161 @@
+"""
+Synthetische Portfolio- und Katalogdaten für Benchmarks
+
+Erzeugt Dateien im Format der echten Daten:
+  - Portfolio: Semikolon-CSV mit Spalten A-H, Pipe-getrennte Mehrfachwerte
+    in D-H und Artikelnummern, die in mehreren Zeilen vorkommen
+  - Katalog (ASK/Alvaris): Komma-CSV mit Artikelnummer, Beschreibung, Bild, URL;
+    ein Teil der Nummern ist bereits im Portfolio zugeordnet
+
+Alle Generatoren sind mit einem Seed reproduzierbar.
+"""
+
+import csv
+import os
+import random
+
+PORTFOLIO_HEADER = ['neuNr', 'alteNr', 'BEZEICHNUNG', 'Item', '2 Bosch', 'AlvarisArtnr', 'AlvarisMatnr', 'ASK']
+
+PRODUCT_WORDS = [
+    'Profil', 'Nutenstein', 'Winkel', 'Verbinder', 'Abdeckkappe', 'Gelenk', 'Scharnier',
+    'Stellfuß', 'Endkappe', 'Nutabdeckung', 'Griff', 'Rolle', 'Platte', 'Würfelverbinder',
+    'Automatik-Verbindungssatz', 'Durchführung', 'Kugelkopf', 'Zylinderschraube', 'Hammerschraube',
+]
+PROFILE_SIZES = ['20x20', '30x30', '40x40', '40x80', '45x45', '45x90', '60x60', '80x80']
+VARIANTS = ['leicht', 'schwer', 'natur', 'schwarz', 'verzinkt', 'E', 'Satz', 'M6', 'M8']
+MATERIALS = ['Material:;Aluminium;', 'Material:;Stahl verzinkt;', 'Material:;PA-GF;', ';;']
+
+# Anteil der Zeilen mit Wert in der Spalte, Anteil Mehrfachwerte, Anteil geteilter Werte
+COLUMN_PROFILE = {
+    'D': (0.43, 0.03, 0.03),
+    'E': (0.29, 0.03, 0.02),
+    'F': (0.12, 0.02, 0.02),
+    'G': (0.10, 0.02, 0.02),
+    'H': (0.30, 0.08, 0.04),
+}
+
+
+def random_description(rng: random.Random) -> str:
+    word = rng.choice(PRODUCT_WORDS)
+    if rng.random() < 0.5:
+        return f"{word} {rng.choice([5, 6, 8, 10])} {rng.choice(PROFILE_SIZES)} {rng.choice(VARIANTS)};{rng.choice(MATERIALS)}"
+    return f"{word} {rng.randint(10, 120)} {rng.choice(VARIANTS)};{rng.choice(MATERIALS)}"
+
+
+def _item_nr(rng):
+    return f"0.0.{rng.randint(100, 999)}.{rng.randint(10, 99)}"
+
+
+def _bosch_nr(rng):
+    return f"3842{rng.randint(100000, 999999)}"
+
+
+def _alvaris_artnr(rng):
+    return str(rng.randint(1000000, 9999999))
+
+
+def _alvaris_matnr(rng):
+    return f"{rng.choice(['ANT', 'PRO', 'VER', 'WIN', 'NUT'])}{rng.choice(['STEP', 'SET', 'K', ''])}.{rng.randint(10, 99)}"
+
+
+def _ask_nr(rng):
+    return str(rng.randint(100000, 9999999))
+
+
+NUMBER_GENERATORS = {
+    'D': _item_nr,
+    'E': _bosch_nr,
+    'F': _alvaris_artnr,
+    'G': _alvaris_matnr,
+    'H': _ask_nr,
+}
+
+
+def generate_portfolio_rows(rows: int, seed: int = 42):
+    """Erzeugt Portfolio-Zeilen (ohne Header) als Listen mit 8 Werten"""
+    rng = random.Random(seed)
+    recent = {col: [] for col in NUMBER_GENERATORS}
+
+    for i in range(rows):
+        row = [''] * 8
+        row[0] = str(100000000 + i)
+        if rng.random() < 0.95:
+            row[1] = f"{rng.choice('24')}{rng.randint(0, 99999999):08d}"
+        row[2] = random_description(rng)
+
+        for col, (fill, multi, shared) in COLUMN_PROFILE.items():
+            col_idx = ord(col) - ord('A')
+            if rng.random() >= fill:
+                # Alvaris-Spalten enthalten oft "-" als Platzhalter
+                if col in ('F', 'G') and rng.random() < 0.3:
+                    row[col_idx] = '-'
+                continue
+
+            pool = recent[col]
+            if pool and rng.random() < shared:
+                value = rng.choice(pool)
+            else:
+                value = NUMBER_GENERATORS[col](rng)
+
+            if rng.random() < multi:
+                value = f"{value}|{NUMBER_GENERATORS[col](rng)}"
+
+            row[col_idx] = value
+            pool.append(value.split('|')[0])
+            if len(pool) > 1000:
+                del pool[:500]
+
+        yield row
+
+
+def generate_portfolio(path: str, rows: int, seed: int = 42) -> str:
+    """Schreibt eine synthetische Portfolio-CSV (Semikolon, utf-8-sig wie das Original)"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f, delimiter=';', quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(PORTFOLIO_HEADER)
+        writer.writerows(generate_portfolio_rows(rows, seed))
+    return path
+
+
+def read_column_values(portfolio_path: str, col: str, limit: int = None):
+    """Liest die (Pipe-getrennten) Einzelwerte einer Spalte aus einer Portfolio-CSV"""
+    col_idx = ord(col) - ord('A')
+    values = []
+    with open(portfolio_path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f, delimiter=';')
+        next(reader, None)
+        for row in reader:
+            if col_idx < len(row) and row[col_idx] and row[col_idx] != '-':
+                values.extend(v.strip() for v in row[col_idx].split('|') if v.strip())
+                if limit and len(values) >= limit:
+                    break
+    return values
+
+
+def generate_catalog(path: str, rows: int, portfolio_path: str = None, kind: str = 'ASK',
+                     mapped_ratio: float = 0.4, seed: int = 7) -> str:
+    """
+    Schreibt eine synthetische Katalog-CSV (Artikelnummer, Beschreibung, Bild, URL)
+
+    Args:
+        kind: 'ASK' oder 'ALVARIS' (bestimmt Nummernformat und Portfolio-Spalte)
+        mapped_ratio: Anteil der Artikel, deren Nummer schon im Portfolio steht
+    """
+    rng = random.Random(seed)
+    col = 'F' if kind.upper() == 'ALVARIS' else 'H'
+    known = read_column_values(portfolio_path, col) if portfolio_path else []
+    make_number = NUMBER_GENERATORS[col]
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Artikelnummer', 'Beschreibung', 'Bild', 'URL'])
+        for _ in range(rows):
+            if known and rng.random() < mapped_ratio:
+                artnr = rng.choice(known)
+            else:
+                artnr = make_number(rng)
+            description = random_description(rng).split(';')[0].upper()
+            writer.writerow([artnr, description, f"{artnr}.png", f"https://example.invalid/p/{artnr}"])
+    return path
@@ -105,7 +105,11 @@ def diagnose():
             print("   ✓ File-Lock freigegeben")
         else:
             print("   ✗ FILE-LOCK KONNTE NICHT ERWORBEN WERDEN!")
-            print("   → Möglicherweise wird die Datei von einem anderen Prozess verwendet")
+            owner = manager.lock.owner()
+            if owner:
+                print(f"   → Gesperrt von PID {owner['pid']} auf {owner['host']} seit {owner['since']}")
+            else:
+                print("   → Möglicherweise wird die Datei von einem anderen Prozess verwendet")
 
     except Exception as e:
         print(f"   ✗ FEHLER: {e}")
@@ -1,5 +1,6 @@
 import { useState, useRef } from 'react'
 import * as XLSX from 'xlsx'
+import { startJob, formatProgress, JobCancelledError, type JobProgress } from '../jobStream'
 import './BatchConverter.css'
 
 interface BatchResult {
@@ -16,8 +17,6 @@ interface BatchResponse {
   results: BatchResult[]
 }
 
-const API_URL = import.meta.env.VITE_API_URL || '/api'
-
 const BatchConverter = () => {
   const [file, setFile] = useState<File | null>(null)
   const [dragOver, setDragOver] = useState(false)
@@ -26,6 +25,8 @@ const BatchConverter = () => {
   const [loading, setLoading] = useState(false)
   const [result, setResult] = useState<BatchResponse | null>(null)
   const [error, setError] = useState<string | null>(null)
+  const [progress, setProgress] = useState<JobProgress | null>(null)
+  const cancelRef = useRef<(() => Promise<void>) | null>(null)
   const fileInputRef = useRef<HTMLInputElement>(null)
 
   // Convert column letter (A, B, C...) to index (0, 1, 2...)
@@ -275,31 +276,36 @@ const BatchConverter = () => {
         return
       }
 
-      const response = await fetch(`${API_URL}/batch-convert`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          numbers,
-          target_system: targetSystem,
-        }),
+      // Run as background job with live progress (SSE)
+      setProgress(null)
+      const job = await startJob<BatchResponse>('batch-convert', {
+        numbers,
+        target_system: targetSystem,
+      }, {
+        onProgress: setProgress,
       })
+      cancelRef.current = job.cancel
 
-      if (!response.ok) {
-        throw new Error('API Fehler')
-      }
-
-      const data: BatchResponse = await response.json()
+      const data = await job.result
       setResult(data)
     } catch (err) {
-      setError('Fehler bei der Konvertierung. Stellen Sie sicher, dass der Backend-Server läuft.')
-      console.error(err)
+      if (err instanceof JobCancelledError) {
+        setError('Konvertierung abgebrochen')
+      } else {
+        setError('Fehler bei der Konvertierung. Stellen Sie sicher, dass der Backend-Server läuft.')
+        console.error(err)
+      }
     } finally {
+      cancelRef.current = null
       setLoading(false)
+      setProgress(null)
     }
   }
 
+  const handleCancel = async () => {
+    await cancelRef.current?.()
+  }
+
   const handleExport = () => {
     if (!result || !file) return
 
@@ -457,8 +463,13 @@ const BatchConverter = () => {
           disabled={!file || loading}
           className="convert-button"
         >
-          {loading ? 'Konvertiere...' : 'Konvertieren'}
+          {loading ? `Konvertiere... ${formatProgress(progress)}` : 'Konvertieren'}
         </button>
+        {loading && (
+          <button onClick={handleCancel} className="convert-button">
+            Abbrechen
+          </button>
+        )}
       </div>
 
       {error && (
@@ -1,4 +1,5 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
+import { startJob, formatProgress, JobCancelledError, type JobProgress } from '../jobStream'
 import './ConversionTool.css'
 
 interface Catalog {
@@ -51,6 +52,8 @@ const CatalogMapper = () => {
   const [catalogProducts, setCatalogProducts] = useState<CatalogProduct[]>([])
   const [currentIndex, setCurrentIndex] = useState(0)
   const [loading, setLoading] = useState(false)
+  const [loadProgress, setLoadProgress] = useState<JobProgress | null>(null)
+  const loadCancelRef = useRef<(() => Promise<void>) | null>(null)
   const [error, setError] = useState<string | null>(null)
 
   // Matching
@@ -60,6 +63,9 @@ const CatalogMapper = () => {
   const [minSimilarity, setMinSimilarity] = useState(0)
   const [filterText, setFilterText] = useState('')
   const [matchLoading, setMatchLoading] = useState(false)
+  const [matchProgress, setMatchProgress] = useState<JobProgress | null>(null)
+  const matchCancelRef = useRef<(() => Promise<void>) | null>(null)
+  const matchRequestRef = useRef(0)
   const [gotoInput, setGotoInput] = useState('')
 
   // Undo state
@@ -116,21 +122,16 @@ const CatalogMapper = () => {
     setError(null)
 
     try {
-      const response = await fetch(`${API_URL}/load-catalog`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          catalog_path: selectedCatalog
-        }),
+      // Load as background job so large catalogs show progress and can be aborted
+      setLoadProgress(null)
+      const job = await startJob<{ products: CatalogProduct[] }>('load-catalog', {
+        catalog_path: selectedCatalog
+      }, {
+        onProgress: setLoadProgress,
       })
+      loadCancelRef.current = job.cancel
 
-      if (!response.ok) {
-        throw new Error('Fehler beim Laden des Katalogs')
-      }
-
-      const data = await response.json()
+      const data = await job.result
       setCatalogProducts(data.products || [])
       setCurrentIndex(0)
 
@@ -139,47 +140,77 @@ const CatalogMapper = () => {
         await findMatches(data.products[0].Beschreibung)
       }
     } catch (err: any) {
-      setError(err.message || 'Fehler beim Laden')
+      if (err instanceof JobCancelledError) {
+        setError('Laden abgebrochen')
+      } else {
+        setError(err.message || 'Fehler beim Laden')
+      }
     } finally {
+      loadCancelRef.current = null
       setLoading(false)
+      setLoadProgress(null)
     }
   }
 
+  const handleCancelLoad = async () => {
+    await loadCancelRef.current?.()
+  }
+
   const findMatches = async (description: string) => {
+    // A newer search (next product) replaces a running one
+    const request = ++matchRequestRef.current
+    await matchCancelRef.current?.()
+    matchCancelRef.current = null
+
     if (!description) {
       setMatches([])
+      setMatchLoading(false)
       return
     }
 
     setMatchLoading(true)
+    setMatchProgress(null)
 
     try {
-      const response = await fetch(`${API_URL}/find-similar`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
+      // Search as background job so it shows progress and can be aborted
+      const job = await startJob<{ matches: PortfolioMatch[] }>('find-similar', {
+        description,
+        min_similarity: minSimilarity / 100,
+        filter_type: filterType
+      }, {
+        onProgress: (progress) => {
+          if (request === matchRequestRef.current) setMatchProgress(progress)
         },
-        body: JSON.stringify({
-          description,
-          min_similarity: minSimilarity / 100,
-          filter_type: filterType
-        }),
       })
-
-      if (!response.ok) {
-        throw new Error('Fehler beim Suchen')
+      if (request !== matchRequestRef.current) {
+        await job.cancel()
+        return
       }
+      matchCancelRef.current = job.cancel
 
-      const data = await response.json()
-      setMatches(data.matches || [])
+      const data = await job.result
+      if (request === matchRequestRef.current) {
+        setMatches(data.matches || [])
+      }
     } catch (err) {
-      console.error('Match error:', err)
+      if (request !== matchRequestRef.current) return
+      if (!(err instanceof JobCancelledError)) {
+        console.error('Match error:', err)
+      }
       setMatches([])
     } finally {
-      setMatchLoading(false)
+      if (request === matchRequestRef.current) {
+        matchCancelRef.current = null
+        setMatchLoading(false)
+        setMatchProgress(null)
+      }
     }
   }
 
+  const handleCancelMatches = async () => {
+    await matchCancelRef.current?.()
+  }
+
   const validateAndCheckNumbers = async (neu: string, alt: string) => {
     // Validate format for neue Nummer (required)
     if (neu.length !== 9 || !neu.startsWith('1') || !/^\d+$/.test(neu)) {
@@ -588,6 +619,14 @@ const CatalogMapper = () => {
             >
               {loading ? 'Laden...' : 'Laden'}
             </button>
+            {loading && (
+              <>
+                <span>{formatProgress(loadProgress)}</span>
+                <button onClick={handleCancelLoad} className="action-button">
+                  Abbrechen
+                </button>
+              </>
+            )}
           </div>
         </div>
       )}
@@ -837,7 +876,12 @@ const CatalogMapper = () => {
               <div>
                 <h4 style={{ marginBottom: '6px', fontSize: '12px' }}>Top Matches ({filteredMatches.length})</h4>
                 {matchLoading ? (
-                  <div style={{ fontSize: '10px', padding: '4px' }}>Suche Matches...</div>
+                  <div style={{ fontSize: '10px', padding: '4px' }}>
+                    Suche Matches... {formatProgress(matchProgress)}
+                    <button onClick={handleCancelMatches} className="action-button" style={{ marginLeft: '6px' }}>
+                      Abbrechen
+                    </button>
+                  </div>
                 ) : (
                   <div style={{
                     border: '1px solid #ccc',
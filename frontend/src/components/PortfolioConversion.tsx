@@ -2,6 +2,7 @@ import { useState, useRef, useEffect } from 'react'
 import * as XLSX from 'xlsx'
 import EditableField from './EditableField'
 import CatalogMapper from './CatalogMapper'
+import { startJob, formatProgress, JobCancelledError, type JobProgress } from '../jobStream'
 import './ConversionTool.css'
 
 interface SearchMatch {
@@ -74,6 +75,9 @@ const PortfolioConversion = () => {
   const [batchLoading, setBatchLoading] = useState(false)
   const [batchResult, setBatchResult] = useState<BatchResponse | null>(null)
   const [batchError, setBatchError] = useState<string | null>(null)
+  const [batchProgress, setBatchProgress] = useState<JobProgress | null>(null)
+  const [batchPartialCount, setBatchPartialCount] = useState(0)
+  const batchCancelRef = useRef<(() => Promise<void>) | null>(null)
   const [showInfoModal, setShowInfoModal] = useState(false)
   const [stats, setStats] = useState<StatsData | null>(null)
   const fileInputRef = useRef<HTMLInputElement>(null)
@@ -689,33 +693,39 @@ const PortfolioConversion = () => {
 
       setOriginalFileData(fullData)
 
-      const response = await fetch(`${API_URL}/batch-convert`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          numbers,
-          target_col: targetCol,
-          mode: 'extern'
-        }),
+      // Run as background job: progress and partial results arrive via SSE
+      setBatchProgress(null)
+      setBatchPartialCount(0)
+      const job = await startJob<BatchResponse, BatchResult>('batch-convert', {
+        numbers,
+        target_col: targetCol,
+        mode: 'extern'
+      }, {
+        onProgress: setBatchProgress,
+        onPartial: (items) => setBatchPartialCount((count) => count + items.length),
       })
+      batchCancelRef.current = job.cancel
 
-      if (!response.ok) {
-        const errorData = await response.json()
-        throw new Error(errorData.error || 'API Fehler')
-      }
-
-      const data: BatchResponse = await response.json()
+      const data = await job.result
       setBatchResult(data)
     } catch (err: any) {
-      setBatchError(err.message || 'Fehler bei der Konvertierung.')
-      console.error(err)
+      if (err instanceof JobCancelledError) {
+        setBatchError('Konvertierung abgebrochen')
+      } else {
+        setBatchError(err.message || 'Fehler bei der Konvertierung.')
+        console.error(err)
+      }
     } finally {
+      batchCancelRef.current = null
       setBatchLoading(false)
+      setBatchProgress(null)
     }
   }
 
+  const handleCancelConvert = async () => {
+    await batchCancelRef.current?.()
+  }
+
   const handleExport = async () => {
     if (!batchResult || !file || !originalFileData) return
 
@@ -1478,8 +1488,20 @@ const PortfolioConversion = () => {
             <button onClick={handleConvert} disabled={!file || batchLoading} className="compact-button">
               {batchLoading ? 'Konvertiere...' : 'Konvertieren'}
             </button>
+            {batchLoading && (
+              <button onClick={handleCancelConvert} className="compact-button">
+                Abbrechen
+              </button>
+            )}
           </div>
 
+          {batchLoading && batchProgress && (
+            <div className="batch-progress">
+              <progress value={batchProgress.progress} max={100} />
+              <span>{formatProgress(batchProgress)} – {batchPartialCount} Ergebnisse empfangen</span>
+            </div>
+          )}
+
           {batchError && <div className="error-msg">{batchError}</div>}
 
           {batchResult && (
@@ -0,0 +1,132 @@
+// Long-running API operations as background jobs with a live progress stream (SSE)
+
+const API_URL = import.meta.env.VITE_API_URL || '/api'
+
+export interface JobProgress {
+  status: string
+  processed: number
+  total: number | null
+  progress: number
+  rate_per_s: number | null
+  eta_seconds: number | null
+}
+
+export interface JobHandlers<P> {
+  onProgress?: (progress: JobProgress) => void
+  onPartial?: (items: P[]) => void
+}
+
+export interface RunningJob<T> {
+  id: string
+  result: Promise<T>
+  cancel: () => Promise<void>
+}
+
+export class JobCancelledError extends Error {
+  constructor() {
+    super('Abgebrochen')
+    this.name = 'JobCancelledError'
+  }
+}
+
+/**
+ * Submits a job (POST /api/jobs) and follows it via /api/jobs/<id>/events.
+ * The promise resolves with the final result once the job is done.
+ */
+export async function startJob<T, P = unknown>(
+  kind: string,
+  params: Record<string, unknown>,
+  handlers: JobHandlers<P> = {}
+): Promise<RunningJob<T>> {
+  const response = await fetch(`${API_URL}/jobs`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ kind, params }),
+  })
+  if (!response.ok) {
+    const errorData = await response.json().catch(() => ({}))
+    throw new Error(errorData.error || 'API Fehler')
+  }
+  const job = await response.json()
+  const id: string = job.id
+
+  // Partial results are only streamed when someone listens for them.
+  // The stream does not cancel the job when it drops: EventSource reconnects on its own
+  // and resumes via Last-Event-ID. Jobs are cancelled explicitly (cancel() or leaving the page).
+  const partial = handlers.onPartial ? '1' : '0'
+  const source = new EventSource(`${API_URL}/jobs/${id}/events?partial=${partial}`)
+
+  const cancelOnLeave = () => {
+    navigator.sendBeacon(`${API_URL}/jobs/${id}/cancel`)
+  }
+  window.addEventListener('pagehide', cancelOnLeave)
+
+  const finish = () => {
+    source.close()
+    window.removeEventListener('pagehide', cancelOnLeave)
+  }
+
+  const fetchResult = async (): Promise<T> => {
+    const res = await fetch(`${API_URL}/jobs/${id}/result`)
+    if (!res.ok) throw new Error('Ergebnis konnte nicht geladen werden')
+    return res.json()
+  }
+
+  const result = new Promise<T>((resolve, reject) => {
+    source.addEventListener('progress', (e) => {
+      handlers.onProgress?.(JSON.parse((e as MessageEvent).data))
+    })
+    source.addEventListener('partial', (e) => {
+      handlers.onPartial?.(JSON.parse((e as MessageEvent).data).items)
+    })
+    source.addEventListener('done', () => {
+      finish()
+      fetchResult().then(resolve, reject)
+    })
+    source.addEventListener('failed', (e) => {
+      finish()
+      const data = JSON.parse((e as MessageEvent).data || '{}')
+      reject(new Error(data.error || 'Job fehlgeschlagen'))
+    })
+    source.addEventListener('cancelled', () => {
+      finish()
+      reject(new JobCancelledError())
+    })
+
+    // Short drops are retried by the browser (readyState CONNECTING). Once it gives up
+    // (CLOSED, e.g. HTTP error on reconnect) ask the job status so the promise always settles.
+    source.onerror = async () => {
+      if (source.readyState !== EventSource.CLOSED) return
+      finish()
+      try {
+        const res = await fetch(`${API_URL}/jobs/${id}`)
+        const status = res.ok ? (await res.json()).status : null
+        if (status === 'done') {
+          resolve(await fetchResult())
+        } else if (status === 'cancelled') {
+          reject(new JobCancelledError())
+        } else {
+          reject(new Error('Verbindung zum Job verloren'))
+        }
+      } catch (err) {
+        reject(err)
+      }
+    }
+  })
+
+  const cancel = async () => {
+    await fetch(`${API_URL}/jobs/${id}/cancel`, { method: 'POST' })
+  }
+
+  return { id, result, cancel }
+}
+
+export function formatProgress(progress: JobProgress | null): string {
+  if (!progress || progress.total == null) return ''
+  let text = `${progress.processed}/${progress.total} (${Math.round(progress.progress)}%)`
+  if (progress.rate_per_s) text += `, ${Math.round(progress.rate_per_s)}/s`
+  if (progress.eta_seconds != null && progress.processed < progress.total) {
+    text += `, noch ca. ${Math.ceil(progress.eta_seconds)} s`
+  }
+  return text
+}
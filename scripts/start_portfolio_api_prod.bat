@@ -0,0 +1,11 @@
+@echo off
+echo ==========================================
+echo Starting Portfolio Conversion API (Production)
+echo ==========================================
+echo.
+
+cd ..
+cd api
+python serve.py --bind 0.0.0.0:5000
+
+pause
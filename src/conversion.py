@@ -1,9 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
-from openpyxl import load_workbook
 import os
-from collections import defaultdict
-from PIL import Image, ImageTk
+import sys
+import threading
+import time
+from image_service import ImageService
+
+# Gemeinsamer Portfolio-Loader (api/portfolio_index.py), auch von der API verwendet
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api'))
+from portfolio_index import PortfolioIndex  # noqa: E402
 
 class ConversionTool:
     def __init__(self, root):
@@ -12,7 +17,7 @@ class ConversionTool:
         self.root.geometry("950x580")
 
         # Data storage
-        self.data = defaultdict(dict)  # {column: {value: row_dict}}
+        self.data = PortfolioIndex()  # {column: {value: [row_dict, ...]}} + lookups
         self.column_names = {
             'A': 'Syskomp neue Nummer',
             'B': 'Syskomp alte Nummer',
@@ -27,6 +32,12 @@ class ConversionTool:
         # Request counter for rate limiting
         self.request_count = 0
 
+        # Portfolio is read in a background thread (see load_data)
+        self.loading = False
+
+        # Product images are loaded in the background and cached (LRU)
+        self.images = ImageService(root)
+
         # Compact header: Mode + File in one row
         header_frame = ttk.Frame(root)
         header_frame.pack(fill="x", padx=5, pady=3)
@@ -144,37 +155,40 @@ class ConversionTool:
             self.load_status_label.config(text="❌ Datei nicht gefunden", foreground="red")
             return
 
-        try:
-            self.load_status_label.config(text="⏳ Lade Daten...", foreground="blue")
-            self.root.update()
-
-            wb = load_workbook(filepath, data_only=True)
-            ws = wb.active
-
-            # Clear existing data
-            self.data.clear()
+        if self.loading:
+            return  # Already loading
 
-            # Load data (skip header row)
-            for row_idx in range(2, ws.max_row + 1):
-                row_dict = {}
+        # Read the workbook in the background - the window stays responsive
+        self.loading = True
+        self.load_status_label.config(text="⏳ Lade Daten...", foreground="blue")
+        thread = threading.Thread(target=self.run_load_data, args=(filepath,), daemon=True)
+        thread.start()
 
-                # Read columns A-H
-                for col_idx, col_letter in enumerate(['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H'], start=1):
-                    cell_value = ws.cell(row=row_idx, column=col_idx).value
-                    row_dict[col_letter] = str(cell_value).strip() if cell_value else ""
+    def run_load_data(self, filepath):
+        """Worker thread: read the workbook, hand the finished index to the Tk thread"""
+        start = time.perf_counter()
+        try:
+            # Unveränderte Datei: binärer Snapshot statt Parsen
+            data = PortfolioIndex.load(
+                filepath, progress=lambda rows: self.root.after(0, self.show_load_progress, rows))
+        except Exception as e:
+            self.root.after(0, self.on_load_failed, e)
+            return
+        self.root.after(0, self.on_data_loaded, data, data.row_count, time.perf_counter() - start)
 
-                # Index by each column (for fast lookup)
-                for col_letter in ['A', 'B', 'D', 'E', 'F', 'H']:  # Searchable columns
-                    value = row_dict.get(col_letter, "")
-                    if value:
-                        self.data[col_letter][value] = row_dict
+    def show_load_progress(self, rows):
+        if self.loading:
+            self.load_status_label.config(text=f"⏳ {rows} Zeilen...", foreground="blue")
 
-            total_rows = ws.max_row - 1
-            self.load_status_label.config(text=f"✓ {total_rows} Zeilen geladen", foreground="green")
-            self.status_label.config(text=f"Daten geladen: {total_rows} Zeilen")
+    def on_data_loaded(self, data, total_rows, elapsed):
+        self.loading = False
+        self.data = data
+        self.load_status_label.config(text=f"✓ {total_rows} Zeilen geladen ({elapsed:.1f}s)", foreground="green")
+        self.status_label.config(text=f"Daten geladen: {total_rows} Zeilen")
 
-        except Exception as e:
-            self.load_status_label.config(text=f"❌ Fehler: {e}", foreground="red")
+    def on_load_failed(self, error):
+        self.loading = False
+        self.load_status_label.config(text=f"❌ Fehler: {error}", foreground="red")
 
     def get_column_letter(self, selection):
         """Extract column letter from 'X: Description' format"""
@@ -187,6 +201,7 @@ class ConversionTool:
         # Clear previous image
         self.image_label.config(image='', text='')
         self.current_image = None
+        self.images.cancel()
 
         if not artnr or artnr == '-':
             return
@@ -214,49 +229,24 @@ class ConversionTool:
         else:
             return
 
-        # Try to find image in any of the possible directories
-        img_path = None
-        for img_dir in possible_dirs:
-            test_path = os.path.join(img_dir, f"{artnr}.png")
-            if os.path.exists(test_path):
-                img_path = test_path
-                break
+        # Try to find image in any of the possible directories (in the background)
+        img_paths = [os.path.join(img_dir, f"{artnr}.png") for img_dir in possible_dirs]
 
-        if not img_path:
-            self.image_label.config(text=f"⚠️ Bild nicht gefunden: {artnr}.png")
-            return
+        def on_ready(photo, error):
+            if photo is not None:
+                self.current_image = photo  # Keep reference
 
-        try:
-            # Load image
-            img = Image.open(img_path)
-
-            # For Alvaris: crop to upper 70%
-            if source_type == 'alvaris':
-                width, height = img.size
-                crop_height = int(height * 0.7)
-                img = img.crop((0, 0, width, crop_height))
-
-            # Resize to fit display (max 300px wide, maintain aspect ratio)
-            max_width = 300
-            max_height = 250
-            width, height = img.size
-
-            # Scale to fit within bounds
-            ratio = min(max_width / width, max_height / height)
-            if ratio < 1:
-                new_width = int(width * ratio)
-                new_height = int(height * ratio)
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-
-            # Convert to PhotoImage
-            photo = ImageTk.PhotoImage(img)
-            self.current_image = photo  # Keep reference
-
-            # Display
-            self.image_label.config(image=photo, text='')
+                # Display
+                self.image_label.config(image=photo, text='')
+            elif error:
+                self.image_label.config(text=f"⚠️ Fehler beim Laden: {error}")
+            else:
+                self.image_label.config(text=f"⚠️ Bild nicht gefunden: {artnr}.png")
 
-        except Exception as e:
-            self.image_label.config(text=f"⚠️ Fehler beim Laden: {e}")
+        # For Alvaris: crop to upper 70%
+        # Resize to fit display (max 300px wide, maintain aspect ratio)
+        crop_top = 0.7 if source_type == 'alvaris' else None
+        self.images.show(img_paths, (300, 250), on_ready, crop_top)
 
     def validate_conversion(self, from_col, to_col, mode):
         """Validate if conversion is allowed based on rules"""
@@ -302,21 +292,19 @@ class ConversionTool:
                 import time
                 time.sleep(2)  # Slow down
 
-        # Search in data
-        row_data = self.data.get(from_col, {}).get(search_value)
+        # Search in data (all rows with this number)
+        rows = self.data.lookup(from_col, search_value)
 
-        if not row_data:
+        if not rows:
             self.result_text.insert(tk.END, f"❌ '{search_value}' nicht gefunden in Spalte {from_col}\n")
             self.status_label.config(text="Nicht gefunden")
             return
 
-        # Get result
-        if to_col in ['F', 'G']:  # Alvaris special case
-            artnr = row_data.get('F', '-')
-            matnr = row_data.get('G', '-')
-            result = f"{artnr} / {matnr}"
-        else:
-            result = row_data.get(to_col, '-')
+        # Get result (distinct values over all rows; Alvaris as Artnr / Matnr)
+        result = self.data.result_text(rows, to_col)
+        row_data = rows[0]
+        if len(rows) > 1:
+            result += f"  ({len(rows)} Zeilen)"
 
         # Get description
         description = row_data.get('C', '')
@@ -391,20 +379,13 @@ class ConversionTool:
         found_count = 0
         not_found_count = 0
 
-        for search_value in lines:
-            # Try to find in any searchable column
-            row_data = None
-            found_col = None
-
-            for col in ['A', 'B', 'D', 'E', 'F', 'H']:
-                if search_value in self.data.get(col, {}):
-                    row_data = self.data[col][search_value]
-                    found_col = col
-                    break
+        for item in self.data.batch_convert(lines, target_col):
+            search_value = item['value']
+            rows = item['rows']
 
-            if row_data:
-                result = row_data.get(target_col, '-')
-                description = row_data.get('C', '').replace(';', ' | ')
+            if rows:
+                result = self.data.result_text(rows, target_col)
+                description = rows[0].get('C', '').replace(';', ' | ')
 
                 self.batch_text.insert(tk.END, f"✓ {search_value} → {result}\n")
                 if description:
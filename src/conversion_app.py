@@ -1,9 +1,13 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from openpyxl import load_workbook
 import os
-from collections import defaultdict
-from PIL import Image, ImageTk
+import sys
+import threading
+from image_service import ImageService
+
+# Gemeinsamer Portfolio-Loader (api/portfolio_index.py), auch von der API verwendet
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api'))
+from portfolio_index import PortfolioIndex  # noqa: E402
 
 # Syskomp Colors
 SYSKOMP_GREEN = "#409f95"
@@ -34,7 +38,7 @@ class ConversionApp:
         self.root.configure(bg=BG_WHITE)
 
         # Data
-        self.data = defaultdict(dict)
+        self.data = PortfolioIndex()
         self.column_names = {
             'A': 'Syskomp neu', 'B': 'Syskomp alt', 'C': 'Beschreibung',
             'D': 'Item', 'E': 'Bosch', 'F': 'Alvaris Art',
@@ -42,6 +46,7 @@ class ConversionApp:
         }
         self.request_count = 0
         self.current_image = None
+        self.images = ImageService(root)  # Background loading + LRU of resized images
 
         # Header
         header = tk.Frame(root, bg=SYSKOMP_GREEN, height=30)
@@ -218,25 +223,22 @@ class ConversionApp:
         if not os.path.exists(filepath):
             return
 
-        try:
-            wb = load_workbook(filepath, data_only=True)
-            ws = wb.active
-            self.data.clear()
-
-            for row_idx in range(2, ws.max_row + 1):
-                row_dict = {}
-                for col_idx, col_letter in enumerate(['A','B','C','D','E','F','G','H'], start=1):
-                    cell_value = ws.cell(row=row_idx, column=col_idx).value
-                    row_dict[col_letter] = str(cell_value).strip() if cell_value else ""
+        self.status_label.config(text="Lade Portfolio...")
+        threading.Thread(target=self.run_load_data, args=(filepath,), daemon=True).start()
 
-                for col_letter in ['A','B','D','E','F','H']:
-                    value = row_dict.get(col_letter, "")
-                    if value:
-                        self.data[col_letter][value] = row_dict
+    def run_load_data(self, filepath):
+        # Worker thread: parse (or snapshot) off the Tk thread
+        try:
+            data = PortfolioIndex.load(filepath)
+        except Exception as e:
+            print(f"Portfolio konnte nicht geladen werden: {e}")
+            self.root.after(0, lambda: self.status_label.config(text="Bereit | Portfolio nicht geladen"))
+            return
+        self.root.after(0, self.on_data_loaded, data)
 
-            self.status_label.config(text=f"Bereit | {ws.max_row-1} Zeilen geladen")
-        except:
-            pass
+    def on_data_loaded(self, data):
+        self.data = data
+        self.status_label.config(text=f"Bereit | {data.row_count} Zeilen geladen")
 
     def get_col_letter(self, selection):
         return selection.split(':')[0].strip()
@@ -272,16 +274,14 @@ class ConversionApp:
                 import time
                 time.sleep(2)
 
-        row_data = self.data.get(from_col, {}).get(search_value)
-        if not row_data:
+        rows = self.data.lookup(from_col, search_value)
+        if not rows:
             self.result_text.insert(1.0, f"✗ '{search_value}' nicht gefunden")
             self.status_label.config(text="Nicht gefunden")
             return
 
-        if to_col in ['F','G']:
-            result = f"{row_data.get('F','-')} / {row_data.get('G','-')}"
-        else:
-            result = row_data.get(to_col, '-')
+        result = self.data.result_text(rows, to_col)
+        row_data = rows[0]
 
         desc = row_data.get('C','').replace(';','\n')
 
@@ -305,6 +305,7 @@ class ConversionApp:
     def show_image(self, artnr, source_type):
         self.image_label.config(image='', text='')
         self.current_image = None
+        self.images.cancel()
 
         if not artnr or artnr == '-':
             return
@@ -325,35 +326,14 @@ class ConversionApp:
                 os.path.join(script_dir, "ALVARIS_CATALOG", "alvaris-all-images"),
             ]
 
-        img_path = None
-        for img_dir in possible_dirs:
-            test_path = os.path.join(img_dir, f"{artnr}.png")
-            if os.path.exists(test_path):
-                img_path = test_path
-                break
-
-        if not img_path:
-            return
-
-        try:
-            img = Image.open(img_path)
-
-            if source_type == 'alvaris':
-                width, height = img.size
-                crop_height = int(height * 0.7)
-                img = img.crop((0, 0, width, crop_height))
-
-            max_width, max_height = 250, 220
-            width, height = img.size
-            ratio = min(max_width / width, max_height / height)
-            if ratio < 1:
-                img = img.resize((int(width * ratio), int(height * ratio)), Image.Resampling.LANCZOS)
+        def on_ready(photo, error):
+            if photo is not None:
+                self.current_image = photo
+                self.image_label.config(image=photo)
 
-            photo = ImageTk.PhotoImage(img)
-            self.current_image = photo
-            self.image_label.config(image=photo)
-        except:
-            pass
+        img_paths = [os.path.join(img_dir, f"{artnr}.png") for img_dir in possible_dirs]
+        crop_top = 0.7 if source_type == 'alvaris' else None
+        self.images.show(img_paths, (250, 220), on_ready, crop_top)
 
     def load_batch_file(self):
         filepath = filedialog.askopenfilename(
@@ -383,16 +363,11 @@ class ConversionApp:
         self.batch_text.insert(1.0, "Batch Ergebnisse:\n" + "="*50 + "\n\n")
 
         found, not_found = 0, 0
-        for search_value in lines:
-            row_data = None
-            for col in ['A','B','D','E','F','H']:
-                if search_value in self.data.get(col, {}):
-                    row_data = self.data[col][search_value]
-                    break
-
-            if row_data:
-                result = row_data.get(target_col, '-')
-                desc = row_data.get('C','').replace(';',' | ')
+        for item in self.data.batch_convert(lines, target_col):
+            search_value = item['value']
+            if item['rows']:
+                result = self.data.result_text(item['rows'], target_col)
+                desc = item['rows'][0].get('C','').replace(';',' | ')
                 self.batch_text.insert(tk.END, f"✓ {search_value} → {result}\n  {desc}\n\n")
                 found += 1
             else:
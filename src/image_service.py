@@ -0,0 +1,210 @@
+"""
+Background image loading for the Tk tools (mapper, conversion, conversion_app)
+
+Opening a PNG (often on the network share), cropping and resizing it used to
+happen on the Tk thread for every navigation. ImageService does that work in
+worker threads and keeps the resized images in an LRU bounded by memory:
+
+    images = ImageService(root)
+    images.show(paths, (260, 260), on_ready)        # on_ready(photo, error) on the Tk thread
+    images.prefetch([(paths, (260, 260)), ...])     # warm the cache for next/previous products
+
+`paths` are candidate files; the first existing one is used. A cached image is
+delivered immediately, without any disk access on the Tk thread. Missing
+images and load errors are cached for NEGATIVE_TTL seconds only: quick
+back-and-forth navigation does not hit the share again, but a short SMB
+hiccup does not hide a picture for the rest of the session.
+
+Workers only ever touch PIL images. Tk photos live in a second LRU that only
+the Tk thread uses: a PhotoImage deletes its Tcl image when it is freed, and
+doing that from a worker either blocks on the Tk thread (threaded Tcl) or
+fails and leaks the image.
+"""
+
+import itertools
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+# Upper bound for decoded images kept in memory (PIL image + Tk photo)
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# Seconds a missing or unreadable image counts as such before it is looked up again
+NEGATIVE_TTL = 30.0
+
+
+def load_resized(path, max_size, crop_top=None):
+    """Open an image, optionally keep only the upper part, shrink it to fit max_size"""
+    img = Image.open(path)
+    if crop_top:
+        width, height = img.size
+        img = img.crop((0, 0, width, int(height * crop_top)))
+
+    max_width, max_height = max_size
+    width, height = img.size
+    ratio = min(max_width / width, max_height / height)
+    if ratio < 1:
+        img = img.resize((int(width * ratio), int(height * ratio)), Image.Resampling.LANCZOS)
+    img.load()  # Decode now (in the worker), not lazily on the Tk thread
+    return img
+
+
+def _pixel_bytes(image):
+    return image.width * image.height * len(image.getbands())
+
+
+class _Entry:
+    __slots__ = ('image', 'error', 'size', 'expires')
+
+    def __init__(self, image=None, error=None):
+        self.image = image    # PIL image, None if missing or failed
+        self.error = error    # Error text if loading failed
+        self.size = 256
+        self.expires = None   # time.monotonic() after which a missing/failed entry is retried
+        if image is not None:
+            self.size += _pixel_bytes(image)
+        else:
+            self.expires = time.monotonic() + NEGATIVE_TTL
+
+
+class ImageService:
+    def __init__(self, root, max_bytes=DEFAULT_CACHE_BYTES, workers=2):
+        self.root = root
+        # Half of the budget for decoded PIL images, half for Tk photos
+        self.max_bytes = max_bytes // 2
+        self.cache = OrderedDict()  # key -> _Entry (most recently used last), shared with the workers
+        self.cache_bytes = 0
+        self.photos = OrderedDict()  # key -> (ImageTk.PhotoImage, bytes); Tk thread only
+        self.photo_bytes = 0
+        self.lock = threading.Lock()
+        self.tasks = queue.PriorityQueue()
+        self.pending = set()        # Keys queued or being loaded
+        self.counter = itertools.count()
+        self.callbacks = {}         # key -> on_ready of the newest show() for that key
+        self.wanted = None          # Key of the newest show(); older requests are dropped
+
+        for _ in range(workers):
+            threading.Thread(target=self._worker, daemon=True).start()
+
+    @staticmethod
+    def key(paths, max_size, crop_top=None):
+        return tuple(paths), tuple(max_size), crop_top
+
+    def show(self, paths, max_size, on_ready, crop_top=None):
+        """Deliver the image as on_ready(photo, error) on the Tk thread.
+
+        photo is None if no candidate exists (error None) or loading failed
+        (error set). Only the newest show() gets its callback.
+        """
+        key = self.key(paths, max_size, crop_top)
+        self.wanted = key
+        with self.lock:
+            entry = self._cached(key)
+            if entry is not None:
+                self.cache.move_to_end(key)
+        if entry is not None:
+            self._deliver(key, entry, on_ready)
+            return
+
+        self.callbacks[key] = on_ready
+        self._submit(key, priority=0)
+
+    def prefetch(self, requests):
+        """Queue (paths, max_size[, crop_top]) requests behind any visible image"""
+        for request in requests:
+            key = self.key(*request)
+            with self.lock:
+                cached = self._cached(key) is not None
+            if not cached:
+                self._submit(key, priority=1)
+
+    def cancel(self):
+        """Drop the pending show() (e.g. the widget now shows something else)"""
+        self.wanted = None
+
+    def clear(self):
+        """Drop all cached images (call on the Tk thread)"""
+        with self.lock:
+            self.cache.clear()
+            self.cache_bytes = 0
+        self.photos.clear()
+        self.photo_bytes = 0
+
+    def _submit(self, key, priority):
+        with self.lock:
+            if key in self.pending:
+                if priority == 0:
+                    # Already queued as prefetch: queue again in front, the second run is a cache hit
+                    self.tasks.put((priority, next(self.counter), key))
+                return
+            self.pending.add(key)
+        self.tasks.put((priority, next(self.counter), key))
+
+    def _worker(self):
+        while True:
+            priority, _, key = self.tasks.get()
+            with self.lock:
+                entry = self._cached(key)
+            if entry is None:
+                entry = self._load(key)
+                self._store(key, entry)
+            with self.lock:
+                self.pending.discard(key)
+            if priority == 0:
+                self.root.after(0, self._on_loaded, key, entry)
+
+    def _load(self, key):
+        paths, max_size, crop_top = key
+        for path in paths:
+            if path and os.path.exists(path):
+                try:
+                    return _Entry(load_resized(path, max_size, crop_top))
+                except Exception as e:
+                    return _Entry(error=str(e))
+        return _Entry()
+
+    def _cached(self, key):
+        """Cache entry for key, None if absent or an expired negative entry (hold self.lock)"""
+        entry = self.cache.get(key)
+        if entry is not None and entry.expires is not None and time.monotonic() >= entry.expires:
+            del self.cache[key]
+            self.cache_bytes -= entry.size
+            return None
+        return entry
+
+    def _store(self, key, entry):
+        with self.lock:
+            if self._cached(key) is not None:
+                return
+            self.cache[key] = entry
+            self.cache_bytes += entry.size
+            while self.cache_bytes > self.max_bytes and len(self.cache) > 1:
+                _, evicted = self.cache.popitem(last=False)
+                self.cache_bytes -= evicted.size
+
+    def _on_loaded(self, key, entry):
+        on_ready = self.callbacks.pop(key, None)
+        if on_ready is not None and key == self.wanted:
+            self._deliver(key, entry, on_ready)
+
+    def _deliver(self, key, entry, on_ready):
+        # Tk thread: the only place photos are created and evicted (freed)
+        photo = None
+        if entry.image is not None:
+            cached = self.photos.get(key)
+            if cached is not None:
+                self.photos.move_to_end(key)
+                photo = cached[0]
+            else:
+                photo = ImageTk.PhotoImage(entry.image)
+                size = _pixel_bytes(entry.image)
+                self.photos[key] = (photo, size)
+                self.photo_bytes += size
+                while self.photo_bytes > self.max_bytes and len(self.photos) > 1:
+                    _, (_, evicted_size) = self.photos.popitem(last=False)
+                    self.photo_bytes -= evicted_size
+        on_ready(photo, entry.error)
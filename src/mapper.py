@@ -3,10 +3,388 @@ from tkinter import ttk, filedialog, messagebox
 import csv
 import os
 import re
+import gzip
+import json
+import queue
+import hashlib
+import multiprocessing
+import heapq
+import threading
+import time
 import webbrowser
+from array import array
+from collections import Counter, OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from difflib import SequenceMatcher
-from PIL import Image, ImageTk
+from share_mirror import NETWORK_BASE, ShareMirror, is_remote
+from image_service import ImageService
+
+# Number of matches shown in the listbox
+MAX_MATCHES = 20
+# Scored ASK descriptions kept in memory (switching back and forth is instant)
+MATCH_CACHE_SIZE = 200
+# The worker checks for newer requests after this many Syskomp rows
+CANCEL_CHECK_EVERY = 500
+
+# Character n-gram length for the scoring order
+NGRAM_SIZE = 3
+# Sidecar file with precomputed matches, next to the ASK CSV
+PRECOMPUTE_SUFFIX = ".matches.json.gz"
+PRECOMPUTE_VERSION = 1
+# ASK product image: fit into 260x260 (30% bigger than 200x200)
+IMAGE_SIZE = (260, 260)
+# Images loaded ahead for the next/previous products
+IMAGE_PREFETCH = 5
+# Description filter runs this long after the last key press
+FILTER_DEBOUNCE_MS = 200
+# Autosave file columns; the file is an append-only journal (one line per "Passt")
+MAPPING_FIELDS = ['ASK_Artikelnummer', 'ASK_Beschreibung', 'Syskomp_Artikelnummer', 'Syskomp_Beschreibung']
+# Rewrite the autosave file once this many lines are superseded by newer mappings
+COMPACT_AFTER = 100
+
+PROFIL_NUMBER = re.compile(r'profil\s*(\d+)', re.IGNORECASE)
+NUT_NUMBER = re.compile(r'nut\s*(\d+)', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+
+
+def ngrams(text):
+    """Set of character n-grams of each word (padded, so word starts/ends count)"""
+    grams = set()
+    for token in text.split():
+        padded = f" {token} "
+        for i in range(len(padded) - NGRAM_SIZE + 1):
+            grams.add(padded[i:i + NGRAM_SIZE])
+    return grams
+
+
+class SyskompIndex:
+    """Syskomp products preprocessed once per load for fast matching.
+
+    Only rows with a valid 9-digit Syskomp number and a description are kept.
+    Per row: numbers, description (original and lowercased), type filter flags
+    and the n-gram count. An inverted index n-gram -> rows orders the rows by
+    how many n-grams they share with an ASK description, so score_description
+    meets the good matches first and can skip the rest by an upper bound.
+    """
+
+    def __init__(self, products, filter_product):
+        self.syskomp_nrs = []
+        self.bosch_item_nrs = []
+        self.descriptions = []
+        self.descriptions_lower = []
+        self.is_item = bytearray()   # Matches the "Item" type filter
+        self.is_bosch = bytearray()  # Matches the "Bosch" type filter
+        self.gram_counts = array('H')
+        self.ngram_index = {}
+        self.profil_rows = {}  # "Profil X" in description -> rows
+        self.nut_rows = {}     # "Nut X" in description -> rows
+
+        for product in products:
+            syskomp_desc = str(product.get('Artikelbezeichnung', '') or '').strip()
+            bosch_item_nr = str(product.get('Materialnr.', '') or '').strip()
+            syskomp_nr = str(product.get('Unnamed: 1', '') or '').strip()
+
+            # Only products that have a valid 9-digit Syskomp number
+            if not (syskomp_nr and syskomp_nr.isdigit() and len(syskomp_nr) >= 9):
+                continue
+            if not syskomp_desc:
+                continue
+
+            row = len(self.syskomp_nrs)
+            desc_lower = syskomp_desc.lower()
+            self.syskomp_nrs.append(syskomp_nr)
+            self.bosch_item_nrs.append(bosch_item_nr)
+            self.descriptions.append(syskomp_desc)
+            self.descriptions_lower.append(desc_lower)
+            self.is_item.append(bool(filter_product(bosch_item_nr, syskomp_nr, "item")))
+            self.is_bosch.append(bool(filter_product(bosch_item_nr, syskomp_nr, "bosch")))
+
+            grams = ngrams(WHITESPACE.sub(' ', desc_lower))
+            self.gram_counts.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                rows = self.ngram_index.get(gram)
+                if rows is None:
+                    rows = self.ngram_index[gram] = array('I')
+                rows.append(row)
+
+            for pattern, rows_by_number in ((PROFIL_NUMBER, self.profil_rows), (NUT_NUMBER, self.nut_rows)):
+                match = pattern.search(desc_lower)
+                if match:
+                    rows_by_number.setdefault(match.group(1), []).append(row)
+
+    def __len__(self):
+        return len(self.syskomp_nrs)
+
+    def bonus_rows(self, ask_description):
+        """Rows that get the Profil X <-> Nut X bonus (same rule as calculate_similarity)"""
+        rows = set()
+        profil_match = PROFIL_NUMBER.search(ask_description)
+        if profil_match:
+            rows.update(self.nut_rows.get(profil_match.group(1), ()))
+        nut_match = NUT_NUMBER.search(ask_description)
+        if nut_match:
+            rows.update(self.profil_rows.get(nut_match.group(1), ()))
+        return rows
+
+    def scoring_order(self, ask_description, bonus_rows):
+        """All rows, most promising first: bonus rows, then by shared n-grams (Dice), then the rest"""
+        grams = ngrams(WHITESPACE.sub(' ', ask_description))
+        shared = Counter()
+        for gram in grams:
+            rows = self.ngram_index.get(gram)
+            if rows is not None:
+                shared.update(rows)
+
+        ask_count = len(grams)
+        gram_counts = self.gram_counts
+        by_overlap = sorted(shared, key=lambda row: shared[row] / (ask_count + gram_counts[row]), reverse=True)
+
+        order = list(bonus_rows)
+        order.extend(row for row in by_overlap if row not in bonus_rows)
+        order.extend(row for row in range(len(self)) if row not in shared and row not in bonus_rows)
+        return order
+
+
+def parse_filter_keywords(filter_text):
+    """Split the description filter into keywords.
+
+    Keywords are space-separated, quoted phrases keep their spaces ("profil " nut).
+    Leading/trailing spaces are auto-expanded with wildcards:
+    "profil " -> "*profil " (finds PROFIL, ALUMINIUMPROFIL, etc.)
+    " nut" -> " nut*" (finds NUT, NUTENSTEIN, etc.)
+    """
+    keywords = []
+    current_word = []
+    in_quotes = False
+
+    for char in filter_text:
+        if char == '"':
+            if in_quotes:
+                # End of quoted phrase
+                keywords.append(''.join(current_word))
+                current_word = []
+                in_quotes = False
+            else:
+                # Start of quoted phrase
+                in_quotes = True
+        elif char == ' ' and not in_quotes:
+            # Space outside quotes - word separator
+            if current_word:
+                keywords.append(''.join(current_word))
+                current_word = []
+        else:
+            # Regular character
+            current_word.append(char)
+
+    # Add last word/phrase
+    if current_word:
+        keywords.append(''.join(current_word))
+
+    expanded_keywords = []
+    for keyword in keywords:
+        expanded = keyword
+
+        # Add wildcard before if ends with space and doesn't start with *
+        if expanded.endswith(' ') and not expanded.startswith('*'):
+            expanded = '*' + expanded
+
+        # Add wildcard after if starts with space and doesn't end with *
+        if expanded.startswith(' ') and not expanded.endswith('*'):
+            expanded = expanded + '*'
+
+        expanded_keywords.append(expanded)
+
+    return expanded_keywords
+
+
+@lru_cache(maxsize=128)
+def compile_description_filter(filter_text):
+    """One compiled regex per keyword (all must match); * is a wildcard, the rest is literal"""
+    return tuple(re.compile(re.escape(keyword.lower()).replace(r'\*', '.*'))
+                 for keyword in parse_filter_keywords(filter_text))
+
+
+def calculate_similarity(text1, text2):
+    """Calculate similarity between two strings using SequenceMatcher with special rules"""
+    # Base similarity
+    base_similarity = SequenceMatcher(None, text1, text2).ratio()
+
+    # Bonus for "Profil X" matching "Nut X"
+    bonus = 0.0
+
+    # Find "profil" followed by a number in text1
+    profil_match = PROFIL_NUMBER.search(text1)
+    # Find "nut" followed by a number in text2
+    nut_match = NUT_NUMBER.search(text2)
+
+    if profil_match and nut_match:
+        # Check if the numbers match
+        profil_num = profil_match.group(1)
+        nut_num = nut_match.group(1)
+
+        if profil_num == nut_num:
+            # Strong bonus if Profil X matches Nut X
+            bonus = 0.3  # 30% bonus
+
+    # Also check the reverse: "nut" in text1, "profil" in text2
+    nut_match1 = NUT_NUMBER.search(text1)
+    profil_match2 = PROFIL_NUMBER.search(text2)
+
+    if nut_match1 and profil_match2:
+        nut_num1 = nut_match1.group(1)
+        profil_num2 = profil_match2.group(1)
+
+        if nut_num1 == profil_num2:
+            bonus = 0.3
+
+    # Cap final similarity at 1.0
+    final_similarity = min(1.0, base_similarity + bonus)
+
+    return final_similarity
+
+
+def score_description(index, ask_description, is_stale=None):
+    """Score the Syskomp products against one (lowercased) ASK description.
+
+    Returns the best MAX_MATCHES per type filter ("all", "item", "bosch"),
+    sorted by similarity. The similarity threshold only cuts off the end of
+    these lists, so they answer every slider position. Returns None as soon
+    as is_stale() reports a newer request.
+
+    Exact, but most rows never reach SequenceMatcher.ratio(): a row is skipped
+    when an upper bound of its score (real_quick_ratio from the lengths, then
+    quick_ratio from the character counts, plus the Profil/Nut bonus) is below
+    the current MAX_MATCHES-th score of every list it can appear in.
+    """
+    bonus_rows = index.bonus_rows(ask_description)
+    ask_length = len(ask_description)
+    ask_chars = Counter(ask_description).items()
+    descriptions = index.descriptions_lower
+    is_item, is_bosch = index.is_item, index.is_bosch
+
+    scores = {}
+    best = {"all": [], "item": [], "bosch": []}  # Min-heaps of the best scores so far
+    floor = {"all": -1.0, "item": -1.0, "bosch": -1.0}  # Score to beat once a list is full
+
+    for count, row in enumerate(index.scoring_order(ask_description, bonus_rows)):
+        if is_stale and count % CANCEL_CHECK_EVERY == 0 and is_stale():
+            return None
+
+        lists = ["all"]
+        if is_item[row]:
+            lists.append("item")
+        if is_bosch[row]:
+            lists.append("bosch")
+        threshold = min(floor[name] for name in lists)
+
+        description = descriptions[row]
+        if threshold > 0:
+            bonus = 0.3 if row in bonus_rows else 0.0
+            total_length = ask_length + len(description)
+            # ratio() = 2*M/T with M matched characters; M <= shorter length <= shared characters
+            if 2.0 * min(ask_length, len(description)) / total_length + bonus < threshold:
+                continue
+            row_chars = Counter(description)
+            shared_chars = sum(min(n, row_chars[char]) for char, n in ask_chars)
+            if 2.0 * shared_chars / total_length + bonus < threshold:
+                continue
+
+        score = scores[row] = calculate_similarity(ask_description, description)
+        for name in lists:
+            heap = best[name]
+            if len(heap) < MAX_MATCHES:
+                heapq.heappush(heap, score)
+            elif score > heap[0]:
+                heapq.heapreplace(heap, score)
+            if len(heap) == MAX_MATCHES:
+                floor[name] = heap[0]
+
+    top_matches = {}
+    for filter_type, flags in (("all", None), ("item", index.is_item), ("bosch", index.is_bosch)):
+        rows = scores if flags is None else [row for row in scores if flags[row]]
+        # Ties keep file order
+        best = heapq.nsmallest(MAX_MATCHES, rows, key=lambda row: (-scores[row], row))
+        top_matches[filter_type] = [{
+            'syskomp_nr': index.syskomp_nrs[row],
+            'bosch_item_nr': index.bosch_item_nrs[row],
+            'artnr': index.bosch_item_nrs[row] or index.syskomp_nrs[row],  # For saving/selecting
+            'description': index.descriptions[row],
+            'similarity': scores[row]
+        } for row in best]
+    return top_matches
+
+
+def file_hash(path):
+    """SHA-256 of a file's content (cache key for precomputed matches)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_precomputed_matches(path, ask_hash, syskomp_hash):
+    """Read a precompute sidecar file; empty dict if missing or made for other CSVs"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception as e:
+        print(f"Fehler beim Lesen der vorberechneten Matches: {e}")
+        return {}
+
+    if (data.get('version') != PRECOMPUTE_VERSION or data.get('ask_hash') != ask_hash
+            or data.get('syskomp_hash') != syskomp_hash or data.get('max_matches') != MAX_MATCHES):
+        print(f"Vorberechnete Matches veraltet (CSV geändert): {path}")
+        return {}
+
+    fields = ('syskomp_nr', 'bosch_item_nr', 'description', 'similarity')
+    matches = {}
+    for key, by_type in data['matches'].items():
+        matches[key] = {}
+        for filter_type, rows in by_type.items():
+            entries = [dict(zip(fields, row)) for row in rows]
+            for entry in entries:
+                entry['artnr'] = entry['bosch_item_nr'] or entry['syskomp_nr']
+            matches[key][filter_type] = entries
+    return matches
+
+
+def save_precomputed_matches(path, ask_hash, syskomp_hash, matches):
+    """Write the sidecar file atomically (compact rows instead of dicts)"""
+    data = {
+        'version': PRECOMPUTE_VERSION,
+        'ask_hash': ask_hash,
+        'syskomp_hash': syskomp_hash,
+        'max_matches': MAX_MATCHES,
+        'matches': {
+            key: {
+                filter_type: [[m['syskomp_nr'], m['bosch_item_nr'], m['description'], m['similarity']] for m in entries]
+                for filter_type, entries in by_type.items()
+            }
+            for key, by_type in matches.items()
+        },
+    }
+    tmp_path = path + '.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+# Index of the current precompute worker process (set once by the pool initializer)
+_worker_index = None
+
+
+def _init_precompute_worker(index):
+    global _worker_index
+    _worker_index = index
+
+
+def _precompute_description(ask_description):
+    return ask_description, score_description(_worker_index, ask_description)
+
 
 class ProductMapper:
     def __init__(self, root):
@@ -17,8 +395,16 @@ class ProductMapper:
         # Data storage
         self.ask_products = []
         self.filtered_ask_products = []  # Filtered by description
+        self.filtered_ask_indices = []   # Positions of filtered_ask_products in ask_products
+        self.ask_descriptions_lower = []  # Lowercased ASK descriptions for the filter
+        self.active_filter_text = ""     # Filter text of the current filtered list
+        self.filter_after_id = None      # Pending debounced filter run
         self.syskomp_products = []
-        self.mappings = []
+        self.syskomp_index = None  # SyskompIndex of syskomp_products
+        self.syskomp_by_materialnr = {}  # 'Materialnr.' -> first row in syskomp_products
+        self.syskomp_by_nr = {}          # 'Unnamed: 1' (Syskomp number) -> first row in syskomp_products
+        self.mappings = {}               # ASK article number -> its (latest) mapping, in first-mapped order
+        self.journal_rows = 0            # Data lines in the autosave file (incl. superseded ones)
         self.current_index = 0
         self.ask_file = None
         self.syskomp_file = None
@@ -27,15 +413,38 @@ class ProductMapper:
         self.description_filter = ""  # Filter text for ASK description
         self.current_product_url = None  # URL of current ASK product
 
+        # Local copies of the network share files; the share is only checked in the background
+        self.mirror = ShareMirror()
+        self.share_available = False  # Set once a background scan reached the share
+        self.mirror_reload_pending = False
+
+        # Resized product images (loaded in the background, LRU)
+        self.images = ImageService(root)
+
+        # Background scoring: only the newest request (generation) is shown,
+        # older ones are cancelled by the worker
+        self.match_generation = 0
+        self.match_cache = OrderedDict()  # lowercased ASK description -> top matches per type filter
+        self.match_queue = queue.Queue()
+        self.match_thread = threading.Thread(target=self.match_worker, daemon=True)
+        self.match_thread.start()
+
+        # Optional precompute of all ASK products (multiprocessing, sidecar cache file)
+        self.precomputed_matches = {}  # lowercased ASK description -> top matches per type filter
+        self.precompute_cancel = None  # threading.Event of the running precompute
+
         self.create_ui()
 
+        # Catalog list from the share (the window starts with the last known list)
+        self.refresh_csv_lists()
+
     def create_ui(self):
         # Top: File selection
         file_frame = ttk.LabelFrame(self.root, text="Dateien auswählen", padding=10)
         file_frame.pack(fill="x", padx=10, pady=5)
 
-        # Scan for CSV files in catalog directories
-        self.ask_csv_files = self.scan_catalog_csvs()
+        # CSV files in catalog directories (last known network listing + local folders)
+        self.ask_csv_files = self.scan_catalog_csvs(use_network=False)
 
         # ASK file dropdown
         ask_frame = ttk.Frame(file_frame)
@@ -59,8 +468,13 @@ class ProductMapper:
         self.syskomp_file_entry.insert(0, default_syskomp)
         ttk.Button(syskomp_frame, text="Durchsuchen...", command=self.browse_syskomp_file).pack(side="left")
 
-        # Load button
-        ttk.Button(file_frame, text="▶ Laden", command=self.load_files).pack(pady=5)
+        # Load button and precompute option
+        load_frame = ttk.Frame(file_frame)
+        load_frame.pack(pady=5)
+        ttk.Button(load_frame, text="▶ Laden", command=self.load_files).pack(side="left", padx=5)
+        self.precompute_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(load_frame, text="Alle Matches vorberechnen (alle CPU-Kerne)",
+                        variable=self.precompute_var).pack(side="left", padx=5)
 
         # Search field for ASK Article Number
         search_frame = ttk.Frame(self.root)
@@ -76,7 +490,7 @@ class ProductMapper:
         ttk.Label(search_frame, text="  |  Filter Beschreibung:").pack(side="left", padx=(20, 5))
         self.desc_filter_entry = ttk.Entry(search_frame, width=30)
         self.desc_filter_entry.pack(side="left", padx=5)
-        self.desc_filter_entry.bind("<KeyRelease>", lambda e: self.apply_description_filter())
+        self.desc_filter_entry.bind("<KeyRelease>", self.schedule_description_filter)
         ttk.Button(search_frame, text="✖ Löschen", command=self.clear_description_filter).pack(side="left", padx=5)
 
         # Filter help text
@@ -185,6 +599,10 @@ class ProductMapper:
         self.status_label = ttk.Label(nav_frame, text="", foreground="green")
         self.status_label.pack(side="left", padx=10)
 
+        # Precompute progress
+        self.precompute_label = ttk.Label(nav_frame, text="", foreground="gray", font=("Arial", 9))
+        self.precompute_label.pack(side="right", padx=10)
+
         # Autosave file info
         self.autosave_info_label = ttk.Label(nav_frame, text="", foreground="blue", font=("Arial", 9))
         self.autosave_info_label.pack(side="right", padx=10)
@@ -192,12 +610,12 @@ class ProductMapper:
         # Export button
         ttk.Button(nav_frame, text="💾 Export CSV", command=self.export_mappings).pack(side="right", padx=5)
 
-    def scan_catalog_csvs(self):
-        r"""Scan network path \\sys-ts19-1\c$\ArtNrConverter\*catalog*\ for CSV files"""
+    def scan_network_catalogs(self):
+        r"""Scan network path \\sys-ts19-1\c$\ArtNrConverter\*catalog*\ for CSV files (slow on SMB)"""
         csv_files = []
 
         # Network base path
-        base_path = r"\\sys-ts19-1\c$\ArtNrConverter"
+        base_path = NETWORK_BASE
 
         try:
             if os.path.exists(base_path):
@@ -214,9 +632,22 @@ class ProductMapper:
                                     csv_files.append(full_path)
                         except Exception as e:
                             print(f"Error scanning {item_path}: {e}")
+                self.share_available = True
+                self.mirror.store_listing("catalog_csvs", csv_files)
+                return csv_files
         except Exception as e:
             print(f"Error accessing network path {base_path}: {e}")
 
+        # Share unreachable: keep offering what was there last time
+        return self.mirror.cached_listing("catalog_csvs")
+
+    def scan_catalog_csvs(self, use_network=True):
+        """Catalog CSVs from the share (or its cached listing) plus the local catalog folders"""
+        if use_network:
+            csv_files = self.scan_network_catalogs()
+        else:
+            csv_files = self.mirror.cached_listing("catalog_csvs")
+
         # Fallback: Also scan local directories if network path is unavailable
         script_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -241,18 +672,26 @@ class ProductMapper:
         return csv_files
 
     def refresh_csv_lists(self):
-        """Refresh the CSV file list"""
-        self.ask_csv_files = self.scan_catalog_csvs()
+        """Refresh the CSV file list (network scan in the background)"""
+        def run():
+            csv_files = self.scan_catalog_csvs()
+            self.root.after(0, self.update_csv_list, csv_files)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def update_csv_list(self, csv_files):
+        selected = self.ask_file_combo.get()
+        self.ask_csv_files = csv_files
         self.ask_file_combo['values'] = self.ask_csv_files
-        if self.ask_csv_files:
+        if selected in self.ask_csv_files:
+            self.ask_file_combo.set(selected)
+        elif self.ask_csv_files:
             self.ask_file_combo.current(0)
 
     def browse_ask_file(self):
         """Browse for ASK CSV file manually"""
-        # Start in network path
-        initial_dir = r"\\sys-ts19-1\c$\ArtNrConverter"
-        if not os.path.exists(initial_dir):
-            initial_dir = None
+        # Start in network path (only if the background scan reached it - no blocking check here)
+        initial_dir = NETWORK_BASE if self.share_available else None
 
         filepath = filedialog.askopenfilename(
             title="ASK CSV Datei auswählen",
@@ -268,10 +707,8 @@ class ProductMapper:
             self.ask_file_combo.set(filepath)
 
     def browse_syskomp_file(self):
-        # Start in network path
-        initial_dir = r"\\sys-ts19-1\c$\ArtNrConverter"
-        if not os.path.exists(initial_dir):
-            initial_dir = None
+        # Start in network path (only if the background scan reached it - no blocking check here)
+        initial_dir = NETWORK_BASE if self.share_available else None
 
         filepath = filedialog.askopenfilename(
             title="Syskomp CSV Datei auswählen",
@@ -282,18 +719,22 @@ class ProductMapper:
             self.syskomp_file_entry.delete(0, tk.END)
             self.syskomp_file_entry.insert(0, filepath)
 
-    def load_files(self):
-        ask_file = self.ask_file_combo.get().strip()
-        syskomp_file = self.syskomp_file_entry.get().strip()
+    def load_files(self, ask_file=None, syskomp_file=None):
+        ask_file = ask_file or self.ask_file_combo.get().strip()
+        syskomp_file = syskomp_file or self.syskomp_file_entry.get().strip()
 
         if not ask_file or not syskomp_file:
             messagebox.showerror("Fehler", "Bitte beide CSV-Dateien auswählen.")
             return
 
         try:
+            # Read network files from the local mirror (fetched now only on first use)
+            ask_local = self.mirror.local_path(ask_file)
+            syskomp_local = self.mirror.local_path(syskomp_file)
+
             # Load ASK products
             self.ask_products = []
-            with open(ask_file, 'r', encoding='utf-8') as f:
+            with open(ask_local, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
                 for row in reader:
                     self.ask_products.append(row)
@@ -308,7 +749,7 @@ class ProductMapper:
             # Try different encodings
             for encoding in ['windows-1252', 'iso-8859-1', 'utf-8']:
                 try:
-                    with open(syskomp_file, 'r', encoding=encoding) as f:
+                    with open(syskomp_local, 'r', encoding=encoding) as f:
                         reader = csv.DictReader(f, delimiter=';')
                         for row in reader:
                             self.syskomp_products.append(row)
@@ -318,10 +759,23 @@ class ProductMapper:
                     continue
 
             self.current_index = 0
-            self.mappings = []
+            self.mappings = {}
+            self.build_syskomp_lookup()
+
+            # Preprocess once for matching; cached scores belong to the previous Syskomp file
+            start = time.perf_counter()
+            self.syskomp_index = SyskompIndex(self.syskomp_products, self.filter_product)
+            print(f"Syskomp-Index: {len(self.syskomp_index)} gültige Zeilen, "
+                  f"{len(self.syskomp_index.ngram_index)} N-Gramme in {time.perf_counter() - start:.2f}s")
+            self.match_cache.clear()
+
+            # Precomputed matches from an earlier session (only valid for exactly these two CSVs)
+            self.setup_precompute(ask_local, syskomp_local, os.path.join(parent_dir, csv_name + PRECOMPUTE_SUFFIX))
 
             # Initialize filtered list with all products
-            self.filtered_ask_products = self.ask_products.copy()
+            self.ask_descriptions_lower = [(product.get('Beschreibung') or '').lower() for product in self.ask_products]
+            self.reset_description_filter()
+            self.desc_filter_entry.delete(0, tk.END)
 
             # Setup autosave file
             ask_dir = os.path.dirname(ask_file)
@@ -342,17 +796,83 @@ class ProductMapper:
 
             self.show_current_product()
 
+            # Mirrored copies may be outdated: check the share in the background, reload if newer
+            self.ask_file = ask_file
+            self.syskomp_file = syskomp_file
+            remotes = [path for path in (ask_file, syskomp_file) if is_remote(path)]
+            if remotes:
+                self.mirror.refresh_async(remotes, lambda remote, local: self.root.after(0, self.schedule_mirror_reload))
+
         except Exception as e:
             messagebox.showerror("Fehler", f"Fehler beim Laden der Dateien: {e}")
 
+    def schedule_mirror_reload(self):
+        """A newer version of a loaded file arrived in the mirror (both files changed -> one reload)"""
+        if not self.mirror_reload_pending:
+            self.mirror_reload_pending = True
+            self.root.after(500, self.reload_from_mirror)
+
+    def reload_from_mirror(self):
+        """Reload the current files and return to the product shown before"""
+        self.mirror_reload_pending = False
+        current_artnr = None
+        if self.current_index < len(self.filtered_ask_products):
+            current_artnr = self.filtered_ask_products[self.current_index].get('Artikelnummer')
+
+        print("Neuere Version auf dem Netzlaufwerk - lade neu")
+        self.load_files(self.ask_file, self.syskomp_file)
+
+        for idx, product in enumerate(self.filtered_ask_products):
+            if product.get('Artikelnummer') == current_artnr:
+                self.current_index = idx
+                self.show_current_product()
+                break
+        self.show_status("✓ Neuere Version vom Netzlaufwerk geladen", "blue")
+
+    def build_syskomp_lookup(self):
+        """Index both Syskomp article number columns (first occurrence wins, like a linear scan)"""
+        self.syskomp_by_materialnr = {}
+        self.syskomp_by_nr = {}
+        for row, product in enumerate(self.syskomp_products):
+            bosch_item = str(product.get('Materialnr.', '') or '').strip()
+            syskomp_nr = str(product.get('Unnamed: 1', '') or '').strip()
+            if bosch_item:
+                self.syskomp_by_materialnr.setdefault(bosch_item, row)
+            if syskomp_nr:
+                self.syskomp_by_nr.setdefault(syskomp_nr, row)
+
+    def add_mapping(self, mapping):
+        """Add a mapping; a newer mapping for the same ASK article replaces the old one in place"""
+        self.mappings[mapping.get('ASK_Artikelnummer')] = mapping
+
     def load_existing_mappings(self):
-        """Load existing mappings from autosave file if it exists"""
+        """Replay the autosave journal; later lines win for the same ASK article"""
+        self.journal_rows = 0
         if self.autosave_file and os.path.exists(self.autosave_file):
             try:
                 with open(self.autosave_file, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        self.mappings.append(row)
+                    rows = list(csv.DictReader(f))
+                self.journal_rows = len(rows)
+
+                # Every written line ends with a newline - otherwise the last append was interrupted
+                complete = True
+                with open(self.autosave_file, 'rb') as f:
+                    if f.seek(0, os.SEEK_END) > 0:
+                        f.seek(-1, os.SEEK_END)
+                        complete = f.read(1) == b'\n'
+                if not complete and rows:
+                    print(f"Unvollständige letzte Zeile im Autosave verworfen: {rows[-1]}")
+                    rows.pop()
+
+                for row in rows:
+                    self.add_mapping(row)
+
+                # Superseded or broken lines: rewrite once, so new lines append cleanly
+                if not complete or self.journal_rows > len(self.mappings):
+                    if not self.compact_autosave() and not complete:
+                        # Not rewritable right now: at least cut the broken line, the next append must start on a new line
+                        self.truncate_incomplete_line()
+
                 if self.mappings:
                     self.show_status(f"✓ {len(self.mappings)} bestehende Mappings geladen.", "blue")
             except Exception as e:
@@ -376,16 +896,15 @@ class ProductMapper:
         self.show_status(f"⚠ Nicht gefunden: {search_term}", "orange")
 
     def show_current_product(self, set_focus=True):
-        print(f"DEBUG show_current_product: current_index={self.current_index}, filtered_len={len(self.filtered_ask_products)}, total_len={len(self.ask_products)}")
-
         if not self.filtered_ask_products:
             # No products (empty filter result)
             self.progress_label.config(text="0 / 0 (gefiltert)")
             self.ask_artnr_label.config(text="Keine Treffer", foreground="black")
             self.ask_desc_label.config(text="Keine Artikel gefunden mit diesem Filter")
+            self.images.cancel()
             self.image_label.config(image='', text="Kein Bild")
             self.shop_link_btn.config(state="disabled")
-            self.matches_listbox.delete(0, tk.END)
+            self.show_matches('')  # Clears the list and cancels pending scoring
             return
 
         if self.current_index >= len(self.filtered_ask_products):
@@ -393,7 +912,6 @@ class ProductMapper:
             return
 
         product = self.filtered_ask_products[self.current_index]
-        print(f"DEBUG: Showing product: {product.get('Artikelnummer', 'N/A')}")
 
         # Update progress (show filtered/total)
         filter_info = f" (gefiltert)" if len(self.filtered_ask_products) < len(self.ask_products) else ""
@@ -409,7 +927,7 @@ class ProductMapper:
             image_file = artnr
 
         # Check if this article is already mapped
-        is_mapped = any(mapping.get('ASK_Artikelnummer') == artnr for mapping in self.mappings)
+        is_mapped = artnr in self.mappings
 
         # Set color: red if already mapped, default otherwise
         artnr_color = "red" if is_mapped else "black"
@@ -422,7 +940,6 @@ class ProductMapper:
         desc_text = description if description else "Keine Beschreibung"
         if is_mapped:
             desc_text = "✓ BEREITS ERFASST | " + desc_text
-            print(f"DEBUG: Article {artnr} is already mapped (shown in red)")
 
         self.ask_desc_label.config(text=desc_text)
 
@@ -435,6 +952,7 @@ class ProductMapper:
 
         # Load and display image (pass article number as fallback)
         self.load_image(image_file, artnr)
+        self.prefetch_images()
 
         # Clear Syskomp input
         self.syskomp_input.delete(0, tk.END)
@@ -458,40 +976,53 @@ class ProductMapper:
         else:
             messagebox.showinfo("Keine URL", "Für dieses Produkt ist keine URL verfügbar.")
 
+    def image_candidates(self, image_filename, fallback_artnr=None):
+        """Image paths to try: <Bild>.png, then <Artikelnummer>.png as fallback"""
+        paths = []
+        for filename in (image_filename, fallback_artnr):
+            if filename:
+                # Add .png extension if not present
+                if not filename.endswith('.png'):
+                    filename = filename + '.png'
+                # self.ask_dir is already <csvname>-images directory
+                paths.append(os.path.join(self.ask_dir, filename))
+        return paths
+
     def load_image(self, image_filename, fallback_artnr=None):
         if not image_filename or not self.ask_dir:
+            self.images.cancel()
             self.image_label.config(image='', text="Kein Bild")
             return
 
-        # Add .png extension if not present
-        if not image_filename.endswith('.png'):
-            image_filename = image_filename + '.png'
+        display_name = image_filename if image_filename.endswith('.png') else image_filename + '.png'
 
-        # self.ask_dir is already <csvname>-images directory
-        image_path = os.path.join(self.ask_dir, image_filename)
+        def on_ready(photo, error):
+            if photo is not None:
+                self.image_label.config(image=photo, text='')
+                self.image_label.image = photo  # Keep reference
+            elif error:
+                self.image_label.config(image='', text=f"Fehler beim Laden:\n{error}")
+            else:
+                self.image_label.config(image='', text=f"Bild nicht gefunden:\n{display_name}")
 
-        # If image doesn't exist, try using article number as fallback
-        if not os.path.exists(image_path) and fallback_artnr:
-            fallback_filename = fallback_artnr if fallback_artnr.endswith('.png') else fallback_artnr + '.png'
-            fallback_path = os.path.join(self.ask_dir, fallback_filename)
-            if os.path.exists(fallback_path):
-                print(f"DEBUG: Image {image_filename} not found, using fallback {fallback_filename}")
-                image_path = fallback_path
-                image_filename = fallback_filename
+        # Decoded in the background (or straight from the cache), never on the Tk thread.
+        # Keep the previous picture until the new one is ready instead of flickering.
+        self.images.show(self.image_candidates(image_filename, fallback_artnr), IMAGE_SIZE, on_ready)
 
-        if not os.path.exists(image_path):
-            self.image_label.config(image='', text=f"Bild nicht gefunden:\n{image_filename}")
+    def prefetch_images(self):
+        """Warm the image cache for the products around the current one"""
+        if not self.ask_dir:
             return
-
-        try:
-            img = Image.open(image_path)
-            # Resize to fit (260x260 = 30% bigger than 200x200)
-            img.thumbnail((260, 260), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            self.image_label.config(image=photo, text='')
-            self.image_label.image = photo  # Keep reference
-        except Exception as e:
-            self.image_label.config(image='', text=f"Fehler beim Laden:\n{e}")
+        requests = []
+        for offset in range(1, IMAGE_PREFETCH + 1):
+            for idx in (self.current_index + offset, self.current_index - offset):
+                if 0 <= idx < len(self.filtered_ask_products):
+                    product = self.filtered_ask_products[idx]
+                    artnr = product.get('Artikelnummer', '')
+                    image_file = product.get('Bild', '') or artnr
+                    if image_file:
+                        requests.append((self.image_candidates(image_file, artnr), IMAGE_SIZE))
+        self.images.prefetch(requests)
 
     def is_item_number(self, artnr):
         """Check if article number matches Item format (x.x.x.x)"""
@@ -502,9 +1033,10 @@ class ProductMapper:
         """Check if article number is Bosch format (exactly 10 characters)"""
         return artnr and len(artnr) == 10
 
-    def filter_product(self, artnr1, artnr2=""):
+    def filter_product(self, artnr1, artnr2="", filter_type=None):
         """Check if product matches current filter - checks BOTH article number columns"""
-        filter_type = self.filter_var.get()
+        if filter_type is None:
+            filter_type = self.filter_var.get()
 
         if filter_type == "all":
             return True
@@ -529,61 +1061,143 @@ class ProductMapper:
 
     def apply_filter(self):
         """Reapply filter when radio button changes"""
-        if self.ask_products and self.current_index < len(self.ask_products):
-            product = self.ask_products[self.current_index]
+        if self.filtered_ask_products and self.current_index < len(self.filtered_ask_products):
+            product = self.filtered_ask_products[self.current_index]
             description = product.get('Beschreibung', '')
             self.show_matches(description)
 
     def show_matches(self, ask_description):
+        """Show the top matches, scoring in the background thread if not cached yet"""
         self.match_listbox.delete(0, tk.END)
 
-        if not ask_description or not self.syskomp_products:
+        # Every call supersedes the previous request
+        self.match_generation += 1
+
+        if not ask_description or not self.syskomp_index:
             return
 
-        # Get minimum similarity threshold
-        min_similarity = self.similarity_var.get() / 100.0
+        key = ask_description.lower()
+        top_matches = self.precomputed_matches.get(key) or self.match_cache.get(key)
+        if top_matches is not None:
+            # Same product, different threshold/type filter: no rescoring
+            if key in self.match_cache:
+                self.match_cache.move_to_end(key)
+            self.display_matches(top_matches)
+            return
 
-        # Calculate similarity scores
-        matches = []
-        for product in self.syskomp_products:
-            # Get Syskomp description - column name is "Artikelbezeichnung"
-            syskomp_desc = str(product.get('Artikelbezeichnung', '') or '').strip()
-            # Get both article numbers
-            # Materialnr. can be Item (x.x.x.x) or Bosch (10 char) format
-            bosch_item_nr = str(product.get('Materialnr.', '') or '').strip()  # Item/Bosch number
-            syskomp_nr = str(product.get('Unnamed: 1', '') or '').strip()      # Syskomp number
+        self.match_listbox.insert(tk.END, "⏳ Berechne Übereinstimmungen...")
+        self.match_queue.put((self.match_generation, key, self.syskomp_index))
 
-            # Use Bosch/Item number for filtering, but show both
-            display_artnr = bosch_item_nr or syskomp_nr
+    def match_worker(self):
+        """Worker thread: score queued ASK descriptions and post results back to the Tk thread"""
+        while True:
+            generation, key, index = self.match_queue.get()
+            if generation != self.match_generation:
+                continue  # Already superseded before we started
 
-            # Only show products that have a valid 9-digit Syskomp number
-            if not (syskomp_nr and syskomp_nr.isdigit() and len(syskomp_nr) >= 9):
+            try:
+                top_matches = score_description(index, key, lambda: generation != self.match_generation)
+            except Exception as e:
+                print(f"Fehler beim Berechnen der Matches: {e}")
                 continue
 
-            if syskomp_desc and display_artnr:
-                # Apply type filter (Item/Bosch) - check BOTH columns
-                if not self.filter_product(bosch_item_nr, syskomp_nr):
-                    continue
+            if top_matches is not None:
+                # Tk widgets may only be touched from the main thread
+                self.root.after(0, self.on_matches_ready, generation, key, index, top_matches)
+
+    def on_matches_ready(self, generation, key, index, top_matches):
+        """Runs on the Tk thread: cache the scores and show them if still current"""
+        if index is not self.syskomp_index:
+            return  # Syskomp file was reloaded meanwhile
+
+        self.match_cache[key] = top_matches
+        self.match_cache.move_to_end(key)
+        while len(self.match_cache) > MATCH_CACHE_SIZE:
+            self.match_cache.popitem(last=False)
+
+        if generation == self.match_generation:
+            self.match_listbox.delete(0, tk.END)
+            self.display_matches(top_matches)
+
+    def setup_precompute(self, ask_file, syskomp_file, cache_path):
+        """Load the sidecar cache for this CSV pair and start precomputing if enabled"""
+        if self.precompute_cancel:
+            self.precompute_cancel.set()  # Results would belong to the previous files
+            self.precompute_cancel = None
+
+        ask_hash = file_hash(ask_file)
+        syskomp_hash = file_hash(syskomp_file)
+        self.precomputed_matches = load_precomputed_matches(cache_path, ask_hash, syskomp_hash)
+        if self.precomputed_matches:
+            print(f"{len(self.precomputed_matches)} vorberechnete Matches geladen: {cache_path}")
+
+        pending = sorted({(product.get('Beschreibung') or '').lower() for product in self.ask_products}
+                         - set(self.precomputed_matches) - {''})
+        if not pending:
+            self.precompute_label.config(text="Matches vorberechnet" if self.precomputed_matches else "")
+            return
+        if not self.precompute_var.get():
+            self.precompute_label.config(text="")
+            return
 
-                similarity = self.calculate_similarity(ask_description.lower(), syskomp_desc.lower())
+        cancel = threading.Event()
+        self.precompute_cancel = cancel
+        thread = threading.Thread(target=self.run_precompute, daemon=True,
+                                  args=(self.syskomp_index, pending, cache_path, ask_hash, syskomp_hash, cancel))
+        thread.start()
 
-                # Apply similarity filter
-                if similarity < min_similarity:
-                    continue
+    def run_precompute(self, index, descriptions, cache_path, ask_hash, syskomp_hash, cancel):
+        """Background thread: score all ASK descriptions in a process pool, then save the sidecar file"""
+        processes = max(1, (os.cpu_count() or 2) - 1)  # Keep one core for the GUI
+        total = len(descriptions)
+        results = dict(self.precomputed_matches)
+        start = time.perf_counter()
+        self.root.after(0, self.show_precompute_progress, index, 0, total)
 
-                matches.append({
-                    'syskomp_nr': syskomp_nr,
-                    'bosch_item_nr': bosch_item_nr,
-                    'artnr': display_artnr,  # For saving/selecting
-                    'description': syskomp_desc,
-                    'similarity': similarity
-                })
+        try:
+            with multiprocessing.Pool(processes, initializer=_init_precompute_worker, initargs=(index,)) as pool:
+                for done, (key, top_matches) in enumerate(
+                        pool.imap_unordered(_precompute_description, descriptions, chunksize=8), 1):
+                    if cancel.is_set():
+                        return  # Leaving the with-block terminates the workers
+                    results[key] = top_matches
+                    if done % 25 == 0 or done == total:
+                        self.root.after(0, self.show_precompute_progress, index, done, total)
+
+            print(f"{total} Beschreibungen in {time.perf_counter() - start:.1f}s vorberechnet ({processes} Prozesse)")
+            save_precomputed_matches(cache_path, ask_hash, syskomp_hash, results)
+        except Exception as e:
+            print(f"Fehler beim Vorberechnen: {e}")
+            self.root.after(0, self.show_status, f"⚠ Vorberechnen fehlgeschlagen: {e}", "red")
+            return
 
-        # Sort by similarity (highest first)
-        matches.sort(key=lambda x: x['similarity'], reverse=True)
+        self.root.after(0, self.on_precompute_done, index, results)
+
+    def show_precompute_progress(self, index, done, total):
+        if index is self.syskomp_index:
+            self.precompute_label.config(text=f"Vorberechnen: {done} / {total}")
+
+    def on_precompute_done(self, index, results):
+        """Runs on the Tk thread: switch to the precomputed matches"""
+        if index is not self.syskomp_index:
+            return
+        self.precomputed_matches = results
+        self.precompute_cancel = None
+        self.precompute_label.config(text="Matches vorberechnet")
+
+    def display_matches(self, top_matches):
+        """Fill the listbox from precomputed matches using the current filters"""
+        # Get minimum similarity threshold
+        min_similarity = self.similarity_var.get() / 100.0
+
+        # Already sorted by similarity (highest first)
+        matches = top_matches.get(self.filter_var.get(), top_matches['all'])
+
+        for match in matches:
+            # Apply similarity filter
+            if match['similarity'] < min_similarity:
+                break
 
-        # Show top 20
-        for match in matches[:20]:
             # Format Bosch/Item number (from Materialnr.)
             formatted_bosch_item = self.format_artnr(match['bosch_item_nr']) if match['bosch_item_nr'] else ''
             # Format Syskomp number (from Unnamed: 1)
@@ -617,43 +1231,7 @@ class ProductMapper:
 
     def calculate_similarity(self, text1, text2):
         """Calculate similarity between two strings using SequenceMatcher with special rules"""
-        import re
-
-        # Base similarity
-        base_similarity = SequenceMatcher(None, text1, text2).ratio()
-
-        # Bonus for "Profil X" matching "Nut X"
-        bonus = 0.0
-
-        # Find "profil" followed by a number in text1
-        profil_match = re.search(r'profil\s*(\d+)', text1, re.IGNORECASE)
-        # Find "nut" followed by a number in text2
-        nut_match = re.search(r'nut\s*(\d+)', text2, re.IGNORECASE)
-
-        if profil_match and nut_match:
-            # Check if the numbers match
-            profil_num = profil_match.group(1)
-            nut_num = nut_match.group(1)
-
-            if profil_num == nut_num:
-                # Strong bonus if Profil X matches Nut X
-                bonus = 0.3  # 30% bonus
-
-        # Also check the reverse: "nut" in text1, "profil" in text2
-        nut_match1 = re.search(r'nut\s*(\d+)', text1, re.IGNORECASE)
-        profil_match2 = re.search(r'profil\s*(\d+)', text2, re.IGNORECASE)
-
-        if nut_match1 and profil_match2:
-            nut_num1 = nut_match1.group(1)
-            profil_num2 = profil_match2.group(1)
-
-            if nut_num1 == profil_num2:
-                bonus = 0.3
-
-        # Cap final similarity at 1.0
-        final_similarity = min(1.0, base_similarity + bonus)
-
-        return final_similarity
+        return calculate_similarity(text1, text2)
 
     def on_match_select(self, event):
         selection = self.match_listbox.curselection()
@@ -701,8 +1279,11 @@ class ProductMapper:
         syskomp_artnr = None
         syskomp_desc = ""
 
-        for product in self.syskomp_products:
-            # Check both columns for the article number
+        # First Syskomp row that has the input in either column
+        rows = [row for row in (self.syskomp_by_materialnr.get(input_artnr), self.syskomp_by_nr.get(input_artnr))
+                if row is not None]
+        if rows:
+            product = self.syskomp_products[min(rows)]
             bosch_item = str(product.get('Materialnr.', '') or '').strip()
             syskomp_nr = str(product.get('Unnamed: 1', '') or '').strip()
 
@@ -712,17 +1293,15 @@ class ProductMapper:
                 if syskomp_nr and syskomp_nr.isdigit() and len(syskomp_nr) >= 9:
                     syskomp_artnr = syskomp_nr[:9]
                     syskomp_desc = str(product.get('Artikelbezeichnung', '') or '').strip()
-                    break
                 else:
                     # Found Bosch/Item match but no valid Syskomp number
                     self.show_status(f"⚠️ Keine gültige 9-stellige Syskomp-Nummer für {input_artnr} gefunden", "red")
                     return
-            elif syskomp_nr == input_artnr:
+            else:
                 # Direct match with Syskomp number
                 if syskomp_nr.isdigit() and len(syskomp_nr) >= 9:
                     syskomp_artnr = syskomp_nr[:9]
                     syskomp_desc = str(product.get('Artikelbezeichnung', '') or '').strip()
-                    break
                 else:
                     self.show_status(f"⚠️ Ungültige Syskomp-Nummer (muss 9-stellig sein): {input_artnr}", "red")
                     return
@@ -740,27 +1319,35 @@ class ProductMapper:
             'Syskomp_Artikelnummer': syskomp_artnr,
             'Syskomp_Beschreibung': syskomp_desc
         }
-        self.mappings.append(mapping)
+        self.add_mapping(mapping)
 
         # Auto-save immediately to file
-        self.autosave_mapping()
+        self.autosave_mapping(mapping)
 
         self.show_status(f"✓ Gespeichert: {mapping['ASK_Artikelnummer']} → {syskomp_artnr}", "green")
 
         # Move to next
         self.next_product()
 
-    def autosave_mapping(self):
-        """Automatically save all mappings to CSV file after each change"""
-        if not self.autosave_file or not self.mappings:
+    def autosave_mapping(self, mapping):
+        """Append the new mapping to the autosave file (one fsync'd line instead of a full rewrite)"""
+        if not self.autosave_file:
             return
 
         try:
-            with open(self.autosave_file, 'w', newline='', encoding='utf-8') as f:
-                fieldnames = ['ASK_Artikelnummer', 'ASK_Beschreibung', 'Syskomp_Artikelnummer', 'Syskomp_Beschreibung']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(self.mappings)
+            new_file = not os.path.exists(self.autosave_file) or os.path.getsize(self.autosave_file) == 0
+            with open(self.autosave_file, 'a', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=MAPPING_FIELDS)
+                if new_file:
+                    writer.writeheader()
+                writer.writerow(mapping)
+                f.flush()
+                os.fsync(f.fileno())
+            self.journal_rows = 1 if new_file else self.journal_rows + 1
+
+            # Periodic compaction: drop lines of re-mapped ASK articles
+            if self.journal_rows - len(self.mappings) >= COMPACT_AFTER:
+                self.compact_autosave()
 
             # Update autosave info label
             autosave_filename = os.path.basename(self.autosave_file)
@@ -774,6 +1361,42 @@ class ProductMapper:
             messagebox.showerror("Speicherfehler", error_msg)
             print(f"Auto-save Fehler: {e}")
 
+    def compact_autosave(self):
+        """Rewrite the autosave file with one line per ASK article (atomic replace).
+
+        Returns False if the file cannot be replaced right now (e.g. opened in
+        Excel on Windows); the journal stays valid and is compacted on a later load.
+        """
+        tmp_file = self.autosave_file + '.tmp'
+        try:
+            with open(tmp_file, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=MAPPING_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+                writer.writerows(self.mappings.values())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.autosave_file)
+        except OSError as e:
+            print(f"Autosave nicht kompaktiert (später erneut): {e}")
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            return False
+        print(f"Autosave kompaktiert: {self.journal_rows} -> {len(self.mappings)} Zeilen")
+        self.journal_rows = len(self.mappings)
+        return True
+
+    def truncate_incomplete_line(self):
+        """Cut an interrupted last line off the autosave file (everything after the last newline)"""
+        try:
+            with open(self.autosave_file, 'r+b') as f:
+                data = f.read()
+                f.truncate(data.rfind(b'\n') + 1)
+            self.journal_rows = max(0, self.journal_rows - 1)
+        except OSError as e:
+            print(f"Unvollständige Zeile im Autosave nicht entfernt: {e}")
+
     def show_status(self, message, color="green"):
         """Show a status message that auto-clears after 3 seconds"""
         self.status_label.config(text=message, foreground=color)
@@ -781,27 +1404,23 @@ class ProductMapper:
         self.root.after(3000, lambda: self.status_label.config(text=""))
 
     def next_product(self):
-        print(f"DEBUG next_product: current_index={self.current_index}, filtered_len={len(self.filtered_ask_products)}")
         if not self.filtered_ask_products:
             messagebox.showinfo("Keine Produkte", "Keine Produkte zum Anzeigen (Filter aktiv?)")
             return
 
         if self.current_index < len(self.filtered_ask_products) - 1:
             self.current_index += 1
-            print(f"DEBUG: Moving to index {self.current_index}")
             self.show_current_product()
         else:
             messagebox.showinfo("Fertig", "Das war das letzte Produkt!")
 
     def previous_product(self):
-        print(f"DEBUG previous_product: current_index={self.current_index}, filtered_len={len(self.filtered_ask_products)}")
         if not self.filtered_ask_products:
             messagebox.showinfo("Keine Produkte", "Keine Produkte zum Anzeigen (Filter aktiv?)")
             return
 
         if self.current_index > 0:
             self.current_index -= 1
-            print(f"DEBUG: Moving to index {self.current_index}")
             self.show_current_product()
         else:
             messagebox.showinfo("Anfang", "Das ist bereits das erste Produkt!")
@@ -809,103 +1428,41 @@ class ProductMapper:
     def skip_product(self):
         self.next_product()
 
+    def schedule_description_filter(self, event=None):
+        """Debounce: filter once typing pauses instead of on every key"""
+        if self.filter_after_id:
+            self.root.after_cancel(self.filter_after_id)
+        self.filter_after_id = self.root.after(FILTER_DEBOUNCE_MS, self.apply_description_filter)
+
     def apply_description_filter(self):
         """Filter ASK products by description text with wildcard support"""
+        self.filter_after_id = None
         filter_text = self.desc_filter_entry.get().strip()
 
+        if filter_text == self.active_filter_text:
+            return  # e.g. cursor keys - nothing changed
+
         if not filter_text:
             # No filter - show all products
-            self.filtered_ask_products = self.ask_products.copy()
-            self.current_index = 0
+            self.reset_description_filter()
             if self.ask_products:
                 self.show_current_product(set_focus=False)
             return
 
-        # Convert filter to regex pattern
-        # Support wildcards (*) and multiple keywords (space-separated)
-        # All keywords must match (AND logic)
-        # Support quoted phrases to preserve spaces: "profil " nut
-
-        # Parse keywords, respecting quoted phrases
-        keywords = []
-        current_word = []
-        in_quotes = False
-
-        for char in filter_text:
-            if char == '"':
-                if in_quotes:
-                    # End of quoted phrase
-                    keywords.append(''.join(current_word))
-                    current_word = []
-                    in_quotes = False
-                else:
-                    # Start of quoted phrase
-                    in_quotes = True
-            elif char == ' ' and not in_quotes:
-                # Space outside quotes - word separator
-                if current_word:
-                    keywords.append(''.join(current_word))
-                    current_word = []
-            else:
-                # Regular character
-                current_word.append(char)
-
-        # Add last word/phrase
-        if current_word:
-            keywords.append(''.join(current_word))
+        patterns = compile_description_filter(filter_text)
 
-        # Auto-expand keywords with leading/trailing spaces
-        # "profil " → "*profil " (finds PROFIL, ALUMINIUMPROFIL, etc.)
-        # " nut" → " nut*" (finds NUT, NUTENSTEIN, etc.)
-        expanded_keywords = []
-        for keyword in keywords:
-            expanded = keyword
-
-            # Add wildcard before if ends with space and doesn't start with *
-            if expanded.endswith(' ') and not expanded.startswith('*'):
-                expanded = '*' + expanded
-
-            # Add wildcard after if starts with space and doesn't end with *
-            if expanded.startswith(' ') and not expanded.endswith('*'):
-                expanded = expanded + '*'
-
-            expanded_keywords.append(expanded)
-
-        keywords = expanded_keywords
-
-        # Debug: Show what we're searching for
-        print(f"DEBUG: Filter text: '{filter_text}'")
-        print(f"DEBUG: Original keywords: {[kw for kw in filter_text.split()]}")
-        print(f"DEBUG: Expanded keywords: {keywords}")
+        # Typing more characters can only narrow the result: search the previous hits only
+        if self.active_filter_text and filter_text.startswith(self.active_filter_text):
+            candidates = self.filtered_ask_indices
+        else:
+            candidates = range(len(self.ask_products))
 
         # Filter products where all keywords match
-        self.filtered_ask_products = []
-        for idx, product in enumerate(self.ask_products):
-            description = product.get('Beschreibung', '')
-            description_lower = description.lower()
-
-            # Debug: Show first 3 descriptions
-            if idx < 3:
-                print(f"DEBUG: Product {idx+1} description: '{description}'")
-
-            # Check if all keywords match (with wildcard support)
-            all_match = True
-            for keyword in keywords:
-                keyword_lower = keyword.lower()
-                # Convert wildcard * to regex .*
-                # Escape other special regex characters
-                pattern = re.escape(keyword_lower).replace(r'\*', '.*')
-
-                # Check if pattern matches
-                if not re.search(pattern, description_lower):
-                    all_match = False
-                    break
-
-            if all_match:
-                self.filtered_ask_products.append(product)
-
-        # Debug results
-        print(f"DEBUG: Found {len(self.filtered_ask_products)} matches out of {len(self.ask_products)} products")
+        descriptions = self.ask_descriptions_lower
+        self.filtered_ask_indices = [idx for idx in candidates
+                                     if all(pattern.search(descriptions[idx]) for pattern in patterns)]
+        self.filtered_ask_products = [self.ask_products[idx] for idx in self.filtered_ask_indices]
+        self.active_filter_text = filter_text
 
         # Reset to first product after filtering
         self.current_index = 0
@@ -921,11 +1478,20 @@ class ProductMapper:
             self.show_status(f"⚠ Keine Artikel gefunden mit Filter: '{filter_text}'", "orange")
             self.show_current_product(set_focus=False)  # This will show "Keine Treffer" message
 
+    def reset_description_filter(self):
+        """Show all ASK products (no description filter)"""
+        self.filtered_ask_products = self.ask_products.copy()
+        self.filtered_ask_indices = list(range(len(self.ask_products)))
+        self.active_filter_text = ""
+        self.current_index = 0
+
     def clear_description_filter(self):
         """Clear description filter and show all products"""
+        if self.filter_after_id:
+            self.root.after_cancel(self.filter_after_id)
+            self.filter_after_id = None
         self.desc_filter_entry.delete(0, tk.END)
-        self.filtered_ask_products = self.ask_products.copy()
-        self.current_index = 0
+        self.reset_description_filter()
         self.show_status("Filter entfernt - alle Artikel angezeigt", "green")
         if self.ask_products:
             self.show_current_product()
@@ -947,10 +1513,9 @@ class ProductMapper:
 
         try:
             with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                fieldnames = ['ASK_Artikelnummer', 'ASK_Beschreibung', 'Syskomp_Artikelnummer', 'Syskomp_Beschreibung']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer = csv.DictWriter(f, fieldnames=MAPPING_FIELDS, extrasaction='ignore')
                 writer.writeheader()
-                writer.writerows(self.mappings)
+                writer.writerows(self.mappings.values())
 
             self.show_status(f"✓ {len(self.mappings)} Mappings erfolgreich exportiert!", "green")
 
@@ -0,0 +1,153 @@
+"""
+Local mirror of files on the network share (\\sys-ts19-1\c$\ArtNrConverter)
+
+Reading ArtNrn.csv and the catalog CSVs over SMB takes seconds, and a slow or
+unreachable share used to block the mapper before its window appeared. The
+mirror keeps a local copy of every file read from the share plus the last
+known directory listing:
+
+    mirror = ShareMirror()
+    local = mirror.cached_path(remote)      # instant, may be an older version
+    local, changed = mirror.fetch(remote)   # stats the share, copies if newer
+
+Copies are keyed by the remote mtime and size (manifest.json in the mirror
+directory), so an unchanged file is never copied twice. Local paths (not on
+a share) are passed through unchanged.
+
+The mirror directory defaults to %LOCALAPPDATA%\\ArtNrConverter\\mirror and can
+be overridden with the environment variable ARTNR_MIRROR_DIR.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+NETWORK_BASE = r"\\sys-ts19-1\c$\ArtNrConverter"
+
+
+def default_mirror_dir():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.environ.get('ARTNR_MIRROR_DIR') or os.path.join(base, 'ArtNrConverter', 'mirror')
+
+
+def is_remote(path):
+    """UNC paths (\\\\server\\share\\...) are mirrored, everything else is read directly"""
+    return bool(path) and (path.startswith('\\\\') or path.startswith('//'))
+
+
+class ShareMirror:
+    def __init__(self, mirror_dir=None):
+        self.mirror_dir = mirror_dir or default_mirror_dir()
+        self.manifest_path = os.path.join(self.mirror_dir, 'manifest.json')
+        self.lock = threading.Lock()
+        self.manifest = {'files': {}, 'listings': {}}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest.update(json.load(f))
+        except (OSError, ValueError):
+            pass  # No mirror yet (or unreadable) - start empty
+
+    def _save_manifest(self):
+        os.makedirs(self.mirror_dir, exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _local_name(self, remote):
+        # Same file name in different catalog folders must not collide
+        digest = hashlib.sha1(os.path.normcase(remote).encode('utf-8')).hexdigest()[:12]
+        return f"{digest}_{os.path.basename(remote)}"
+
+    def cached_path(self, remote):
+        """Local copy of a remote file if one exists (without touching the share)"""
+        if not is_remote(remote):
+            return remote
+        with self.lock:
+            entry = self.manifest['files'].get(remote)
+        if entry:
+            local = os.path.join(self.mirror_dir, entry['local'])
+            if os.path.exists(local):
+                return local
+        return None
+
+    def fetch(self, remote):
+        """Bring the local copy up to date; returns (local_path, changed).
+
+        Raises OSError if the share is unreachable and no copy exists yet.
+        """
+        if not is_remote(remote):
+            return remote, False
+
+        try:
+            stat = os.stat(remote)
+        except OSError:
+            local = self.cached_path(remote)
+            if local:
+                return local, False  # Share unreachable: keep working with the copy
+            raise
+
+        with self.lock:
+            entry = self.manifest['files'].get(remote)
+        local_name = self._local_name(remote)
+        local = os.path.join(self.mirror_dir, local_name)
+        if entry and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size and os.path.exists(local):
+            return local, False
+
+        os.makedirs(self.mirror_dir, exist_ok=True)
+        tmp_path = local + '.part'
+        start = time.perf_counter()
+        shutil.copyfile(remote, tmp_path)
+        os.replace(tmp_path, local)
+        print(f"Spiegel aktualisiert: {remote} ({stat.st_size / 1e6:.1f} MB in {time.perf_counter() - start:.1f}s)")
+
+        with self.lock:
+            self.manifest['files'][remote] = {
+                'local': local_name,
+                'mtime': stat.st_mtime,
+                'size': stat.st_size,
+                'synced': time.time(),
+            }
+            self._save_manifest()
+        return local, True
+
+    def local_path(self, remote):
+        """Cached copy if available, otherwise fetch now (first use of a file)"""
+        return self.cached_path(remote) or self.fetch(remote)[0]
+
+    def refresh_async(self, remotes, on_changed):
+        """Check remote files in a daemon thread; on_changed(remote, local) for each newer version.
+
+        on_changed runs in the worker thread - Tk callers must hop over with root.after.
+        """
+        def run():
+            for remote in remotes:
+                try:
+                    local, changed = self.fetch(remote)
+                except OSError as e:
+                    print(f"Spiegel: {remote} nicht erreichbar: {e}")
+                    continue
+                if changed:
+                    on_changed(remote, local)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def cached_listing(self, key):
+        """Last stored result of a directory scan (list of paths)"""
+        with self.lock:
+            return list(self.manifest['listings'].get(key, []))
+
+    def store_listing(self, key, paths):
+        with self.lock:
+            if self.manifest['listings'].get(key) == paths:
+                return
+            self.manifest['listings'][key] = list(paths)
+            try:
+                self._save_manifest()
+            except OSError as e:
+                print(f"Spiegel-Manifest konnte nicht gespeichert werden: {e}")
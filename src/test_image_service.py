@@ -0,0 +1,60 @@
+"""
+Tests for the background image loading (fake Tk root, no window needed)
+"""
+
+import queue
+
+from PIL import Image
+
+import image_service
+from image_service import ImageService
+
+
+class FakeRoot:
+    """Collects root.after() calls; the test runs them as the 'Tk thread'"""
+
+    def __init__(self):
+        self.calls = queue.Queue()
+
+    def after(self, delay, func, *args):
+        self.calls.put((func, args))
+
+    def run_next(self, timeout=5):
+        func, args = self.calls.get(timeout=timeout)
+        func(*args)
+
+
+def show(service, root, path):
+    results = []
+    service.show([path], (50, 50), lambda photo, error: results.append((photo, error)))
+    while not results:
+        root.run_next()
+    return results[0]
+
+
+def test_missing_image_is_retried_after_ttl(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_service.ImageTk, 'PhotoImage', lambda image: ('photo', image.size))
+    monkeypatch.setattr(image_service, 'NEGATIVE_TTL', 0.0)
+    root = FakeRoot()
+    service = ImageService(root, workers=1)
+    path = str(tmp_path / '100001.png')
+
+    assert show(service, root, path) == (None, None)
+
+    # Share was briefly unreachable: the picture shows up on the next visit
+    Image.new('RGB', (100, 40)).save(path)
+    assert show(service, root, path) == (('photo', (50, 20)), None)
+    assert service.cache_bytes == sum(entry.size for entry in service.cache.values())
+
+
+def test_missing_image_is_cached_within_ttl(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_service, 'NEGATIVE_TTL', 60.0)
+    root = FakeRoot()
+    service = ImageService(root, workers=1)
+    path = str(tmp_path / '100001.png')
+
+    assert show(service, root, path) == (None, None)
+    Image.new('RGB', (100, 40)).save(path)
+    # Cache hit: delivered immediately, no disk access
+    assert show(service, root, path) == (None, None)
+    assert root.calls.empty()
@@ -0,0 +1,135 @@
+"""
+Tests for the mapper's matching (no Tk window needed)
+"""
+
+import heapq
+import os
+import random
+
+import mapper
+from mapper import MAX_MATCHES, ProductMapper, SyskompIndex, calculate_similarity, score_description
+
+WORDS = ['profil', 'nut', 'winkel', 'abdeckkappe', 'kabelkanal', 'nutenstein', 'schraube', 'verbinder',
+         'scharnier', 'alu', 'schwarz', 'zuschnitt', '30x30', '40x80', '8', '10', 'm6', 'rohr', 'ø28x2']
+
+
+def filter_product(artnr1, artnr2="", filter_type=None):
+    if filter_type == "item":
+        return '.' in artnr1
+    if filter_type == "bosch":
+        return artnr1.isdigit() and len(artnr1) == 10
+    return True
+
+
+def make_products(count, seed=7):
+    rng = random.Random(seed)
+    products = []
+    for i in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(2, 7))]
+        if rng.random() < 0.1:
+            words += [rng.choice(['profil', 'nut']), str(rng.choice([6, 8, 10]))]
+        artnr = rng.choice([f'0.0.{i}.{i % 90}', str(3842000000 + i), ''])
+        products.append({'Artikelbezeichnung': ' '.join(words), 'Materialnr.': artnr,
+                         'Unnamed: 1': str(100000000 + i)})
+    return products
+
+
+def full_scan(index, ask_description):
+    """Reference: score every row with calculate_similarity"""
+    scores = {row: calculate_similarity(ask_description, index.descriptions_lower[row]) for row in range(len(index))}
+    top = {}
+    for filter_type, flags in (("all", None), ("item", index.is_item), ("bosch", index.is_bosch)):
+        rows = scores if flags is None else [row for row in scores if flags[row]]
+        best = heapq.nsmallest(MAX_MATCHES, rows, key=lambda row: (-scores[row], row))
+        top[filter_type] = [(index.syskomp_nrs[row], scores[row]) for row in best]
+    return top
+
+
+def test_score_description_matches_full_scan():
+    index = SyskompIndex(make_products(2000), filter_product)
+    queries = [' '.join(random.Random(seed).choice(WORDS) for _ in range(4)) for seed in range(8)]
+    queries += ['profil 8 abdeckkappe', 'nut 10 winkel', 'x']
+
+    for query in queries:
+        top = score_description(index, query)
+        expected = full_scan(index, query)
+        for filter_type, matches in top.items():
+            assert [(m['syskomp_nr'], m['similarity']) for m in matches] == expected[filter_type], (query, filter_type)
+
+
+def test_score_description_stops_when_stale():
+    index = SyskompIndex(make_products(50), filter_product)
+    assert score_description(index, 'profil 8', is_stale=lambda: True) is None
+
+
+class Label:
+    def config(self, **kwargs):
+        pass
+
+
+def make_mapper(autosave_file):
+    """ProductMapper without a Tk window - only the autosave state"""
+    product_mapper = object.__new__(ProductMapper)
+    product_mapper.autosave_file = autosave_file
+    product_mapper.mappings = {}
+    product_mapper.journal_rows = 0
+    product_mapper.autosave_info_label = Label()
+    product_mapper.show_status = lambda message, color="green": None
+    return product_mapper
+
+
+def mapping(ask_artnr, syskomp_artnr):
+    return {'ASK_Artikelnummer': ask_artnr, 'ASK_Beschreibung': f'ASK {ask_artnr}',
+            'Syskomp_Artikelnummer': syskomp_artnr, 'Syskomp_Beschreibung': f'Syskomp {syskomp_artnr}'}
+
+
+def read_lines(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def test_journal_replay_last_line_wins_and_truncated_line_is_dropped(tmp_path):
+    path = str(tmp_path / 'ASK-Syskomp.csv')
+    writer = make_mapper(path)
+    for ask_artnr, syskomp_artnr in (('1', 'A'), ('2', 'B'), ('1', 'C')):
+        writer.add_mapping(mapping(ask_artnr, syskomp_artnr))
+        writer.autosave_mapping(mapping(ask_artnr, syskomp_artnr))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('3,ASK 3,D,Syskomp')  # Interrupted append (no newline)
+
+    reader = make_mapper(path)
+    reader.load_existing_mappings()
+
+    assert [(m['ASK_Artikelnummer'], m['Syskomp_Artikelnummer']) for m in reader.mappings.values()] == [('1', 'C'), ('2', 'B')]
+    # Compacted on load: one line per ASK article, no broken tail
+    assert read_lines(path) == [','.join(mapper.MAPPING_FIELDS), '1,ASK 1,C,Syskomp C', '2,ASK 2,B,Syskomp B']
+    assert reader.journal_rows == 2
+
+
+def test_failed_compaction_keeps_journal_without_error_dialog(tmp_path, monkeypatch):
+    path = str(tmp_path / 'ASK-Syskomp.csv')
+    errors = []
+    monkeypatch.setattr(mapper.messagebox, 'showerror', lambda *args: errors.append(args))
+    monkeypatch.setattr(mapper, 'COMPACT_AFTER', 1)
+
+    def locked(src, dst):
+        raise PermissionError(13, 'Datei ist in Excel geöffnet', dst)
+
+    product_mapper = make_mapper(path)
+    product_mapper.add_mapping(mapping('1', 'A'))
+    product_mapper.autosave_mapping(mapping('1', 'A'))
+    monkeypatch.setattr(mapper.os, 'replace', locked)
+    product_mapper.add_mapping(mapping('1', 'B'))
+    product_mapper.autosave_mapping(mapping('1', 'B'))
+
+    assert errors == []
+    assert read_lines(path)[1:] == ['1,ASK 1,A,Syskomp A', '1,ASK 1,B,Syskomp B']
+    assert not os.path.exists(path + '.tmp')
+
+    # Load with the file still locked: broken tail is cut instead
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('2,ASK')
+    reader = make_mapper(path)
+    reader.load_existing_mappings()
+    assert [m['Syskomp_Artikelnummer'] for m in reader.mappings.values()] == ['B']
+    assert read_lines(path)[-1] == '1,ASK 1,B,Syskomp B'